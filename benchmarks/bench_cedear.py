@@ -0,0 +1,82 @@
+"""
+CEDEAR cross-market screen benchmark.
+
+Builds a synthetic universe of CEDEAR/underlying pairs (local prices are
+the underlying times a drifting CCL, with a per-pair premium) and times a
+cold screen and a rerun served from the freshness-keyed cache.
+
+    python benchmarks/bench_cedear.py [--pairs 500] [--days 252]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.cedears import CedearRatio, RatioTable
+from src.data.synthetic import generate_ohlcv
+from src.domain.cedears import CedearScreener
+
+
+class PairLoader:
+    """Serves pre-generated frames; every series has a fixed data version."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get_ticker_history(self, ticker, period="1y"):
+        return self.frames.get(ticker)
+
+    def data_version(self, ticker, period="1y"):
+        return "bench"
+
+    def data_versions(self, tickers, period="1y"):
+        return dict.fromkeys(tickers, "bench")
+
+
+def build_universe(n_pairs: int, days: int):
+    rng = np.random.default_rng(7)
+    ccl = 1000 * np.exp(np.cumsum(rng.normal(0.001, 0.01, days)))
+    frames, ratios = {}, []
+    for i in range(n_pairs):
+        underlying = f"U{i:04d}"
+        ratio = float(rng.choice([1, 5, 10, 20, 30]))
+        usd = generate_ohlcv(underlying, days)
+        ars = usd * (ccl * (1 + rng.normal(0, 0.01)) / ratio)[:, None]
+        ars["Volume"] = usd["Volume"]
+        frames[underlying], frames[underlying + ".BA"] = usd, ars
+        ratios.append(CedearRatio(underlying, underlying + ".BA", ratio))
+    return frames, ratios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CEDEAR screen benchmark")
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    args = parser.parse_args(argv)
+
+    frames, ratios = build_universe(args.pairs, args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        table = RatioTable(db_path=os.path.join(tmp, "ratios.db"))
+        table.upsert(ratios)
+        screener = CedearScreener(PairLoader(frames), table)
+        tickers = [r.underlying for r in ratios]
+
+        start = time.perf_counter()
+        screen = screener.screen(tickers)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        screener.screen(tickers)
+        warm = time.perf_counter() - start
+
+    print(f"{args.pairs} pairs x {args.days} days: cold {cold * 1000:.1f} ms, cached {warm * 1000:.2f} ms")
+    print(f"market CCL {screen.market_ccl[-1]:,.2f}, {len(screen.flagged(0.02))} pairs beyond +/-2%")
+
+
+if __name__ == "__main__":
+    main()
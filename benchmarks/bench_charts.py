@@ -0,0 +1,55 @@
+"""
+Chart payload benchmark.
+
+Builds the price and comparison figures from synthetic data with and without
+downsampling and reports the JSON payload shipped to the browser.
+
+    python benchmarks/bench_charts.py
+"""
+import os
+import sys
+import time
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.app.components import build_price_figure, build_comparison_figure
+from src.data.synthetic import generate_ohlcv
+
+# (label, trading days, tickers in the comparison chart)
+SCENARIOS = [
+    ("1y", 252, 5),
+    ("5y", 252 * 5, 15),
+    ("20y", 252 * 20, 50),
+]
+
+
+def payload_size(fig) -> int:
+    return len(fig.to_json().encode("utf-8"))
+
+
+def measure(builder, *args, **kwargs):
+    start = time.perf_counter()
+    fig = builder(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    return payload_size(fig), elapsed
+
+
+def main():
+    print(f"{'chart':<12}{'period':>8}{'before':>14}{'after':>14}{'ratio':>8}{'build ms':>10}")
+    for label, days, n_tickers in SCENARIOS:
+        frames = {f"T{i:03d}": generate_ohlcv(f"T{i:03d}", days) for i in range(n_tickers)}
+        first = next(iter(frames))
+
+        cases = [
+            ("price", build_price_figure, (first, frames[first])),
+            (f"compare x{n_tickers}", build_comparison_figure, (frames,)),
+        ]
+        for name, builder, args in cases:
+            before, _ = measure(builder, *args, downsample=False)
+            after, elapsed = measure(builder, *args)
+            print(f"{name:<12}{label:>8}{before:>14,}{after:>14,}{before / after:>8.1f}{elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
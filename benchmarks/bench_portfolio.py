@@ -0,0 +1,57 @@
+"""
+Portfolio construction benchmark.
+
+Times the minimum-variance, efficient-frontier and max-Sharpe computations
+on synthetic universes and checks them against plain SLSQP on the first
+size.
+
+    python benchmarks/bench_portfolio.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis.portfolio import MeanVarianceOptimizer, _slsqp, aligned_returns
+from src.data.synthetic import generate_ohlcv
+
+# (assets, max weight)
+SCENARIOS = [(50, 0.1), (200, 0.05), (500, 0.02)]
+FRONTIER_POINTS = 50
+DAYS = 252 * 5
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    # Keep the one-off scipy import out of the first timings
+    import scipy.optimize  # noqa: F401
+
+    print(f"{'assets':>8}{'min var ms':>12}{'frontier ms':>13}{'max sharpe ms':>15}{'vs SLSQP':>12}")
+    for i, (n_assets, cap) in enumerate(SCENARIOS):
+        prices = {f"P{j:03d}": generate_ohlcv(f"P{j:03d}", DAYS) for j in range(n_assets)}
+        returns = aligned_returns(prices)
+        optimizer = MeanVarianceOptimizer(returns, max_weight=cap)
+
+        min_var, t_min = timed(optimizer.min_variance)
+        _, t_frontier = timed(lambda: optimizer.efficient_frontier(FRONTIER_POINTS))
+        _, t_sharpe = timed(optimizer.max_sharpe)
+
+        check = ""
+        if i == 0:
+            cov = optimizer.covariance.to_numpy()
+            ref = _slsqp(cov, np.ones((1, n_assets)), np.ones(1), cap, np.full(n_assets, 1 / n_assets))
+            check = f"{min_var.volatility / np.sqrt(ref @ cov @ ref) - 1:+.1e}"
+        print(f"{n_assets:>8}{t_min * 1000:>12.1f}{t_frontier * 1000:>13.1f}{t_sharpe * 1000:>15.1f}{check:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Monte Carlo simulation benchmark.
+
+Simulates 1M one-year paths of a synthetic ticker with both methods and
+reports the run time and the peak traced memory, next to what the full
+paths x days matrix would take.
+
+    python benchmarks/bench_simulation.py [--paths 1000000] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis.simulation import SIMULATION_METHODS, simulate_ticker
+from src.data.synthetic import generate_ohlcv
+
+HORIZON = 252
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation benchmark")
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None, help="Default: all cores")
+    args = parser.parse_args(argv)
+
+    df = generate_ohlcv("SIM", 252 * 5)
+    full_mb = args.paths * HORIZON * 8 / 2**20
+    print(f"{args.paths:,} paths x {HORIZON} days (full matrix would be {full_mb:,.0f} MB), "
+          f"{args.workers or os.cpu_count()} worker(s)")
+    print(f"{'method':<12}{'seconds':>10}{'peak MB':>10}{'VaR 95%':>10}{'CVaR 95%':>10}{'median DD':>11}")
+
+    tracemalloc.start()
+    for method in SIMULATION_METHODS:
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = simulate_ticker(df, n_paths=args.paths, horizon=HORIZON, method=method,
+                                 seed=42, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        print(f"{method:<12}{elapsed:>10.2f}{peak_mb:>10.0f}{result.var[0.95]:>10.1%}"
+              f"{result.cvar[0.95]:>10.1%}{result.drawdown_percentiles([50])[50]:>11.1%}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
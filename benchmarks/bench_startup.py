@@ -0,0 +1,73 @@
+"""
+Cold-start import benchmark.
+
+Imports each entry point in a fresh interpreter with `-X importtime` and
+reports the total import time plus the cost of the heavy third-party
+packages it pulled in (0 means the package was not imported at all).
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --json startup.json   # per-module detail
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+ENTRY_POINTS = {
+    "dashboard": "src.app.main",
+    "cli": "src.cli.screener",
+    "api": "src.api.server",
+    "engine": "src.domain.signals",
+    "loader": "src.data.loader",
+}
+HEAVY_PACKAGES = ["streamlit", "plotly", "yfinance", "scipy", "pyarrow", "pandas", "numpy", "dotenv"]
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in microseconds per imported module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = [p.strip() for p in line[len("import time:"):].split("|")]
+        # A module is imported once; keep its cumulative cost
+        times[name] = max(times.get(name, 0), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per entry point")
+    parser.add_argument("--json", help="Write per-module import times to this file")
+    args = parser.parse_args()
+
+    report = {}
+    print(f"{'entry point':<12}{'total ms':>10}" + "".join(f"{p:>11}" for p in HEAVY_PACKAGES))
+    for label, module in ENTRY_POINTS.items():
+        runs = [import_times(module) for _ in range(args.repeat)]
+        merged = {name: median(r.get(name, 0) for r in runs) for name in runs[0]}
+        report[label] = {"module": module, "modules_us": merged}
+
+        total = merged.get(module, 0) / 1000
+        heavy = [merged.get(p, 0) / 1000 for p in HEAVY_PACKAGES]
+        print(f"{label:<12}{total:>10.0f}" + "".join(f"{h:>11.0f}" for h in heavy))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Per-module import times written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
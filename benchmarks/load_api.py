@@ -0,0 +1,100 @@
+"""
+Load test for the local JSON API against the offline data provider.
+
+Starts the server in-process on a free port, replays a mix of ranking,
+ticker and indicator requests from concurrent keep-alive clients, and
+reports p50/p99 latency per endpoint.
+
+    python benchmarks/load_api.py --requests 2000 --concurrency 8
+"""
+import argparse
+import http.client
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.server import make_server
+from src.app.utils import get_default_tickers
+from src.data.synthetic import OfflineDataLoader
+
+
+def build_paths(tickers):
+    paths = [("rankings", "/rankings?period=1y&risk_profile=Moderate"),
+             ("rankings", "/rankings?period=1y&risk_profile=Aggressive")]
+    for t in tickers:
+        paths.append(("ticker", f"/tickers/{t}?period=1y"))
+        paths.append(("indicators", f"/tickers/{t}/indicators?period=1y"))
+    return paths
+
+
+def worker(port, jobs, conditional_ratio, etags, lock):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    samples = []
+    for endpoint, path in jobs:
+        headers = {}
+        with lock:
+            etag = etags.get(path)
+        if etag and random.random() < conditional_ratio:
+            headers["If-None-Match"] = etag
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        elapsed = time.perf_counter() - start
+        if resp.status == 200:
+            with lock:
+                etags[path] = resp.getheader("ETag")
+        samples.append((endpoint, resp.status, elapsed))
+    conn.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--conditional", type=float, default=0.5,
+                        help="Share of requests sent with If-None-Match once an ETag is known")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    server = make_server(OfflineDataLoader(), port=0)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    paths = build_paths(get_default_tickers())
+    jobs = [random.choice(paths) for _ in range(args.requests)]
+    per_worker = [jobs[i::args.concurrency] for i in range(args.concurrency)]
+    etags, lock = {}, threading.Lock()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(worker, port, chunk, args.conditional, etags, lock) for chunk in per_worker]
+        samples = [s for f in futures for s in f.result()]
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"{len(samples)} requests, concurrency {args.concurrency}, {len(samples) / wall:.0f} req/s")
+    print(f"{'endpoint':<12}{'count':>7}{'304s':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint in ("rankings", "ticker", "indicators"):
+        rows = [s for s in samples if s[0] == endpoint]
+        if not rows:
+            continue
+        lat = np.array([s[2] for s in rows]) * 1000
+        not_modified = sum(1 for s in rows if s[1] == 304)
+        print(f"{endpoint:<12}{len(rows):>7}{not_modified:>7}{np.percentile(lat, 50):>9.2f}"
+              f"{np.percentile(lat, 99):>9.2f}{lat.max():>9.1f}")
+    print(f"response cache: {server.RequestHandlerClass.service.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Reproducible performance benchmark suite.
+
+Times the hot paths (indicators, metrics, SignalEngine.analyze_ticker and
+DataCache save/get) over synthetic universes of several sizes, stores the
+results as a JSON baseline and compares later runs against it.
+
+    # Record a baseline on this machine
+    python benchmarks/suite.py --preset quick --save benchmarks/baselines/quick.json
+
+    # Fail (exit 1) if any case got more than 25% slower
+    python benchmarks/suite.py --preset quick --compare benchmarks/baselines/quick.json --threshold 0.25
+
+Timings are only comparable on the same machine; record the baseline where
+the comparison will run.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the python path to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis.indicators import calculate_rsi, calculate_sma, calculate_bollinger_bands
+from src.analysis.metrics import (
+    calculate_daily_returns, calculate_cumulative_return,
+    calculate_volatility, calculate_max_drawdown
+)
+from src.data.storage import DataCache
+from src.data.synthetic import generate_ohlcv
+from src.domain.signals import SignalEngine
+
+TRADING_DAYS = 252
+
+# (tickers, years) grids
+PRESETS = {
+    "smoke": {"tickers": [100], "years": [1], "repeat": 1},
+    "quick": {"tickers": [100, 1000], "years": [1, 5], "repeat": 3},
+    "full": {"tickers": [100, 1000, 5000], "years": [1, 5, 20], "repeat": 3},
+}
+
+# Distinct synthetic series per size; larger universes cycle through them so
+# memory stays flat (5,000 x 20y of unique OHLCV would need ~1 GB)
+UNIQUE_SERIES = 100
+
+SEED = 42
+
+
+def make_universe(n_tickers: int, years: int) -> List[pd.DataFrame]:
+    days = years * TRADING_DAYS
+    pool = [generate_ohlcv(f"B{i:03d}", days, seed=SEED + i) for i in range(min(n_tickers, UNIQUE_SERIES))]
+    return [pool[i % len(pool)] for i in range(n_tickers)]
+
+
+def _each_close(fn: Callable) -> Callable:
+    def run(frames, _ctx):
+        for df in frames:
+            fn(df["Close"])
+    return run
+
+
+def _metrics(frames, _ctx):
+    for df in frames:
+        prices = df["Close"]
+        rets = calculate_daily_returns(prices)
+        calculate_volatility(rets)
+        calculate_cumulative_return(prices)
+        calculate_max_drawdown(prices)
+
+
+def _analyze(frames, _ctx):
+    engine = SignalEngine()
+    for i, df in enumerate(frames):
+        engine.analyze_ticker(f"T{i}", df, "Moderate")
+
+
+def _cache_save(frames, ctx):
+    cache = ctx["cache"]
+    for i, df in enumerate(frames):
+        cache.save_data(f"T{i}", "bench", df)
+
+
+def _cache_get(frames, ctx):
+    cache = ctx["cache"]
+    for i in range(len(frames)):
+        cache.get_data(f"T{i}", "bench")
+
+
+# name -> (timed function, untimed setup or None)
+CASES: Dict[str, Tuple[Callable, Optional[Callable]]] = {
+    "indicators.rsi": (_each_close(lambda s: calculate_rsi(s, 14)), None),
+    "indicators.sma": (_each_close(lambda s: calculate_sma(s, 50)), None),
+    "indicators.bollinger": (_each_close(calculate_bollinger_bands), None),
+    "metrics.daily_returns": (_each_close(calculate_daily_returns), None),
+    "metrics.volatility": (_each_close(lambda s: calculate_volatility(calculate_daily_returns(s))), None),
+    "metrics.max_drawdown": (_each_close(calculate_max_drawdown), None),
+    "metrics.all": (_metrics, None),
+    "engine.analyze_ticker": (_analyze, None),
+    "cache.save": (_cache_save, None),
+    "cache.get": (_cache_get, _cache_save),
+}
+
+
+def time_case(fn: Callable, frames, ctx, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(frames, ctx)
+        samples.append(time.perf_counter() - start)
+    best = min(samples)
+    return {
+        "min_s": best,
+        "median_s": float(np.median(samples)),
+        "per_ticker_us": best / len(frames) * 1e6,
+    }
+
+
+def run_suite(preset: str, only: List[str] = None) -> Dict:
+    config = PRESETS[preset]
+    results = {}
+    for n_tickers in config["tickers"]:
+        for years in config["years"]:
+            frames = make_universe(n_tickers, years)
+            with tempfile.TemporaryDirectory() as tmp:
+                ctx = {"cache": DataCache(db_path=os.path.join(tmp, "bench.db"), ttl_hours=24)}
+                for name, (fn, setup) in CASES.items():
+                    if only and not any(name.startswith(o) for o in only):
+                        continue
+                    if setup:
+                        setup(frames, ctx)
+                    case_id = f"{name}[{n_tickers}x{years}y]"
+                    results[case_id] = time_case(fn, frames, ctx, config["repeat"])
+                    r = results[case_id]
+                    print(f"{case_id:<42}{r['min_s'] * 1000:>12.1f} ms{r['per_ticker_us']:>12.1f} us/ticker")
+    return {
+        "meta": {
+            "preset": preset,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every case slower than baseline * (1 + threshold)."""
+    regressions = []
+    print(f"\n{'case':<42}{'baseline ms':>13}{'current ms':>13}{'change':>9}")
+    for case_id, base in baseline["results"].items():
+        cur = current["results"].get(case_id)
+        if cur is None:
+            continue
+        change = cur["min_s"] / base["min_s"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{case_id:<42}{base['min_s'] * 1000:>13.1f}{cur['min_s'] * 1000:>13.1f}{change:>+9.1%}{flag}")
+        if flag:
+            regressions.append(f"{case_id}: {change:+.1%}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FinanceLab benchmark suite")
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick")
+    parser.add_argument("--only", nargs="*", help="Run only cases whose name starts with these prefixes")
+    parser.add_argument("--save", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before a case counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.preset, args.only)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Array math for CEDEARs (Argentine certificates over foreign shares).
+
+A CEDEAR trades in ARS on BYMA and represents 1/ratio of an underlying
+share, so every pair implies a CCL exchange rate:
+
+    implied CCL = local price (ARS) * ratio / underlying price (USD)
+
+All functions take (dates, pairs) arrays already aligned on one calendar
+(see data.ingest.PricePanel) and work column-wise, so a screen of hundreds
+of pairs is a handful of numpy operations.
+"""
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def implied_ccl(local: np.ndarray, underlying: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    """Implied CCL rate of every pair on every date, shape (dates, pairs)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ccl = local * ratios / underlying
+    ccl[~np.isfinite(ccl) | (ccl <= 0)] = np.nan
+    return ccl
+
+
+def last_valid(values: np.ndarray) -> np.ndarray:
+    """Last non-NaN value of every column (NaN for all-NaN columns)."""
+    valid = ~np.isnan(values)
+    last = len(values) - 1 - valid[::-1].argmax(axis=0)
+    return values[last, np.arange(values.shape[1])]
+
+
+def _previous_valid(prices: np.ndarray) -> np.ndarray:
+    """Each cell's latest non-NaN value up to and including it."""
+    rows = np.where(~np.isnan(prices), np.arange(len(prices))[:, None], 0)
+    return prices[np.maximum.accumulate(rows, axis=0), np.arange(prices.shape[1])]
+
+
+def market_ccl(ccl: np.ndarray) -> np.ndarray:
+    """
+    Reference CCL per date: the median across pairs, which a few illiquid
+    or mispriced CEDEARs can't move.
+    """
+    valid = ~np.isnan(ccl).all(axis=1)
+    rate = np.full(ccl.shape[0], np.nan)
+    rate[valid] = np.nanmedian(ccl[valid], axis=1)
+    return rate
+
+
+@dataclass
+class SeriesMetrics:
+    """Per-pair metrics, one array entry per column of the input."""
+    total_return: np.ndarray
+    volatility: np.ndarray  # annualized
+    max_drawdown: np.ndarray  # <= 0
+
+
+def series_metrics(prices: np.ndarray, periods_per_year: int = TRADING_DAYS) -> SeriesMetrics:
+    """
+    Total return, annualized volatility and max drawdown of every column.
+    NaN is skipped, whether outside a column's own history (PricePanel
+    how="outer") or on sessions it did not trade (PricePanel.traded): a
+    return spans the days since the previous traded price.
+    """
+    valid = ~np.isnan(prices)
+    first = valid.argmax(axis=0)
+    last = len(prices) - 1 - valid[::-1].argmax(axis=0)
+    columns = np.arange(prices.shape[1])
+
+    returns = prices[1:] / _previous_valid(prices)[:-1] - 1
+    peaks = np.fmax.accumulate(prices, axis=0)  # fmax carries the peak over leading NaN
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return SeriesMetrics(
+            total_return=prices[last, columns] / prices[first, columns] - 1,
+            volatility=np.nanstd(returns, axis=0, ddof=1) * np.sqrt(periods_per_year),
+            max_drawdown=np.nanmin(prices / peaks - 1, axis=0),
+        )
+
+
+@dataclass
+class PremiumStats:
+    premium: np.ndarray  # latest valid implied CCL / market CCL - 1
+    mean: np.ndarray  # of the premium over the lookback
+    zscore: np.ndarray  # latest premium vs. its own lookback history
+
+
+def premium_stats(ccl: np.ndarray, reference: np.ndarray, lookback: int = 60) -> PremiumStats:
+    """
+    Premium (> 0) or discount (< 0) of every pair's implied CCL against the
+    reference rate, and how unusual today's value is for that pair.
+    """
+    premium = ccl / reference[:, None] - 1
+    window = premium[-lookback:]
+    latest = last_valid(premium)
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        # Pairs without a single valid day just come out as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(window, axis=0)
+        std = np.nanstd(window, axis=0, ddof=1)
+        zscore = np.where(std > 0, (latest - mean) / std, 0.0)
+    return PremiumStats(premium=latest, mean=mean, zscore=zscore)
@@ -12,11 +12,11 @@ def calculate_cumulative_return(series: pd.Series) -> float:
     if start == 0: return 0.0
     return (end - start) / start
 
-def calculate_volatility(daily_returns: pd.Series, annualized: bool = True) -> float:
-    """Annualized volatility."""
+def calculate_volatility(daily_returns: pd.Series, annualized: bool = True, periods_per_year: int = 252) -> float:
+    """Annualized volatility (periods_per_year bars a year; 252 trading days for daily bars)."""
     vol = daily_returns.std()
     if annualized:
-        vol = vol * np.sqrt(252) # 252 trading days
+        vol = vol * np.sqrt(periods_per_year)
     return vol
 
 def calculate_max_drawdown(series: pd.Series) -> float:
@@ -0,0 +1,253 @@
+"""
+Long-only mean-variance portfolio construction with per-asset weight caps.
+
+Every problem here is the same small quadratic program
+
+    min  w' C w   s.t.  sum(w) = 1,  [mu' w = target],  0 <= w <= cap
+
+solved with a primal active-set method that can be warm-started: frontier
+points are solved in order, each starting from the previous solution, so
+most of them only need a couple of active-set changes. scipy's SLSQP is
+kept as a fallback for degenerate inputs the active-set loop can't settle.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.lazy import lazy_import
+from ..data.ingest import build_price_panel
+
+optimize = lazy_import("scipy.optimize")
+
+TRADING_DAYS = 252
+
+# Weights below this are reported as exactly zero
+WEIGHT_EPS = 1e-9
+
+
+@dataclass
+class Portfolio:
+    weights: pd.Series  # indexed by ticker, sums to 1
+    expected_return: float  # annualized
+    volatility: float  # annualized
+    sharpe: float
+
+
+def aligned_returns(price_data: Dict[str, pd.DataFrame], tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Close-to-close returns of the given tickers on the sessions they all
+    traded; a return spans any holiday of one of them.
+    """
+    panel = build_price_panel(price_data, tickers).common_sessions()
+    return pd.DataFrame(panel.returns(), index=panel.dates[1:], columns=panel.tickers)
+
+
+def _max_return_weights(mu: np.ndarray, cap: float) -> np.ndarray:
+    """Highest-return feasible portfolio: fill the best assets up to the cap."""
+    w = np.zeros(len(mu))
+    remaining = 1.0
+    for i in np.argsort(-mu, kind="stable"):
+        w[i] = min(cap, remaining)
+        remaining -= w[i]
+        if remaining <= 0:
+            break
+    return w
+
+
+def _active_set_qp(cov: np.ndarray, A: np.ndarray, b: np.ndarray, cap: float,
+                   w0: np.ndarray, tol: float = 1e-10) -> Optional[np.ndarray]:
+    """
+    Minimize w'Cw subject to A w = b and 0 <= w <= cap from a feasible w0.
+
+    The working set is the assets pinned at a bound; each iteration solves
+    the equality-constrained problem over the free assets and either moves
+    towards it until a bound blocks, or releases the pinned asset whose
+    multiplier has the wrong sign. Returns None if it fails to converge.
+    """
+    n = len(w0)
+    w = w0.copy()
+    at_lower = w <= tol
+    at_upper = ~at_lower & (w >= cap - tol)
+
+    for _ in range(10 * n + 50):
+        w[at_lower] = 0.0
+        w[at_upper] = cap
+        free = np.flatnonzero(~(at_lower | at_upper))
+        pinned = np.where(at_upper, cap, 0.0)
+
+        # KKT system of the subproblem over the free assets
+        k, m = len(free), len(b)
+        kkt = np.zeros((k + m, k + m))
+        kkt[:k, :k] = cov[np.ix_(free, free)]
+        kkt[:k, k:] = A[:, free].T
+        kkt[k:, :k] = A[:, free]
+        rhs = np.concatenate([-cov[free] @ pinned, b - A @ pinned])
+        try:
+            sol = np.linalg.solve(kkt, rhs)
+        except np.linalg.LinAlgError:
+            sol = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        target, nu = sol[:k], sol[k:]
+
+        step = target - w[free]
+        if np.abs(step).max(initial=0.0) <= tol:
+            # Optimal on this working set; check the pinned assets' multipliers
+            grad = cov @ w + A.T @ nu
+            slack = np.full(n, np.inf)
+            slack[at_lower] = grad[at_lower]
+            slack[at_upper] = -grad[at_upper]
+            worst = int(np.argmin(slack))
+            if slack[worst] >= -tol * max(1.0, np.abs(grad).max()):
+                return w
+            at_lower[worst] = at_upper[worst] = False
+            continue
+
+        # Largest step along `step` that stays within the bounds
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(step < 0, -w[free] / step,
+                             np.where(step > 0, (cap - w[free]) / step, np.inf))
+        blocking = int(np.argmin(ratio))
+        alpha = min(1.0, ratio[blocking])
+        w[free] += alpha * step
+        if alpha < 1.0:
+            i = free[blocking]
+            if step[blocking] < 0:
+                at_lower[i] = True
+            else:
+                at_upper[i] = True
+    return None
+
+
+def _slsqp(cov: np.ndarray, A: np.ndarray, b: np.ndarray, cap: float, w0: np.ndarray) -> np.ndarray:
+    constraints = [{"type": "eq", "fun": lambda w: A @ w - b, "jac": lambda w: A}]
+    res = optimize.minimize(
+        lambda w: w @ cov @ w, w0, jac=lambda w: 2 * cov @ w, method="SLSQP",
+        bounds=[(0.0, cap)] * len(w0), constraints=constraints,
+        options={"ftol": 1e-12, "maxiter": 1000},
+    )
+    return res.x
+
+
+class MeanVarianceOptimizer:
+    """
+    Minimum-variance, maximum-Sharpe and efficient-frontier portfolios.
+
+    Expected returns and the covariance matrix are estimated once from the
+    returns given at construction and shared by every query; frontiers are
+    cached per number of points.
+    """
+
+    def __init__(self, returns: pd.DataFrame, max_weight: float = 1.0,
+                 risk_free_rate: float = 0.0, periods_per_year: int = TRADING_DAYS):
+        """
+        Args:
+            returns: Periodic returns, one column per asset
+            max_weight: Cap on any single weight (long-only, so 1.0 = uncapped)
+            risk_free_rate: Annual rate used for the Sharpe ratio
+            periods_per_year: Annualization factor of `returns`
+        """
+        if returns.shape[1] < 2:
+            raise ValueError("At least two assets are needed to build a portfolio")
+        if max_weight * returns.shape[1] < 1 - 1e-12:
+            raise ValueError(f"max_weight={max_weight} is infeasible for {returns.shape[1]} assets")
+        if len(returns) <= returns.shape[1]:
+            # The sample covariance would be singular (zero-risk portfolios)
+            raise ValueError(f"{len(returns)} observations are too few for {returns.shape[1]} assets")
+
+        self.tickers = list(returns.columns)
+        self.max_weight = float(max_weight)
+        self.risk_free_rate = risk_free_rate
+        values = returns.to_numpy(dtype=float)
+        self._mu = values.mean(axis=0) * periods_per_year
+        self._cov = np.cov(values, rowvar=False) * periods_per_year
+        self._ones = np.ones((1, len(self.tickers)))
+        self._min_variance: Optional[np.ndarray] = None
+        self._frontiers: Dict[int, List[np.ndarray]] = {}
+
+    @classmethod
+    def from_prices(cls, price_data: Dict[str, pd.DataFrame], tickers: Optional[List[str]] = None,
+                    **kwargs) -> "MeanVarianceOptimizer":
+        return cls(aligned_returns(price_data, tickers), **kwargs)
+
+    @property
+    def expected_returns(self) -> pd.Series:
+        return pd.Series(self._mu, index=self.tickers)
+
+    @property
+    def covariance(self) -> pd.DataFrame:
+        return pd.DataFrame(self._cov, index=self.tickers, columns=self.tickers)
+
+    def _solve(self, A: np.ndarray, b: np.ndarray, w0: np.ndarray) -> np.ndarray:
+        w = _active_set_qp(self._cov, A, b, self.max_weight, w0)
+        if w is None:
+            w = _slsqp(self._cov, A, b, self.max_weight, w0)
+        return w
+
+    def _portfolio(self, w: np.ndarray) -> Portfolio:
+        w = np.where(w < WEIGHT_EPS, 0.0, w)
+        ret = float(self._mu @ w)
+        vol = float(np.sqrt(max(w @ self._cov @ w, 0.0)))
+        sharpe = (ret - self.risk_free_rate) / vol if vol > 0 else 0.0
+        return Portfolio(pd.Series(w, index=self.tickers), ret, vol, sharpe)
+
+    def _min_variance_weights(self) -> np.ndarray:
+        if self._min_variance is None:
+            n = len(self.tickers)
+            self._min_variance = self._solve(self._ones, np.ones(1), np.full(n, 1.0 / n))
+        return self._min_variance
+
+    def _target_weights(self, target: float, w_lo: np.ndarray, w_hi: np.ndarray) -> np.ndarray:
+        """Minimum-variance weights returning `target`, warm-started between two solutions."""
+        r_lo, r_hi = self._mu @ w_lo, self._mu @ w_hi
+        alpha = 0.0 if r_hi <= r_lo else (target - r_lo) / (r_hi - r_lo)
+        # A blend of two feasible portfolios is feasible and hits the target
+        w0 = w_lo + np.clip(alpha, 0.0, 1.0) * (w_hi - w_lo)
+        A = np.vstack([self._ones, self._mu])
+        return self._solve(A, np.array([1.0, self._mu @ w0]), w0)
+
+    def _frontier_weights(self, n_points: int) -> List[np.ndarray]:
+        if n_points not in self._frontiers:
+            w_min = self._min_variance_weights()
+            w_max = _max_return_weights(self._mu, self.max_weight)
+            targets = np.linspace(self._mu @ w_min, self._mu @ w_max, n_points)
+            points = [w_min]
+            for target in targets[1:]:
+                points.append(self._target_weights(target, points[-1], w_max))
+            self._frontiers[n_points] = points
+        return self._frontiers[n_points]
+
+    def min_variance(self) -> Portfolio:
+        return self._portfolio(self._min_variance_weights())
+
+    def efficient_frontier(self, n_points: int = 50) -> List[Portfolio]:
+        """
+        Minimum-variance portfolios for evenly spaced target returns, from
+        the minimum-variance portfolio to the highest attainable return.
+        """
+        if n_points < 2:
+            raise ValueError("n_points must be at least 2")
+        return [self._portfolio(w) for w in self._frontier_weights(n_points)]
+
+    def max_sharpe(self, grid_points: int = 25) -> Portfolio:
+        """
+        Tangency portfolio. The Sharpe ratio is unimodal along the efficient
+        frontier, so the best grid point is refined with a bounded scalar
+        search between its neighbours. A frontier already computed with
+        `grid_points` points is reused as the grid.
+        """
+        points = self._frontier_weights(grid_points)
+        sharpes = [self._portfolio(w).sharpe for w in points]
+        best = int(np.argmax(sharpes))
+        lo, hi = points[max(best - 1, 0)], points[min(best + 1, len(points) - 1)]
+        r_lo, r_hi = self._mu @ lo, self._mu @ hi
+        if r_hi - r_lo <= 1e-12:
+            return self._portfolio(points[best])
+
+        def neg_sharpe(target):
+            return -self._portfolio(self._target_weights(target, lo, hi)).sharpe
+
+        res = optimize.minimize_scalar(neg_sharpe, bounds=(r_lo, r_hi), method="bounded",
+                                       options={"xatol": 1e-6 * (r_hi - r_lo)})
+        refined = self._portfolio(self._target_weights(res.x, lo, hi))
+        return refined if refined.sharpe >= sharpes[best] else self._portfolio(points[best])
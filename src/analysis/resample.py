@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+# How each OHLCV column rolls up into a coarser bar
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+# Supported timeframes and the pandas frequency of their bars.
+# Intraday and daily bars are labelled by their start, weekly bars by their
+# Friday and monthly bars by their last day, like pandas' resample does.
+TIMEFRAMES = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "1d": "1D",
+    "1wk": "W-FRI",
+    "1mo": "ME",
+}
+INTRADAY_TIMEFRAMES = ("1m", "5m", "15m", "30m", "1h")
+
+# Bars in a year of regular US sessions (6.5h, 252 days); used to annualize
+BARS_PER_YEAR = {
+    "1m": 252 * 390,
+    "5m": 252 * 78,
+    "15m": 252 * 26,
+    "30m": 252 * 13,
+    "1h": 252 * 7,
+    "1d": 252,
+    "1wk": 52,
+    "1mo": 12,
+}
+
+
+def resample_ohlc(df: pd.DataFrame, rule: str = "W-FRI") -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars to a coarser timeframe (weekly by default).
+
+    Args:
+        df: DataFrame indexed by datetime with any of Open, High, Low, Close, Volume
+        rule: pandas offset alias (e.g. "W-FRI", "ME")
+
+    Returns:
+        pd.DataFrame with one row per period that had data
+    """
+    agg = {col: how for col, how in OHLCV_AGGREGATION.items() if col in df.columns}
+    bars = df.resample(rule).agg(agg)
+    return bars.dropna(subset=["Close"]) if "Close" in bars.columns else bars
+
+
+def _bar_labels(index: pd.DatetimeIndex, timeframe: str) -> np.ndarray:
+    """datetime64 bucket label of every bar, in the index's own unit."""
+    values = index.to_numpy()
+    if timeframe == "1wk":
+        days = values.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday; a Saturday belongs to the next week
+        weekday = (days.astype("int64") + 3) % 7
+        return (days + (4 - weekday) % 7).astype(values.dtype)
+    if timeframe == "1mo":
+        months = values.astype("datetime64[M]")
+        return ((months + 1).astype("datetime64[D]") - 1).astype(values.dtype)
+    return index.floor(TIMEFRAMES[timeframe]).to_numpy()
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Roll OHLCV bars up to a coarser timeframe (e.g. 5m -> 1h, 1d -> 1wk).
+
+    Vectorized alternative to resample_ohlc for the TIMEFRAMES above: every
+    bar gets its bucket label, bucket boundaries are where the label changes,
+    and each column is reduced in one ufunc call per column. Empty buckets
+    (nights, weekends) produce no row at all.
+
+    Args:
+        df: Time-sorted bars indexed by datetime, e.g. from the ingest stage
+        timeframe: One of TIMEFRAMES
+
+    Returns:
+        pd.DataFrame of float64 OHLCV bars indexed by bucket label
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe '{timeframe}', expected one of {list(TIMEFRAMES)}")
+    if df.empty:
+        return df.copy()
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="stable")
+
+    labels = _bar_labels(pd.DatetimeIndex(df.index), timeframe)
+    keys = labels.view("int64")
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    ends = np.append(starts[1:], len(keys)) - 1
+
+    columns = {}
+    for col, how in OHLCV_AGGREGATION.items():
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy(dtype="float64")
+        if how == "first":
+            columns[col] = values[starts]
+        elif how == "last":
+            columns[col] = values[ends]
+        elif how == "max":
+            columns[col] = np.fmax.reduceat(values, starts)  # fmax/fmin skip NaN
+        elif how == "min":
+            columns[col] = np.fmin.reduceat(values, starts)
+        else:
+            columns[col] = np.add.reduceat(np.nan_to_num(values), starts)
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(labels[starts], name=df.index.name))
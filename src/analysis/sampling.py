@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+
+def _finite_subset(y: np.ndarray):
+    """Indices of the finite values of y (leading NaNs from rolling windows etc.)."""
+    return np.flatnonzero(np.isfinite(y))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Picks, for every bucket, the point forming the largest triangle with the
+    previously selected point and the average of the next bucket. Keeps the
+    visual shape of a line with far fewer points.
+
+    Args:
+        x: Monotonic x values (numeric)
+        y: y values, NaNs are skipped
+        n_out: Target number of points
+
+    Returns:
+        Sorted indices into x/y of the points to keep
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = _finite_subset(y)
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+
+    xs, ys = x[valid], y[valid]
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+
+    # Average of every bucket (the last "bucket" is the final point),
+    # computed once so the sequential pass below only does the area math
+    bounds = np.append(edges, n)
+    counts = np.diff(bounds)
+    avg_x = np.add.reduceat(xs, edges) / counts
+    avg_y = np.add.reduceat(ys, edges) / counts
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (xs[a] - avg_x[i + 1]) * (ys[start:end] - ys[a])
+            - (xs[a] - xs[start:end]) * (avg_y[i + 1] - ys[a])
+        )
+        a = start + int(area.argmax())
+        out[i + 1] = a
+
+    return valid[out]
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min-max downsampling: keep the lowest and highest point of each bucket.
+
+    Cheaper than LTTB and guarantees extremes survive, which matters for
+    oscillators such as RSI where spikes through 30/70 are the signal.
+
+    Returns:
+        Sorted, unique indices into y of the points to keep
+    """
+    y = np.asarray(y, dtype=float)
+    valid = _finite_subset(y)
+    n = len(valid)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return valid
+
+    ys = y[valid]
+    size = int(np.ceil(n / n_buckets))
+    padded = np.concatenate([ys, np.full(n_buckets * size - n, ys[-1])])
+    buckets = padded.reshape(n_buckets, size)
+
+    offsets = np.arange(n_buckets) * size
+    mins = offsets + buckets.argmin(axis=1)
+    maxs = offsets + buckets.argmax(axis=1)
+    keep = np.unique(np.concatenate([[0, n - 1], mins, maxs]))
+    return valid[keep[keep < n]]
+
+
+def downsample_series(series: pd.Series, n_out: int, method: str = "lttb") -> pd.Series:
+    """
+    Downsample a time-indexed series for plotting.
+
+    Args:
+        series: Series indexed by datetime (or numeric) values
+        n_out: Target number of points (usually the plot width in pixels)
+        method: "lttb" or "minmax"
+
+    Returns:
+        The selected subset of the series
+    """
+    if len(series) <= n_out:
+        return series.dropna()
+
+    if method == "minmax":
+        idx = minmax_indices(series.to_numpy(), n_out)
+    else:
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex):
+            x = index.asi8.astype(float)
+        else:
+            x = np.arange(len(series), dtype=float)
+        idx = lttb_indices(x, series.to_numpy(), n_out)
+    return series.iloc[idx]
@@ -0,0 +1,219 @@
+"""
+Monte Carlo simulation of ticker or portfolio returns.
+
+Paths are generated in fixed-size chunks and reduced on the fly to their
+terminal return and maximum drawdown, so memory grows with the number of
+paths, not paths x horizon (1M paths x 252 days would be ~2 GB of floats).
+
+Every path is simulated per asset, then combined with the portfolio
+weights (constant, rebalanced daily):
+- "bootstrap" resamples whole days of the historical return matrix, which
+  keeps the cross-asset correlation of every day intact
+- "normal" draws multivariate normal log returns (geometric Brownian
+  motion) with the assets' mean vector and covariance, through the
+  Cholesky factor of the covariance
+
+Per-asset terminal returns are kept too, so asset-level risk needs no
+second run.
+
+Every chunk gets its own child of a SeedSequence, so results depend on the
+seed only, not on the number of worker threads.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core import telemetry
+
+SIMULATION_METHODS = ("bootstrap", "normal")
+DEFAULT_CHUNK_SIZE = 10_000
+# Asset returns held per chunk (paths x days x assets); chunks of wide
+# portfolios get fewer paths so they stay around 20 MB
+MAX_CHUNK_VALUES = DEFAULT_CHUNK_SIZE * 252
+
+
+@dataclass
+class SimulationResult:
+    method: str
+    n_paths: int
+    horizon: int
+    var: Dict[float, float]  # confidence -> loss (0.12 = 12% of the starting value)
+    cvar: Dict[float, float]  # confidence -> mean loss beyond the VaR
+    terminal_returns: np.ndarray  # one per path
+    max_drawdowns: np.ndarray  # one per path, <= 0
+    sample_paths: np.ndarray  # first paths' values (start = 1.0), for charts
+    assets: List[str]
+    weights: np.ndarray  # normalized, one per asset
+    asset_terminal_returns: np.ndarray  # shape (paths, assets)
+
+    def drawdown_percentiles(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[float, float]:
+        values = np.percentile(self.max_drawdowns, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def return_percentiles(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[float, float]:
+        values = np.percentile(self.terminal_returns, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def asset_risk(self, confidence: float = 0.95) -> pd.DataFrame:
+        """VaR and CVaR of every asset on its own, from the same paths."""
+        rows = [value_at_risk(self.asset_terminal_returns[:, i], confidence) for i in range(len(self.assets))]
+        return pd.DataFrame(rows, index=pd.Index(self.assets, name="asset"), columns=["var", "cvar"])
+
+
+def value_at_risk(returns: np.ndarray, confidence: float):
+    """Historical VaR and CVaR of a sample of returns, as positive losses."""
+    cutoff = np.quantile(returns, 1 - confidence)
+    tail = returns[returns <= cutoff]
+    return float(-cutoff), float(-tail.mean())
+
+
+def _asset_history(returns: Union[pd.Series, pd.DataFrame], weights=None):
+    """Historical daily returns (days x assets), asset names and normalized weights."""
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame(returns.name if returns.name is not None else "asset")
+    returns = returns.dropna()
+    if weights is None:
+        w = np.full(returns.shape[1], 1.0 / returns.shape[1])
+    elif isinstance(weights, pd.Series):
+        w = weights.reindex(returns.columns).fillna(0.0).to_numpy(dtype=float)
+    else:
+        w = np.asarray(weights, dtype=float)
+    return returns.to_numpy(dtype=float), [str(c) for c in returns.columns], w / w.sum()
+
+
+def _covariance_factor(cov: np.ndarray) -> np.ndarray:
+    """L with L @ L.T == cov; falls back to an eigendecomposition when cov is singular."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        # Collinear assets or fewer days than assets: positive semidefinite only
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+def _simulate_chunk(log_history: np.ndarray, factor: np.ndarray, weights: np.ndarray, method: str,
+                    n: int, horizon: int, seed: np.random.SeedSequence):
+    rng = np.random.default_rng(seed)
+    k = log_history.shape[1]
+    if k == 1:
+        # A single asset is its own portfolio
+        if method == "bootstrap":
+            daily = log_history[:, 0][rng.integers(0, len(log_history), size=(n, horizon))]
+        else:
+            daily = rng.standard_normal((n, horizon)) * factor[0, 0] + log_history.mean()
+        asset_terminal = None
+    else:
+        if method == "bootstrap":
+            asset = log_history[rng.integers(0, len(log_history), size=(n, horizon))]
+        else:
+            asset = rng.standard_normal((n, horizon, k)) @ factor.T
+            asset += log_history.mean(axis=0)
+        asset_terminal = np.expm1(asset.sum(axis=1))
+        # Weights apply to simple returns; back to log space for the path
+        daily = np.log1p(np.expm1(asset, out=asset) @ weights)
+
+    # In log space drawdowns are differences; only the terminal values,
+    # the worst drawdowns and the kept sample paths need an exp
+    log_values = np.cumsum(daily, axis=1, out=daily)
+    peaks = np.maximum.accumulate(log_values, axis=1)
+    np.maximum(peaks, 0.0, out=peaks)  # the starting value is a peak too
+    worst = (log_values - peaks).min(axis=1)
+    terminal = np.expm1(log_values[:, -1])
+    if asset_terminal is None:
+        asset_terminal = terminal[:, None]
+    return terminal, np.expm1(worst), asset_terminal, log_values
+
+
+def simulate_returns(
+    returns: Union[pd.Series, pd.DataFrame],
+    weights=None,
+    n_paths: int = 100_000,
+    horizon: int = 252,
+    method: str = "bootstrap",
+    confidence: Sequence[float] = (0.95, 0.99),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    keep_paths: int = 100,
+) -> SimulationResult:
+    """
+    Simulate future value paths of a ticker or constant-weight portfolio.
+
+    Args:
+        returns: Historical daily returns; a Series for one ticker or a
+            DataFrame with one column per asset
+        weights: Portfolio weights (Series by ticker or array by column);
+            equal weights by default
+        n_paths: Number of simulated paths
+        horizon: Trading days per path
+        method: "bootstrap" (resample historical days) or "normal"
+        confidence: VaR/CVaR confidence levels
+        chunk_size: Paths generated at a time; bounds peak memory (wide
+            portfolios use smaller chunks, see MAX_CHUNK_VALUES)
+        seed: Seed for reproducible results
+        workers: Threads generating chunks (default: all cores)
+        keep_paths: Number of full paths kept for charts
+
+    Returns:
+        SimulationResult
+    """
+    if method not in SIMULATION_METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {SIMULATION_METHODS}")
+    history, assets, w = _asset_history(returns, weights)
+    if len(history) < 2:
+        raise ValueError("At least two historical returns are needed")
+    log_history = np.log1p(history)
+    factor = _covariance_factor(np.atleast_2d(np.cov(log_history, rowvar=False)))
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_VALUES // (horizon * len(assets))))
+
+    terminal = np.empty(n_paths)
+    drawdowns = np.empty(n_paths)
+    asset_terminal = np.empty((n_paths, len(assets)))
+    keep = min(keep_paths, n_paths)
+    samples = np.empty((keep, horizon + 1))
+    samples[:, 0] = 1.0
+
+    starts = range(0, n_paths, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+
+    def run_chunk(i: int):
+        start = starts[i]
+        end = min(start + chunk_size, n_paths)
+        # Chunks write disjoint slices, so no locking is needed
+        terminal[start:end], drawdowns[start:end], asset_terminal[start:end], log_values = _simulate_chunk(
+            log_history, factor, w, method, end - start, horizon, seeds[i]
+        )
+        if start < keep:
+            samples[start:min(end, keep), 1:] = np.exp(log_values[:keep - start])
+
+    with telemetry.span("simulation_seconds", method=method):
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            # list() re-raises the first chunk error, if any
+            list(pool.map(run_chunk, range(len(starts))))
+
+    var, cvar = {}, {}
+    for level in confidence:
+        var[level], cvar[level] = value_at_risk(terminal, level)
+
+    return SimulationResult(
+        method=method,
+        n_paths=n_paths,
+        horizon=horizon,
+        var=var,
+        cvar=cvar,
+        terminal_returns=terminal,
+        max_drawdowns=drawdowns,
+        sample_paths=samples,
+        assets=assets,
+        weights=w,
+        asset_terminal_returns=asset_terminal,
+    )
+
+
+def simulate_ticker(df: pd.DataFrame, **kwargs) -> SimulationResult:
+    """Convenience wrapper simulating a single ticker from its OHLCV history."""
+    return simulate_returns(df["Close"].pct_change().dropna(), **kwargs)
@@ -0,0 +1,290 @@
+"""
+Local JSON API serving screener results.
+
+    python -m src.api.server --port 8000            # Yahoo Finance via the cache
+    python -m src.api.server --port 8000 --offline  # synthetic data
+
+Endpoints (all GET):
+    /health
+    /rankings?tickers=AAPL,MSFT&period=1y&risk_profile=Moderate
+    /tickers/<TICKER>?period=1y&risk_profile=Moderate
+    /tickers/<TICKER>/indicators?period=1y
+    /metrics    (Prometheus text format; enable with FINANCELAB_METRICS=1)
+
+Responses carry an ETag; clients sending If-None-Match get a 304 when the
+underlying data has not changed.
+"""
+import argparse
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+# Allow running as a script as well as a module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.analysis.indicators import calculate_rsi, calculate_sma, calculate_bollinger_bands
+from src.app.utils import get_default_tickers
+from src.core import telemetry
+from src.data.memo import ResultCache
+from src.domain.screener import run_screen
+from src.domain.signals import SignalEngine
+
+# Upper bound on tickers per /rankings request
+MAX_TICKERS = 500
+
+# Version of tickers with no cached data (delisted, failing downloads);
+# responses including one are cached for MISSING_TTL_HOURS only
+MISSING_VERSION = "missing"
+MISSING_TTL_HOURS = 0.25
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _clean(value):
+    """Make values JSON-safe: NaN/inf -> null, numpy scalars -> python."""
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if hasattr(value, "item"):  # numpy scalar
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _series(values: pd.Series) -> List[Optional[float]]:
+    return [v if math.isfinite(v) else None for v in values.astype(float).tolist()]
+
+
+def encode(payload) -> Tuple[bytes, str]:
+    """Serialize a payload and derive its ETag from the content."""
+    body = json.dumps(_clean(payload), separators=(",", ":"), allow_nan=False).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return body, etag
+
+
+class ScreenerService:
+    """
+    Builds API payloads and caches encoded responses.
+
+    Cache keys include the data version of every ticker involved, so a cached
+    response is reused only while its underlying bars are unchanged. Tickers
+    without data get MISSING_VERSION and keep the response for a short TTL.
+    """
+
+    def __init__(self, loader, engine: Optional[SignalEngine] = None,
+                 ttl_hours: float = 6, max_entries: int = 1024,
+                 missing_ttl_hours: float = MISSING_TTL_HOURS):
+        self.loader = loader
+        self.engine = engine or SignalEngine()
+        self.cache = ResultCache(ttl_hours=ttl_hours, max_entries=max_entries)
+        self.missing_ttl_hours = missing_ttl_hours
+
+    def _versions(self, tickers: List[str], period: str) -> Tuple[str, ...]:
+        versions = self.loader.data_versions(tickers, period)
+        return tuple(versions.get(t) or MISSING_VERSION for t in tickers)
+
+    def _respond(self, key: Tuple, tickers: List[str], period: str,
+                 build: Callable[[], Dict]) -> Tuple[bytes, str]:
+        hit = self.cache.get((key, self._versions(tickers, period)))
+        if hit is not None:
+            return hit
+
+        response = encode(build())
+        # Building fetched what it could; tickers still missing are retried soon
+        versions = self._versions(tickers, period)
+        ttl = self.missing_ttl_hours if MISSING_VERSION in versions else None
+        self.cache.put((key, versions), response, ttl_hours=ttl)
+        return response
+
+    def _check_profile(self, risk_profile: str):
+        if risk_profile not in SignalEngine.RISK_PROFILES:
+            raise ApiError(400, f"Unknown risk_profile '{risk_profile}'")
+
+    def _history(self, ticker: str, period: str) -> pd.DataFrame:
+        df = self.loader.get_ticker_history(ticker, period)
+        if df is None or df.empty:
+            raise ApiError(404, f"No data for {ticker}")
+        return df
+
+    def rankings(self, tickers: List[str], period: str, risk_profile: str) -> Tuple[bytes, str]:
+        self._check_profile(risk_profile)
+        tickers = sorted(set(tickers))
+        if len(tickers) > MAX_TICKERS:
+            raise ApiError(400, f"At most {MAX_TICKERS} tickers per request")
+
+        def build():
+            screen = run_screen(self.loader, self.engine, tickers, period, risk_profile)
+            return {
+                "period": period,
+                "risk_profile": risk_profile,
+                "rankings": [
+                    {"rank": i + 1, "ticker": r.ticker, "score": r.score,
+                     "recommendation": r.recommendation}
+                    for i, r in enumerate(screen.results)
+                ],
+                "failed": screen.failed,
+            }
+
+        return self._respond(("rankings", tuple(tickers), period, risk_profile), tickers, period, build)
+
+    def ticker(self, ticker: str, period: str, risk_profile: str) -> Tuple[bytes, str]:
+        self._check_profile(risk_profile)
+
+        def build():
+            result = self.engine.analyze_ticker(ticker, self._history(ticker, period), risk_profile)
+            return dict(dataclasses.asdict(result), period=period)
+
+        return self._respond(("ticker", ticker, period, risk_profile), [ticker], period, build)
+
+    def indicators(self, ticker: str, period: str) -> Tuple[bytes, str]:
+        def build():
+            df = self._history(ticker, period)
+            close = df["Close"]
+            upper, middle, lower = calculate_bollinger_bands(close)
+            return {
+                "ticker": ticker,
+                "period": period,
+                "dates": [pd.Timestamp(d).isoformat() for d in df.index],
+                "close": _series(close),
+                "rsi": _series(calculate_rsi(close, 14)),
+                "sma_20": _series(calculate_sma(close, 20)),
+                "sma_50": _series(calculate_sma(close, 50)),
+                "sma_200": _series(calculate_sma(close, 200)),
+                "bb_upper": _series(upper),
+                "bb_middle": _series(middle),
+                "bb_lower": _series(lower),
+            }
+
+        return self._respond(("indicators", ticker, period), [ticker], period, build)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    # Headers and body go out in separate writes; avoid the Nagle/delayed-ACK stall
+    disable_nagle_algorithm = True
+    service: ScreenerService = None
+    quiet = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        period = query.get("period", "1y")
+        risk_profile = query.get("risk_profile", "Moderate")
+
+        try:
+            if parts == ["health"]:
+                body, etag = encode({"status": "ok", "cache": self.service.cache.stats()})
+            elif parts == ["metrics"]:
+                self._send(200, telemetry.REGISTRY.to_prometheus().encode("utf-8"),
+                           content_type="text/plain; version=0.0.4")
+                return
+            elif parts == ["rankings"]:
+                raw = query.get("tickers")
+                tickers = [t.strip().upper() for t in raw.split(",") if t.strip()] if raw else get_default_tickers()
+                body, etag = self.service.rankings(tickers, period, risk_profile)
+            elif len(parts) == 2 and parts[0] == "tickers":
+                body, etag = self.service.ticker(parts[1].upper(), period, risk_profile)
+            elif len(parts) == 3 and parts[0] == "tickers" and parts[2] == "indicators":
+                body, etag = self.service.indicators(parts[1].upper(), period)
+            else:
+                raise ApiError(404, "Not found")
+        except ApiError as e:
+            self._send(e.status, encode({"error": e.message})[0])
+            return
+        except Exception as e:
+            self._send(500, encode({"error": str(e)})[0])
+            return
+
+        if etag in self.headers.get("If-None-Match", ""):
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status: int, body: bytes, etag: Optional[str] = None,
+              content_type: str = "application/json"):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            # Always revalidate; a 304 is cheap
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(loader, host: str = "127.0.0.1", port: int = 8000, quiet: bool = True,
+                ttl_hours: float = 6) -> ThreadingHTTPServer:
+    """Create a threaded server (one thread per connection) bound to host:port."""
+    service = ScreenerService(loader, ttl_hours=ttl_hours)
+    handler = type("BoundApiHandler", (ApiHandler,), {"service": service, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="FinanceLab local JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--offline", action="store_true", help="Serve synthetic data")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    parser.add_argument("--warmup", action="store_true",
+                        help="Keep the most requested tickers warm (also FINANCELAB_WARMUP=1)")
+    args = parser.parse_args(argv)
+
+    scheduler = None
+    if args.offline:
+        from src.data.synthetic import OfflineDataLoader
+        loader, ttl = OfflineDataLoader(), 6
+    else:
+        from src.data.loader import DataLoader
+        from src.data.warmup import WarmupScheduler, scheduler_from_env
+        loader = DataLoader()
+        ttl = loader.cache.ttl_hours
+        seed_keys = [(t, "1y") for t in get_default_tickers()]
+        scheduler = scheduler_from_env(loader, seed_keys)
+        if scheduler is None and args.warmup:
+            scheduler = WarmupScheduler(loader, seed_keys=seed_keys)
+        if scheduler is not None:
+            scheduler.start()
+
+    server = make_server(loader, args.host, args.port, quiet=not args.verbose, ttl_hours=ttl)
+    print(f"Serving FinanceLab API on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if scheduler is not None:
+            scheduler.stop(timeout=5)
+        if hasattr(loader, "cache"):
+            loader.cache.flush_access()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+
+from ..data.alerts import AlertStore
+from ..data.cedears import RatioTable
+from ..data.loader import DataLoader
+from ..data.memo import ResultCache
+from ..data.watchlists import WatchlistStore
+from ..data.warmup import WarmupScheduler, scheduler_from_env
+from .utils import get_default_tickers
+from ..domain.cedears import CedearScreener
+from ..domain.refresher import WatchlistRefresher, refresher_from_env
+from ..domain.signals import SignalEngine
+
+
+def make_request_key(tickers, period: str, risk_profile: str,
+                     versions: Optional[Dict[str, Optional[str]]] = None) -> Tuple:
+    """
+    Order-insensitive cache key for an analyze request.
+
+    `versions` (DataLoader.data_versions of the tickers) ties the key to the
+    cached data, so a refreshed ticker makes it a different request.
+    """
+    return (tuple(sorted(set(tickers))), period, risk_profile, tuple(sorted((versions or {}).items())))
+
+
+@st.cache_resource
+def get_data_loader() -> DataLoader:
+    return DataLoader()
+
+
+@st.cache_resource
+def get_signal_engine() -> SignalEngine:
+    return SignalEngine()
+
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    # Freshness comes from the data versions in the request key; the TTL only
+    # bounds how long unused entries stay around
+    return ResultCache(ttl_hours=get_data_loader().cache.ttl_hours)
+
+
+@st.cache_resource
+def get_watchlist_store() -> WatchlistStore:
+    # Lives in the same database as the price cache
+    return WatchlistStore(db_path=get_data_loader().cache.db_path)
+
+
+@st.cache_resource
+def get_cedear_screener() -> CedearScreener:
+    return CedearScreener(get_data_loader(), RatioTable(db_path=get_data_loader().cache.db_path))
+
+
+@st.cache_resource
+def get_warmup_scheduler() -> Optional[WarmupScheduler]:
+    """Started once per server process when FINANCELAB_WARMUP=1."""
+    scheduler = scheduler_from_env(get_data_loader(), [(t, "1y") for t in get_default_tickers()])
+    if scheduler is not None:
+        scheduler.start()
+    return scheduler
+
+
+@st.cache_resource
+def get_alert_store() -> AlertStore:
+    return AlertStore(db_path=get_data_loader().cache.db_path)
+
+
+@st.cache_resource
+def get_watchlist_refresher() -> Optional[WatchlistRefresher]:
+    """Started once per server process when FINANCELAB_REFRESHER=1."""
+    refresher = refresher_from_env(get_data_loader(), get_signal_engine(), get_watchlist_store(), get_alert_store())
+    if refresher is not None:
+        refresher.start()
+    return refresher
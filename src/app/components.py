@@ -1,48 +1,82 @@
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+from ..core.lazy import lazy_import
+from ..core import telemetry
 from ..domain.models import AnalysisResult
+from ..analysis.indicators import calculate_rsi, calculate_sma
+from ..analysis.sampling import downsample_series
+from ..analysis.resample import TIMEFRAMES, resample_bars
+from ..data.ingest import build_price_panel
+
+# Plotly is only imported once a chart is actually drawn
+go = lazy_import("plotly.graph_objects")
+
+# Approximate pixel width of a full-width chart in the wide layout.
+# Sending more points than pixels only grows the payload.
+DEFAULT_PLOT_WIDTH = 1200
+# Above this many bars, candlesticks are aggregated to the next timeframe
+# that fits (e.g. daily -> weekly)
+OHLC_MAX_CANDLES = 500
+
+def _x_values(index: pd.Index, compact: bool):
+    """
+    Datetime x values as epoch milliseconds (binary-encoded by plotly) instead
+    of ISO strings, which are ~3x larger. The axis is declared as a date axis.
+    """
+    if compact and isinstance(index, pd.DatetimeIndex):
+        return index.as_unit("ms").asi8
+    return index
 
 def render_metric_card(label: str, value: str, delta: str = None, help_text: str = None):
     st.metric(label=label, value=value, delta=delta, help=help_text)
 
-def plot_price_and_signals(ticker: str, df: pd.DataFrame, metrics):
+def _candle_bars(df: pd.DataFrame, timeframe: str):
+    """Bars to draw as candles and their timeframe: the first one with few enough bars."""
+    order = list(TIMEFRAMES)
+    for coarser in order[order.index(timeframe) + 1:]:
+        if len(df) <= OHLC_MAX_CANDLES:
+            break
+        df, timeframe = resample_bars(df, coarser), coarser
+    return df, timeframe
+
+def build_price_figure(ticker: str, df: pd.DataFrame, plot_width: int = DEFAULT_PLOT_WIDTH,
+                       downsample: bool = True, timeframe: str = "1d") -> "go.Figure":
     """
-    Create a Plotly chart with Candlesticks and indicators.
+    Build the candlestick + SMA + RSI figure.
+
+    Indicators are computed on the full series of `timeframe` bars, then only
+    the points that can be told apart at `plot_width` pixels are shipped
+    (WebGL traces). Long histories are drawn with coarser candles.
     """
-    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
                         vertical_spacing=0.05, row_heights=[0.7, 0.3])
+    line = go.Scattergl if downsample else go.Scatter
 
     # Candlestick
+    bars, candle_timeframe = _candle_bars(df, timeframe) if downsample else (df, timeframe)
     fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'],
-        low=df['Low'], close=df['Close'],
-        name='Price'
+        x=_x_values(bars.index, downsample),
+        open=bars['Open'], high=bars['High'],
+        low=bars['Low'], close=bars['Close'],
+        name='Price' if bars is df else f'Price ({candle_timeframe})'
     ), row=1, col=1)
 
     # SMAs
-    # We need to re-calculate rolling for plotting since we only have last scalar in metrics
-    # Or efficient way: pass the indicator series.
-    # For now, let's recalculate quickly for plotting to keep signature simple, 
-    # or better, the AnalysisResult could carry series data? 
-    # To keep payload small, we'll calc here.
-    sma50 = df['Close'].rolling(window=50).mean()
-    sma200 = df['Close'].rolling(window=200).mean()
-
-    fig.add_trace(go.Scatter(x=df.index, y=sma50, line=dict(color='orange', width=1), name='SMA 50'), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=sma200, line=dict(color='blue', width=1), name='SMA 200'), row=1, col=1)
-
-    # RSI
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-
-    fig.add_trace(go.Scatter(x=df.index, y=rsi, line=dict(color='purple', width=1), name='RSI'), row=2, col=1)
-    
+    sma50 = calculate_sma(df['Close'], 50)
+    sma200 = calculate_sma(df['Close'], 200)
+    # RSI: min-max keeps the spikes through 30/70 that carry the signal
+    rsi = calculate_rsi(df['Close'], 14)
+    if downsample:
+        sma50 = downsample_series(sma50, plot_width)
+        sma200 = downsample_series(sma200, plot_width)
+        rsi = downsample_series(rsi, plot_width, method="minmax")
+
+    fig.add_trace(line(x=_x_values(sma50.index, downsample), y=sma50, line=dict(color='orange', width=1), name='SMA 50'), row=1, col=1)
+    fig.add_trace(line(x=_x_values(sma200.index, downsample), y=sma200, line=dict(color='blue', width=1), name='SMA 200'), row=1, col=1)
+    fig.add_trace(line(x=_x_values(rsi.index, downsample), y=rsi, line=dict(color='purple', width=1), name='RSI'), row=2, col=1)
+
     # RSI Zones
     fig.add_hrect(y0=70, y1=100, row=2, col=1, fillcolor="red", opacity=0.1, line_width=0)
     fig.add_hrect(y0=0, y1=30, row=2, col=1, fillcolor="green", opacity=0.1, line_width=0)
@@ -55,27 +89,82 @@ def plot_price_and_signals(ticker: str, df: pd.DataFrame, metrics):
         height=600,
         margin=dict(l=20, r=20, t=50, b=20)
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    fig.update_xaxes(type="date")
+    return fig
 
-def render_comparison_chart(data_dict: dict):
+def build_comparison_figure(data_dict: dict, plot_width: int = DEFAULT_PLOT_WIDTH,
+                            downsample: bool = True) -> "go.Figure":
     """
-    Plot normalized returns for comparison.
+    Build the normalized returns comparison figure.
     """
     fig = go.Figure()
-    
-    for ticker, df in data_dict.items():
-        if df.empty: continue
-        # Normalize to start at 0%
-        start_price = df['Close'].iloc[0]
-        normalized = (df['Close'] - start_price) / start_price
-        
-        fig.add_trace(go.Scatter(x=df.index, y=normalized, mode='lines', name=ticker))
-        
+    line = go.Scattergl if downsample else go.Scatter
+
+    # Common date range, normalized to start at 0% in one vectorized step
+    panel = build_price_panel(data_dict)
+    if len(panel.dates):
+        normalized = panel.normalized()
+        for j, ticker in enumerate(panel.tickers):
+            series = pd.Series(normalized[:, j], index=panel.dates)
+            if downsample:
+                series = downsample_series(series, plot_width)
+            fig.add_trace(line(x=_x_values(series.index, downsample), y=series, mode='lines', name=ticker))
+
     fig.update_layout(
         title="Relative Performance Comparison",
         yaxis_title="Return (%)",
         yaxis_tickformat='.1%',
         hovermode="x unified"
     )
+    fig.update_xaxes(type="date")
+    return fig
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_price_figure(ticker: str, df: pd.DataFrame, plot_width: int, timeframe: str = "1d") -> "go.Figure":
+    return build_price_figure(ticker, df, plot_width, timeframe=timeframe)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_comparison_figure(data_dict: dict, plot_width: int) -> "go.Figure":
+    return build_comparison_figure(data_dict, plot_width)
+
+def plot_price_and_signals(ticker: str, df: pd.DataFrame, metrics, plot_width: int = DEFAULT_PLOT_WIDTH,
+                           timeframe: str = "1d"):
+    """
+    Create a Plotly chart with Candlesticks and indicators.
+    """
+    fig = _cached_price_figure(ticker, df, plot_width, timeframe)
     st.plotly_chart(fig, use_container_width=True)
+
+def render_comparison_chart(data_dict: dict, plot_width: int = DEFAULT_PLOT_WIDTH):
+    """
+    Plot normalized returns for comparison.
+    """
+    fig = _cached_comparison_figure(data_dict, plot_width)
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_diagnostics_panel(title: str):
+    """
+    Optional expander with the in-process metrics (only when telemetry is enabled).
+    """
+    if not telemetry.is_enabled():
+        return
+    snapshot = telemetry.REGISTRY.snapshot()
+
+    def label(m):
+        extra = ",".join(f"{k}={v}" for k, v in m["labels"].items())
+        return f"{m['name']}{{{extra}}}" if extra else m["name"]
+
+    with st.expander(title):
+        if snapshot["timers"]:
+            st.dataframe(pd.DataFrame([{
+                "span": label(m),
+                "count": m["count"],
+                "total ms": round(m["sum_s"] * 1000, 2),
+                "avg ms": round(m["avg_s"] * 1000, 3),
+                "max ms": round(m["max_s"] * 1000, 3),
+            } for m in snapshot["timers"]]), hide_index=True, use_container_width=True)
+        if snapshot["counters"]:
+            st.dataframe(pd.DataFrame([{
+                "counter": label(m), "value": m["value"]
+            } for m in snapshot["counters"]]), hide_index=True, use_container_width=True)
+        st.download_button("metrics.prom", telemetry.REGISTRY.to_prometheus(), "metrics.prom", "text/plain")
@@ -1,19 +1,24 @@
 import streamlit as st
 import pandas as pd
-from typing import List
+from typing import Dict, List, Tuple
 
 import sys
 import os
+import time
 
 # Add the project root to the python path to allow absolute imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from src.app.utils import get_valid_periods, get_risk_profiles, get_default_tickers, format_percentage, format_currency
-from src.app.components import render_metric_card, plot_price_and_signals, render_comparison_chart
+from src.app.utils import get_valid_periods, get_timeframes, get_risk_profiles, get_default_tickers, parse_tickers, format_percentage, format_currency
+from src.app.components import render_metric_card, plot_price_and_signals, render_comparison_chart, render_diagnostics_panel
+from src.core import telemetry
+from src.core.profiling import profile_run
 from src.app.translations import get_text
-from src.data.loader import DataLoader
-from src.domain.signals import SignalEngine
-from src.domain.models import AnalysisResult
+from src.app.caching import get_data_loader, get_signal_engine, get_result_cache, get_warmup_scheduler, get_watchlist_store, get_cedear_screener, get_alert_store, get_watchlist_refresher, make_request_key
+from src.domain.screener import run_screen, rank_results
+from src.domain.models import AnalysisResult, Watchlist
+from src.domain.watchlists import refresh_watchlist
+from src.analysis.resample import INTRADAY_TIMEFRAMES, resample_bars
 
 # Page Config
 st.set_page_config(
@@ -40,7 +45,67 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Minimum seconds between partial ranking refreshes while a screen is running
+PARTIAL_RENDER_INTERVAL = 0.3
+
+def build_ranking_frame(results: List[AnalysisResult], t) -> pd.DataFrame:
+    """Prepare the ranking table for display."""
+    summary_data = []
+    for r in results:
+        summary_data.append({
+            t("col_ticker"): r.ticker,
+            t("metric_score"): f"{r.score:.1f}",
+            t("metric_recommendation"): r.recommendation,
+            t("col_price"): format_currency(r.metrics.current_price),
+            t("col_return"): format_percentage(r.metrics.total_return),
+            t("col_vol"): format_percentage(r.metrics.volatility),
+            t("col_rsi"): f"{r.metrics.rsi:.1f}",
+        })
+    return pd.DataFrame(summary_data, columns=[
+        t("col_ticker"), t("metric_score"), t("metric_recommendation"),
+        t("col_price"), t("col_return"), t("col_vol"), t("col_rsi")
+    ])
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_panel_exports(request_key: Tuple, period: str,
+                        _results: List[AnalysisResult], _price_data: Dict[str, pd.DataFrame]) -> Dict[str, bytes]:
+    """
+    Arrow files with the indicator series and raw metrics of the results.
+
+    Cached on the request key, which carries the data versions of its tickers,
+    so reruns of the same screen reuse the bytes; results and frames are not
+    hashed.
+    """
+    # pyarrow only loads once a screen has results to export
+    import pyarrow as pa
+    from src.domain.panels import write_panels
+
+    sinks = {"series": pa.BufferOutputStream(), "metrics": pa.BufferOutputStream()}
+    write_panels(sinks["series"], sinks["metrics"], period, _results, _price_data)
+    return {name: sink.getvalue().to_pybytes() for name, sink in sinks.items()}
+
+def build_cedear_frame(table: pd.DataFrame, t) -> pd.DataFrame:
+    """Prepare the CEDEAR screen table for display."""
+    return pd.DataFrame({
+        t("col_ticker"): table.index,
+        t("col_cedear"): table["local"].to_numpy(),
+        t("col_ratio"): [f"{r:g}:1" for r in table["ratio"]],
+        t("col_price_ars"): [f"$ {p:,.2f}" for p in table["price_ars"]],
+        t("col_ccl"): [f"{c:,.2f}" for c in table["implied_ccl"]],
+        t("col_premium"): [format_percentage(p) for p in table["premium"]],
+        t("col_premium_z"): [f"{z:+.1f}" for z in table["premium_zscore"]],
+        t("col_return_ars"): [format_percentage(r) for r in table["return_ars"]],
+        t("col_return_usd"): [format_percentage(r) for r in table["return_usd"]],
+        t("col_vol_ars"): [format_percentage(v) for v in table["volatility_ars"]],
+        t("col_dd_ars"): [format_percentage(d) for d in table["max_drawdown_ars"]],
+    })
+
 def main():
+    # Background cache warmup (no-op unless FINANCELAB_WARMUP=1)
+    get_warmup_scheduler()
+    # Background watchlist refresh and alerts (no-op unless FINANCELAB_REFRESHER=1)
+    refresher = get_watchlist_refresher()
+    
     # --- Sidebar ---
     with st.sidebar:
         st.header(get_text("en", "config_header")) # Default header initially, will update
@@ -65,15 +130,51 @@ def main():
         # Period
         period = st.selectbox(t("analysis_period"), get_valid_periods(), index=3) # Default 1y
         
+        # Saved watchlists
+        watchlist_store = get_watchlist_store()
+        selected_name = st.selectbox(
+            t("saved_watchlists"),
+            [""] + watchlist_store.list_names(),
+            format_func=lambda name: name or t("new_watchlist")
+        )
+        saved = watchlist_store.get(selected_name) if selected_name else None
+        
         # Input Watchlist
-        default_tickers_str = ", ".join(get_default_tickers())
+        default_tickers_str = ", ".join(saved.tickers if saved else get_default_tickers())
         ticker_input = st.text_area(
             t("watchlist"), 
             value=default_tickers_str,
-            height=150
+            height=150,
+            key=f"watchlist_input_{selected_name}"  # reset the text when switching lists
         )
         
-        analyze_btn = st.button(t("analyze_btn"), type="primary")
+        with st.expander(t("manage_watchlist")):
+            watchlist_name = st.text_input(t("watchlist_name"), value=selected_name).strip()
+            save_col, delete_col = st.columns(2)
+            if save_col.button(t("save_btn")) and watchlist_name:
+                watchlist_store.save(Watchlist(name=watchlist_name, tickers=parse_tickers(ticker_input)))
+                st.success(t("watchlist_saved").format(watchlist_name))
+            if delete_col.button(t("delete_btn")) and saved is not None:
+                watchlist_store.delete(saved.name)
+                st.success(t("watchlist_deleted").format(saved.name))
+        
+        # Opening a saved watchlist analyzes it right away (served from its snapshot)
+        opened = bool(selected_name) and st.session_state.get("opened_watchlist") != selected_name
+        st.session_state["opened_watchlist"] = selected_name
+        
+        analyze_btn = st.button(t("analyze_btn"), type="primary") or opened
+        
+        # Filled after the analyze step so the counts include this run
+        cache_stats_slot = st.empty()
+        diagnostics_slot = st.empty()
+        
+        if refresher is not None:
+            alerts = get_alert_store().recent_alerts(limit=20)
+            with st.expander(t("alerts_header").format(len(alerts))):
+                for alert in alerts:
+                    st.caption(f"{alert.created_at:%d/%m %H:%M} · {alert.message}")
+                if not alerts:
+                    st.caption(t("no_alerts"))
         
         with st.expander(t("about")):
             st.info(t("about_text"))
@@ -86,69 +187,120 @@ def main():
     st.title(t("title"))
     st.markdown(t("description"))
 
-    if analyze_btn or "results" not in st.session_state:
-        if analyze_btn:
-            with st.spinner(t("spinner")):
-                loader = DataLoader() # Initialize data loader
-                engine = SignalEngine() # Initialize signal engine
-                
-                tickers = [tik.strip().upper() for tik in ticker_input.split(",") if tik.strip()]
-                
-                results: List[AnalysisResult] = []
-                comparison_data = {}
+    if analyze_btn or st.session_state.get("analyzed"):
+        notice_area = st.container()
+        
+        # --- Tabs ---
+        tab1, tab2, tab3, tab4 = st.tabs([t("tab_ranking"), t("tab_detail"), t("tab_comparison"), t("tab_cedears")])
+        progress_slot = tab1.empty()
+        ranking_slot = tab1.empty()
+
+    if analyze_btn:
+        # FINANCELAB_PROFILE=1 dumps cProfile/tracemalloc output for the cycle
+        with profile_run("analyze") as profile, st.spinner(t("spinner")):
+            tickers = parse_tickers(ticker_input)
+            # The saved list as stored, unless the text was edited since opening it
+            watchlist = saved if saved is not None and tickers == saved.tickers else None
+            
+            # Identical requests from any session are served from the shared cache;
+            # saved watchlists have their own snapshots instead
+            result_cache = get_result_cache()
+            loader = get_data_loader()
+            request_key = make_request_key(tickers, period, risk_profile, loader.data_versions(tickers, period))
+            screen = None if watchlist else result_cache.get(request_key)
+            
+            if screen is None:
+                progress_bar = progress_slot.progress(0)
+                partial: Dict[str, AnalysisResult] = {}
+                last_render = [0.0]
                 
-                progress_bar = st.progress(0)
+                def render_partial():
+                    ranking_slot.dataframe(
+                        build_ranking_frame(rank_results(list(partial.values()), tickers), t).set_index(t("col_ticker")),
+                        use_container_width=True,
+                        height=500
+                    )
                 
-                for i, ticker in enumerate(tickers):
-                    df = loader.get_ticker_history(ticker, period)
-                    if df is not None and not df.empty:
-                        # Analyze
-                        res = engine.analyze_ticker(ticker, df, risk_profile)
-                        results.append(res)
-                        comparison_data[ticker] = df
-                    else:
-                        st.warning(t("warning_fetch").format(ticker))
-                    
-                    progress_bar.progress((i + 1) / len(tickers))
+                def show_partial(event):
+                    # Stream rows into the ranking tab as tickers complete (throttled)
+                    if not event.ok:
+                        return
+                    partial[event.ticker] = event.result
+                    now = time.monotonic()
+                    if now - last_render[0] >= PARTIAL_RENDER_INTERVAL:
+                        last_render[0] = now
+                        render_partial()
                 
-                # Sort by score desc
-                results.sort(key=lambda x: x.score, reverse=True)
+                def show_progress(done, total):
+                    progress_bar.progress(done / total)
                 
-                st.session_state["results"] = results
-                st.session_state["comparison_data"] = comparison_data
-                st.session_state["analyzed"] = True
+                if watchlist is not None:
+                    # Show the last snapshot right away; changed tickers replace their rows
+                    snapshot = watchlist_store.latest_snapshot(watchlist.name, period, risk_profile)
+                    if snapshot is not None:
+                        partial.update((r.ticker, r) for r in snapshot.results)
+                        last_render[0] = time.monotonic()
+                        render_partial()
+                    refresh = refresh_watchlist(
+                        watchlist_store, loader, get_signal_engine(), watchlist, period, risk_profile,
+                        progress_callback=show_progress,
+                        event_callback=show_partial,
+                        thread_initializer=profile.thread_initializer if profile else None
+                    )
+                    screen = refresh.screen
+                    notice_area.caption(t("watchlist_refreshed").format(
+                        reused=len(refresh.reused), recomputed=len(refresh.recomputed)))
+                else:
+                    screen = run_screen(
+                        loader, get_signal_engine(), tickers, period, risk_profile,
+                        progress_callback=show_progress,
+                        event_callback=show_partial,
+                        thread_initializer=profile.thread_initializer if profile else None
+                    )
+                progress_slot.empty()
+                # Store under the versions the screen was actually computed from
+                request_key = make_request_key(tickers, period, risk_profile, loader.data_versions(tickers, period))
+                if screen.results:
+                    # Don't pin a fully failed fetch for the whole TTL
+                    result_cache.put(request_key, screen)
+            
+            for ticker in screen.failed:
+                notice_area.warning(t("warning_fetch").format(ticker))
+            
+            st.session_state["results"] = screen.results
+            st.session_state["comparison_data"] = screen.price_data
+            st.session_state["period"] = period
+            st.session_state["request_key"] = request_key
+            st.session_state["analyzed"] = True
+        
+        if profile is not None:
+            notice_area.caption(t("profile_saved").format(profile.files["summary"]))
+        
+        metrics_file = os.getenv("FINANCELAB_METRICS_FILE")
+        if metrics_file and telemetry.is_enabled():
+            telemetry.REGISTRY.write_prometheus(metrics_file)
+    
+    cache_stats = get_result_cache().stats()
+    cache_stats_slot.caption(t("cache_stats").format(hits=cache_stats["hits"], misses=cache_stats["misses"]))
+    with diagnostics_slot.container():
+        render_diagnostics_panel(t("diagnostics"))
                 
     if st.session_state.get("analyzed"):
         results = st.session_state["results"]
         comparison_data = st.session_state["comparison_data"]
         
-        # --- Tabs ---
-        tab1, tab2, tab3 = st.tabs([t("tab_ranking"), t("tab_detail"), t("tab_comparison")])
-        
-        with tab1:
+        with ranking_slot.container():
             st.subheader(t("ranking_subheader").format(len(results)))
             
-            # Prepare DataFrame for display
-            summary_data = []
-            for r in results:
-                summary_data.append({
-                    t("col_ticker"): r.ticker,
-                    t("metric_score"): f"{r.score:.1f}",
-                    t("metric_recommendation"): r.recommendation,
-                    t("col_price"): format_currency(r.metrics.current_price),
-                    t("col_return"): format_percentage(r.metrics.total_return),
-                    t("col_vol"): format_percentage(r.metrics.volatility),
-                    t("col_rsi"): f"{r.metrics.rsi:.1f}",
-                })
-            
+            summary_df = build_ranking_frame(results, t)
             st.dataframe(
-                pd.DataFrame(summary_data).set_index(t("col_ticker")),
+                summary_df.set_index(t("col_ticker")),
                 use_container_width=True,
                 height=500
             )
             
             # CSV Download
-            csv = pd.DataFrame(summary_data).to_csv(index=False).encode('utf-8')
+            csv = summary_df.to_csv(index=False).encode('utf-8')
             st.download_button(
                 t("download_csv"),
                 csv,
@@ -156,15 +308,39 @@ def main():
                 "text/csv",
                 key='download-csv'
             )
+            panels = build_panel_exports(
+                st.session_state.get("request_key", ()), st.session_state.get("period", period),
+                results, comparison_data
+            )
+            series_col, metrics_col = st.columns(2)
+            series_col.download_button(t("download_series"), panels["series"], "financelab_series.arrow",
+                                       "application/vnd.apache.arrow.file", key="download-series")
+            metrics_col.download_button(t("download_metrics"), panels["metrics"], "financelab_metrics.arrow",
+                                        "application/vnd.apache.arrow.file", key="download-metrics")
  
         with tab2:
             st.subheader(t("deep_dive_subheader"))
-            selected_ticker = st.selectbox(t("select_asset"), [r.ticker for r in results])
+            asset_col, timeframe_col = st.columns([3, 1])
+            selected_ticker = asset_col.selectbox(t("select_asset"), [r.ticker for r in results])
+            timeframe = timeframe_col.selectbox(t("timeframe"), get_timeframes(), index=get_timeframes().index("1d"))
             
             # Find result
             res = next((r for r in results if r.ticker == selected_ticker), None)
             df = comparison_data.get(selected_ticker)
             
+            if res and df is not None and timeframe != "1d":
+                # Coarser bars are rolled up from the daily data already loaded;
+                # intraday bars come from the loader's intraday store
+                if timeframe in INTRADAY_TIMEFRAMES:
+                    df = get_data_loader().get_bars(selected_ticker, timeframe, period)
+                else:
+                    df = resample_bars(df, timeframe)
+                if df is None or df.empty:
+                    st.warning(t("timeframe_unavailable").format(timeframe))
+                    df = None
+                else:
+                    res = get_signal_engine().analyze_ticker(selected_ticker, df, res.risk_profile, timeframe=timeframe)
+            
             if res and df is not None:
                 # Top Metrics
                 c1, c2, c3, c4 = st.columns(4)
@@ -174,7 +350,7 @@ def main():
                 c4.metric(t("metric_max_dd"), format_percentage(res.metrics.max_drawdown))
                 
                 # Chart
-                plot_price_and_signals(selected_ticker, df, res.metrics)
+                plot_price_and_signals(selected_ticker, df, res.metrics, timeframe=timeframe)
                 
                 # Signals
                 st.write(f"### {t('signals_header')}")
@@ -198,6 +374,20 @@ def main():
             if compare_list:
                 subset = {k: v for k, v in comparison_data.items() if k in compare_list}
                 render_comparison_chart(subset)
+ 
+        with tab4:
+            st.subheader(t("cedear_subheader"))
+            # BYMA quotes are only downloaded on request
+            if st.toggle(t("cedear_load")):
+                cedears = get_cedear_screener().screen([r.ticker for r in results], period)
+                if cedears is None:
+                    st.info(t("cedear_none"))
+                else:
+                    st.metric(t("market_ccl"), f"$ {cedears.market_ccl[-1]:,.2f}")
+                    st.dataframe(build_cedear_frame(cedears.table, t).set_index(t("col_ticker")),
+                                 use_container_width=True)
+                    if cedears.missing:
+                        st.caption(t("cedear_missing").format(", ".join(cedears.missing)))
 
         # Floating Chatbot using Popover
         with st.sidebar:
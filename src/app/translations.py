@@ -20,8 +20,12 @@ TRANSLATIONS = {
         "tab_comparison": "📈 Comparison",
         "ranking_subheader": "Asset Ranking ({} assets)",
         "download_csv": "Download Report (CSV)",
+        "download_series": "Download Indicator Series (Arrow)",
+        "download_metrics": "Download Raw Metrics (Arrow)",
         "deep_dive_subheader": "Deep Dive Analysis",
         "select_asset": "Select Asset",
+        "timeframe": "Timeframe",
+        "timeframe_unavailable": "No {} bars available for this asset",
         "score_help": "Risk-adjusted score",
         "signals_header": "AI Signals & Reasoning",
         "no_signals": "No strong signals detected.",
@@ -35,6 +39,36 @@ TRANSLATIONS = {
         "col_return": "Return",
         "col_vol": "Vol (Ann.)",
         "col_rsi": "RSI",
+        "alerts_header": "🔔 Signal alerts ({})",
+        "no_alerts": "No signal changes yet.",
+        "tab_cedears": "🇦🇷 CEDEARs",
+        "cedear_subheader": "CEDEARs: implied CCL and premium/discount",
+        "cedear_load": "Load CEDEAR quotes (BYMA)",
+        "cedear_none": "None of the analyzed tickers has a CEDEAR with quotes available.",
+        "cedear_missing": "No quotes for: {}",
+        "market_ccl": "Market CCL (median)",
+        "col_cedear": "CEDEAR",
+        "col_ratio": "Ratio",
+        "col_price_ars": "Price (ARS)",
+        "col_ccl": "Implied CCL",
+        "col_premium": "Premium",
+        "col_premium_z": "Premium z",
+        "col_return_ars": "Return (ARS)",
+        "col_return_usd": "Return (USD)",
+        "col_vol_ars": "Vol ARS (Ann.)",
+        "col_dd_ars": "Max DD (ARS)",
+        "cache_stats": "Result cache: {hits} hits / {misses} misses",
+        "diagnostics": "🩺 Diagnostics",
+        "profile_saved": "Profile written to {}",
+        "saved_watchlists": "Saved watchlists",
+        "new_watchlist": "(unsaved)",
+        "manage_watchlist": "💾 Save / delete watchlist",
+        "watchlist_name": "Name",
+        "save_btn": "Save",
+        "delete_btn": "Delete",
+        "watchlist_saved": "Saved '{}'",
+        "watchlist_deleted": "Deleted '{}'",
+        "watchlist_refreshed": "Snapshot reused for {reused} tickers, {recomputed} recomputed",
         "tab_assistant": "🤖 Assistant",
         "bot_welcome": "Hello! I am your financial assistant. I can explain the analysis of any asset in your list.",
         "bot_placeholder": "Ask me about a ticker (e.g. Why AAPL?)",
@@ -92,8 +126,12 @@ Technical indicators suggest a downtrend or overvaluation (RSI: {rsi}). It might
         "tab_comparison": "📈 Comparación",
         "ranking_subheader": "Ranking de Activos ({} activos)",
         "download_csv": "Descargar Reporte (CSV)",
+        "download_series": "Descargar Series de Indicadores (Arrow)",
+        "download_metrics": "Descargar Métricas (Arrow)",
         "deep_dive_subheader": "Análisis Detallado",
         "select_asset": "Seleccionar Activo",
+        "timeframe": "Temporalidad",
+        "timeframe_unavailable": "No hay velas de {} para este activo",
         "score_help": "Puntaje ajustado por riesgo",
         "signals_header": "Señales IA y Razonamiento",
         "no_signals": "No se detectaron señales fuertes.",
@@ -107,6 +145,36 @@ Technical indicators suggest a downtrend or overvaluation (RSI: {rsi}). It might
         "col_return": "Retorno",
         "col_vol": "Vol (Anual)",
         "col_rsi": "RSI",
+        "alerts_header": "🔔 Alertas de señales ({})",
+        "no_alerts": "Todavía no hubo cambios de señales.",
+        "tab_cedears": "🇦🇷 CEDEARs",
+        "cedear_subheader": "CEDEARs: CCL implícito y prima/descuento",
+        "cedear_load": "Cargar cotizaciones de CEDEARs (BYMA)",
+        "cedear_none": "Ninguno de los tickers analizados tiene un CEDEAR con cotizaciones disponibles.",
+        "cedear_missing": "Sin cotizaciones para: {}",
+        "market_ccl": "CCL de mercado (mediana)",
+        "col_cedear": "CEDEAR",
+        "col_ratio": "Ratio",
+        "col_price_ars": "Precio (ARS)",
+        "col_ccl": "CCL implícito",
+        "col_premium": "Prima",
+        "col_premium_z": "Prima z",
+        "col_return_ars": "Retorno (ARS)",
+        "col_return_usd": "Retorno (USD)",
+        "col_vol_ars": "Vol ARS (Anual)",
+        "col_dd_ars": "Max DD (ARS)",
+        "cache_stats": "Caché de resultados: {hits} aciertos / {misses} fallos",
+        "diagnostics": "🩺 Diagnóstico",
+        "profile_saved": "Perfil guardado en {}",
+        "saved_watchlists": "Listas guardadas",
+        "new_watchlist": "(sin guardar)",
+        "manage_watchlist": "💾 Guardar / borrar lista",
+        "watchlist_name": "Nombre",
+        "save_btn": "Guardar",
+        "delete_btn": "Borrar",
+        "watchlist_saved": "Lista '{}' guardada",
+        "watchlist_deleted": "Lista '{}' borrada",
+        "watchlist_refreshed": "Snapshot reutilizado para {reused} tickers, {recomputed} recalculados",
         "tab_assistant": "🤖 Asistente",
         "bot_welcome": "¡Hola! Soy tu Asistente Financiero. Puedo explicar los resultados del análisis o responder preguntas sobre los activos. Intenta preguntar: '¿Por qué comprar AAPL?'",
         "bot_placeholder": "Pregunta sobre un activo (ej: 'Estado de TSLA')",
@@ -4,6 +4,9 @@ from datetime import datetime, timedelta
 def get_valid_periods():
     return ["1mo", "3mo", "6mo", "1y", "2y", "5y", "ytd"]
 
+def get_timeframes():
+    return ["5m", "15m", "30m", "1h", "1d", "1wk", "1mo"]
+
 def get_risk_profiles():
     return ["Conservative", "Moderate", "Aggressive"]
 
@@ -13,6 +16,10 @@ def format_percentage(value: float) -> str:
 def format_currency(value: float) -> str:
     return f"${value:.2f}"
 
+def parse_tickers(text: str):
+    """Comma separated symbols -> upper-case list, blanks dropped."""
+    return [t.strip().upper() for t in text.split(",") if t.strip()]
+
 def get_default_tickers():
     return [
         "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", 
@@ -0,0 +1,307 @@
+"""
+Headless batch screener.
+
+Runs the same fetch + SignalEngine screening as the dashboard, without
+Streamlit, and writes ranked results and indicator snapshots to disk.
+
+    python -m src.cli.screener --universe tickers.txt --periods 1y 5y \\
+        --risk-profiles Moderate Aggressive --output-dir reports
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Allow running as a script as well as a module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.analysis.indicators import calculate_bollinger_bands
+from src.core import telemetry
+from src.core.profiling import profile_run
+from src.data.export import ChunkedTableWriter, PANEL_FORMATS, RecordBatchWriter, SUPPORTED_FORMATS, output_path
+from src.domain.panels import SERIES_SCHEMA, series_batch
+from src.domain.screener import DEFAULT_FETCH_WORKERS, fetch_history
+from src.domain.signals import SignalEngine
+
+DEFAULT_CHUNK_SIZE = 250
+
+RANKING_COLUMNS = [
+    "period", "risk_profile", "rank", "ticker", "score", "recommendation", "reasoning",
+]
+SNAPSHOT_COLUMNS = [
+    "ticker", "period", "as_of", "bars", "current_price", "daily_return", "total_return",
+    "volatility", "max_drawdown", "rsi", "sma_20", "sma_50", "sma_200", "bb_upper", "bb_lower",
+]
+
+
+@dataclass
+class StageTimer:
+    """Accumulates wall-clock seconds per pipeline stage."""
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, stage: str, elapsed: float):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + elapsed
+
+    def report(self) -> str:
+        total = sum(self.seconds.values())
+        lines = [f"  {stage:<10}{secs:>10.2f}s" for stage, secs in self.seconds.items()]
+        lines.append(f"  {'total':<10}{total:>10.2f}s")
+        return "\n".join(lines)
+
+
+def read_universe(path: str) -> List[str]:
+    """Read tickers from a file (one per line or comma separated, '#' comments)."""
+    tickers = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            tickers.extend(t.strip().upper() for t in line.split(",") if t.strip())
+    return list(dict.fromkeys(tickers))
+
+
+def chunked(items: List[str], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _snapshot_row(ticker: str, period: str, df: pd.DataFrame, result) -> dict:
+    upper, _, lower = calculate_bollinger_bands(df["Close"])
+    m = result.metrics
+    return {
+        "ticker": ticker,
+        "period": period,
+        "as_of": pd.Timestamp(df.index[-1]).isoformat() if len(df) else None,
+        "bars": len(df),
+        "current_price": float(m.current_price),
+        "daily_return": float(m.daily_return),
+        "total_return": float(m.total_return),
+        "volatility": float(m.volatility),
+        "max_drawdown": float(m.max_drawdown),
+        "rsi": float(m.rsi),
+        "sma_20": float(m.sma_20),
+        "sma_50": float(m.sma_50),
+        "sma_200": float(m.sma_200),
+        "bb_upper": float(upper.iloc[-1]) if len(df) else float("nan"),
+        "bb_lower": float(lower.iloc[-1]) if len(df) else float("nan"),
+    }
+
+
+def analyze_batch(
+    frames: List[Tuple[str, pd.DataFrame]], period: str, risk_profiles: List[str]
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Analyze a batch of tickers for every risk profile.
+
+    Returns:
+        (score rows, snapshot rows)
+    """
+    engine = SignalEngine()
+    scores, snapshots = [], []
+    for ticker, df in frames:
+        try:
+            base = engine.analyze_ticker(ticker, df, risk_profiles[0])
+        except Exception as e:
+            print(f"Error analyzing {ticker}: {e}", file=sys.stderr)
+            continue
+        snapshots.append(_snapshot_row(ticker, period, df, base))
+        for profile in risk_profiles:
+            res = engine.rescore(base, profile)
+            scores.append({
+                "period": period,
+                "risk_profile": profile,
+                "ticker": ticker,
+                "score": float(res.score),
+                "recommendation": res.recommendation,
+                "reasoning": "; ".join(res.reasoning),
+            })
+    return scores, snapshots
+
+
+def _analyze_batch_in_worker(frames, period, risk_profiles, metrics: bool):
+    """
+    Process-pool entry point. Metrics recorded in the worker are returned so
+    the parent registry can merge them.
+    """
+    telemetry.enable(metrics)
+    telemetry.REGISTRY.reset()
+    scores, snapshots = analyze_batch(frames, period, risk_profiles)
+    return scores, snapshots, telemetry.REGISTRY.export_state() if metrics else None
+
+
+def fetch_chunk(loader, tickers: List[str], period: str, workers: int,
+                thread_initializer: Optional[Callable[[], None]] = None) -> Dict[str, pd.DataFrame]:
+    with ThreadPoolExecutor(max_workers=workers, initializer=thread_initializer) as pool:
+        frames = pool.map(lambda t: fetch_history(loader, t, period), tickers)
+        return {t: df for t, df in zip(tickers, frames) if df is not None}
+
+
+def run(
+    loader,
+    tickers: List[str],
+    periods: List[str],
+    risk_profiles: List[str],
+    output_dir: str,
+    fmt: str = "parquet",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    workers: int = 1,
+    timer: Optional[StageTimer] = None,
+    panel_fmt: Optional[str] = None,
+    thread_initializer: Optional[Callable[[], None]] = None,
+) -> Dict[str, int]:
+    """
+    Screen `tickers` chunk by chunk and write rankings and snapshots.
+
+    Price frames are dropped after each chunk, so memory is bounded by
+    `chunk_size` rather than the size of the universe. Only the small
+    per-ticker score rows are kept until the end to compute global ranks.
+    With `panel_fmt` ("arrow" or "parquet") the full indicator series of
+    every ticker are also written to `series.<panel_fmt>`, chunk by chunk.
+    `thread_initializer` runs once in every fetch thread.
+
+    Returns:
+        Summary counts (tickers, analyzed, failed, ranking rows)
+    """
+    timer = timer or StageTimer()
+    scores: List[dict] = []
+    failed = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    snapshot_writer = ChunkedTableWriter(output_path(output_dir, "snapshots", fmt), fmt)
+    series_writer = None
+    if panel_fmt:
+        series_writer = RecordBatchWriter(output_path(output_dir, "series", panel_fmt), SERIES_SCHEMA, panel_fmt)
+    try:
+        for chunk in chunked(tickers, chunk_size):
+            for period in periods:
+                start = time.perf_counter()
+                frames = fetch_chunk(loader, chunk, period, fetch_workers, thread_initializer)
+                timer.add("fetch", time.perf_counter() - start)
+                failed += len(chunk) - len(frames)
+
+                start = time.perf_counter()
+                items = list(frames.items())
+                if pool is not None:
+                    batch_size = max(1, -(-len(items) // workers))
+                    jobs = [
+                        pool.submit(_analyze_batch_in_worker, items[i:i + batch_size], period,
+                                    risk_profiles, telemetry.is_enabled())
+                        for i in range(0, len(items), batch_size)
+                    ]
+                    outputs = []
+                    for job in jobs:
+                        chunk_scores, chunk_snapshots, state = job.result()
+                        if state:
+                            telemetry.REGISTRY.merge_state(state)
+                        outputs.append((chunk_scores, chunk_snapshots))
+                else:
+                    outputs = [analyze_batch(items, period, risk_profiles)]
+                timer.add("analyze", time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for chunk_scores, chunk_snapshots in outputs:
+                    scores.extend(chunk_scores)
+                    snapshot_writer.write(pd.DataFrame(chunk_snapshots, columns=SNAPSHOT_COLUMNS))
+                if series_writer is not None:
+                    for ticker, df in items:
+                        series_writer.write(series_batch(ticker, period, df))
+                timer.add("write", time.perf_counter() - start)
+    finally:
+        snapshot_writer.close()
+        if series_writer is not None:
+            series_writer.close()
+        if pool is not None:
+            pool.shutdown()
+
+    start = time.perf_counter()
+    rankings = pd.DataFrame(scores, columns=[c for c in RANKING_COLUMNS if c != "rank"])
+    rankings = rankings.sort_values(["period", "risk_profile", "score"], ascending=[True, True, False])
+    rankings.insert(2, "rank", rankings.groupby(["period", "risk_profile"]).cumcount() + 1)
+    with ChunkedTableWriter(output_path(output_dir, "rankings", fmt), fmt) as writer:
+        for chunk_start in range(0, len(rankings), chunk_size):
+            writer.write(rankings.iloc[chunk_start:chunk_start + chunk_size])
+    timer.add("rank", time.perf_counter() - start)
+
+    return {
+        "tickers": len(tickers),
+        "analyzed": len(tickers) * len(periods) - failed,
+        "failed": failed,
+        "ranking_rows": len(rankings),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="FinanceLab headless batch screener")
+    parser.add_argument("--universe", required=True, help="File with tickers (one per line or comma separated)")
+    parser.add_argument("--periods", nargs="+", default=["1y"], help="yfinance periods to screen")
+    parser.add_argument("--risk-profiles", nargs="+", default=list(SignalEngine.RISK_PROFILES),
+                        choices=list(SignalEngine.RISK_PROFILES))
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--format", dest="fmt", default="parquet", choices=SUPPORTED_FORMATS)
+    parser.add_argument("--panels", choices=PANEL_FORMATS,
+                        help="Also write the full indicator series of every ticker (arrow is memory-mappable)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Tickers held in memory at once")
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used for analysis")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use synthetic data instead of Yahoo Finance")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run (cProfile, tracemalloc, peak RSS); implies --workers 1")
+    parser.add_argument("--metrics-file",
+                        help="Record hot-path metrics and write them here in Prometheus text format")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    tickers = read_universe(args.universe)
+    if not tickers:
+        print(f"No tickers found in {args.universe}", file=sys.stderr)
+        return 1
+
+    if args.offline:
+        from src.data.synthetic import OfflineDataLoader
+        loader = OfflineDataLoader()
+    else:
+        from src.data.loader import DataLoader
+        loader = DataLoader()
+
+    if args.metrics_file:
+        telemetry.enable()
+    if args.profile and args.workers > 1:
+        # Worker processes are invisible to the profiler
+        print("--profile: running analysis in-process (--workers 1)")
+        args.workers = 1
+
+    timer = StageTimer()
+    start = time.perf_counter()
+    with profile_run("screen", enabled=args.profile or None) as profile:
+        summary = run(
+            loader, tickers, args.periods, args.risk_profiles, args.output_dir, args.fmt,
+            chunk_size=args.chunk_size, fetch_workers=args.fetch_workers,
+            workers=args.workers, timer=timer, panel_fmt=args.panels,
+            thread_initializer=profile.thread_initializer if profile else None,
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"Screened {summary['tickers']} tickers x {len(args.periods)} period(s) in {elapsed:.2f}s "
+          f"({summary['failed']} failed), wrote {summary['ranking_rows']} ranking rows to {args.output_dir}")
+    print("Wall-clock time per stage:")
+    print(timer.report())
+    if args.metrics_file:
+        telemetry.REGISTRY.write_prometheus(args.metrics_file)
+        print(f"Metrics written to {args.metrics_file}")
+    if profile is not None:
+        print(f"Profile written to {profile.files['summary']}")
+    return 0 if summary["analyzed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Keeps heavy dependencies (plotly, yfinance, scipy, ...) off the import
+    path of code that never reaches them, while call sites keep the usual
+    `module.attr` spelling.
+    """
+
+    def __init__(self, name: str):
+        self._lazy_name = name
+        self._lazy_module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._lazy_module is None:
+            # import_module is thread-safe (per-module import locks)
+            self._lazy_module = importlib.import_module(self._lazy_name)
+        return self._lazy_module
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not set on the proxy itself
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<LazyModule '{self._lazy_name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy that imports `name` the first time it is used."""
+    return LazyModule(name)
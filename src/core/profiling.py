@@ -0,0 +1,209 @@
+"""
+On-demand profiling of a complete analyze cycle.
+
+Enable with FINANCELAB_PROFILE=1 (dashboard) or --profile (CLI). Each run
+dumps, under FINANCELAB_PROFILE_DIR (default ./profiles):
+
+    <name>_<timestamp>.prof          cProfile stats (pstats / snakeviz)
+    <name>_<timestamp>_alloc.txt     tracemalloc top allocations
+    <name>_<timestamp>_summary.txt   short text summary
+
+Worker threads are profiled too: on Python 3.12+ a single profiler already
+sees every thread; on older versions only threads started with the report's
+thread_initializer (passed down to the screen's pools) get their own
+profiler, merged on exit, so threads of other sessions are never hooked.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# cProfile is built on sys.monitoring from 3.12: one profiler covers all
+# threads, and a second one can't be enabled while it runs
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+# Where the time of an analyze cycle usually goes. Matched against
+# "<file>:<function>"; only the outermost matching call is counted.
+CATEGORY_PATTERNS = {
+    "parquet decode": r"pandas[\\/]io[\\/]parquet\.py:read_parquet$",
+    "parquet encode": r"pandas[\\/]io[\\/]parquet\.py:to_parquet$",
+    "rolling windows": r"pandas[\\/]core[\\/]window[\\/]",
+    "dataclass construction": r"^<string>:__init__$",
+    "sqlite": r"sqlite3",
+    "network (yfinance)": r"yfinance[\\/]",
+    "chart building (plotly)": r"plotly[\\/]",
+}
+
+
+def is_enabled() -> bool:
+    return os.getenv("FINANCELAB_PROFILE", "0").lower() in ("1", "true", "yes")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class ProfileReport:
+    name: str
+    wall_seconds: float = 0.0
+    traced_peak_mb: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    categories: Dict[str, float] = field(default_factory=dict)
+    files: Dict[str, str] = field(default_factory=dict)
+    summary: str = ""
+    # ThreadPoolExecutor initializer for the pools of the profiled call
+    thread_initializer: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+
+def _label(func) -> str:
+    filename, _line, name = func
+    return f"{filename}:{name}"
+
+
+def categorize(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Cumulative seconds per category, counting each category's outermost
+    calls only so nested matches are not double counted.
+    """
+    totals = {}
+    for category, pattern in CATEGORY_PATTERNS.items():
+        regex = re.compile(pattern)
+        total = 0.0
+        for func, (_cc, _nc, _tt, _ct, callers) in stats.stats.items():
+            if not regex.search(_label(func)):
+                continue
+            for caller, caller_stats in callers.items():
+                if not regex.search(_label(caller)):
+                    total += caller_stats[3]
+        totals[category] = total
+    return totals
+
+
+def _format_summary(report: ProfileReport, stats: pstats.Stats, top: int) -> str:
+    out = io.StringIO()
+    out.write(f"Profile '{report.name}'\n")
+    out.write(f"  wall time          {report.wall_seconds:.3f}s (slowed down by tracemalloc)\n")
+    out.write(f"  traced peak        {report.traced_peak_mb:.1f} MB (Python allocations during the run)\n")
+    if report.peak_rss_mb is not None:
+        out.write(f"  peak RSS           {report.peak_rss_mb:.1f} MB (process lifetime)\n")
+
+    # Threads overlap, so shares are of the profiled time summed over all
+    # threads rather than of the wall time
+    profiled = stats.total_tt
+    out.write(f"\nWhere the time went (cumulative, all threads, {profiled:.3f}s profiled):\n")
+    for category, seconds in sorted(report.categories.items(), key=lambda kv: -kv[1]):
+        share = seconds / profiled if profiled else 0.0
+        out.write(f"  {category:<26}{seconds:>9.3f}s  {share:>6.1%}\n")
+
+    out.write(f"\nTop {top} functions by cumulative time:\n")
+    stats.stream = out
+    stats.sort_stats("cumulative").print_stats(top)
+    return out.getvalue()
+
+
+@contextmanager
+def profile_run(name: str = "analyze", output_dir: Optional[str] = None,
+                enabled: Optional[bool] = None, top: int = 25):
+    """
+    Profile the enclosed block. Yields a ProfileReport (filled on exit), or
+    None when profiling is disabled so the block runs untouched.
+
+    Args:
+        name: File prefix for the dumps
+        output_dir: Target directory (default FINANCELAB_PROFILE_DIR or ./profiles)
+        enabled: Force on/off (default: FINANCELAB_PROFILE)
+        top: Functions / allocations listed in the text outputs
+    """
+    if enabled is None:
+        enabled = is_enabled()
+    if not enabled:
+        yield None
+        return
+
+    output_dir = output_dir or os.getenv("FINANCELAB_PROFILE_DIR", "profiles")
+    report = ProfileReport(name=name)
+
+    # Worker threads of the profiled call get their own profiler. They are
+    # opted in through the pools' initializer rather than threading.setprofile,
+    # which would hook every thread the process starts meanwhile.
+    thread_profilers: List[cProfile.Profile] = []
+    lock = threading.Lock()
+    closed = threading.Event()
+
+    def start_thread_profiler():
+        if PROCESS_WIDE_PROFILER or closed.is_set():
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiling tool is active
+            return
+        with lock:
+            thread_profilers.append(profiler)
+
+    report.thread_initializer = start_thread_profiler
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    main_profiler = cProfile.Profile()
+    start = time.perf_counter()
+    main_profiler.enable()
+    try:
+        yield report
+    finally:
+        main_profiler.disable()
+        report.wall_seconds = time.perf_counter() - start
+        closed.set()
+
+        snapshot = tracemalloc.take_snapshot()
+        report.traced_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        if started_tracing:
+            tracemalloc.stop()
+        report.peak_rss_mb = peak_rss_mb()
+
+        stats = pstats.Stats(main_profiler)
+        # The pools are shut down by now; their threads stop profiling as
+        # they exit (a profiler can only be disabled from its own thread)
+        with lock:
+            for profiler in thread_profilers:
+                stats.add(profiler)
+            thread_profilers.clear()
+        report.categories = categorize(stats)
+
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, f"{name}_{datetime.now():%Y%m%d-%H%M%S-%f}")
+        report.files = {
+            "profile": f"{base}.prof",
+            "allocations": f"{base}_alloc.txt",
+            "summary": f"{base}_summary.txt",
+        }
+        stats.dump_stats(report.files["profile"])
+
+        with open(report.files["allocations"], "w", encoding="utf-8") as f:
+            f.write(f"Top {top} allocation sites (still allocated at the end of the run):\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+
+        report.summary = _format_summary(report, stats, top)
+        with open(report.files["summary"], "w", encoding="utf-8") as f:
+            f.write(report.summary)
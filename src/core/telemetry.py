@@ -0,0 +1,190 @@
+"""
+In-process metrics registry: counters and timing spans for the hot paths.
+
+Disabled by default. Set FINANCELAB_METRICS=1 (or call enable()) to record.
+When disabled every call is a flag check returning a shared no-op, so the
+instrumentation can stay in hot loops.
+
+    from ..core import telemetry
+
+    telemetry.inc("cache_requests_total", result="hit")
+    with telemetry.span("fetch_seconds"):
+        ...
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Tuple
+
+PREFIX = "financelab_"
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_NOOP = nullcontext()
+
+
+def _key(name: str, labels: Dict[str, str]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+class Registry:
+    """Thread-safe store of counters and timers (count/sum/max)."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._counters: Dict[LabelKey, float] = {}
+        self._timers: Dict[LabelKey, List[float]] = {}  # [count, sum, max]
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def span(self, name: str, **labels):
+        """Context manager timing its block into the `name` timer."""
+        if not self.enabled:
+            return _NOOP
+        return self._span(name, labels)
+
+    @contextmanager
+    def _span(self, name: str, labels: Dict[str, str]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def export_state(self) -> Dict:
+        """Raw picklable state, to ship metrics out of a worker process."""
+        with self._lock:
+            return {"counters": dict(self._counters),
+                    "timers": {k: list(v) for k, v in self._timers.items()}}
+
+    def merge_state(self, state: Dict):
+        """Fold another registry's export_state() into this one."""
+        with self._lock:
+            for key, value in state["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, (count, total, peak) in state["timers"].items():
+                stats = self._timers.get(key)
+                if stats is None:
+                    self._timers[key] = [count, total, peak]
+                else:
+                    stats[0] += count
+                    stats[1] += total
+                    stats[2] = max(stats[2], peak)
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """Plain-data copy of every metric, for display."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            timers = [
+                {"name": name, "labels": dict(labels), "count": int(count),
+                 "sum_s": total, "avg_s": total / count, "max_s": peak}
+                for (name, labels), (count, total, peak) in sorted(self._timers.items())
+            ]
+        return {"counters": counters, "timers": timers}
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timers = sorted(self._timers.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = PREFIX + name
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), (count, total, _peak) in timers:
+            metric = PREFIX + name
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} summary")
+                typed.add(metric)
+            lines.append(f"{metric}_count{_format_labels(labels)} {int(count)}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total:.6f}")
+        for (name, labels), (_count, _total, peak) in timers:
+            metric = PREFIX + name + "_max"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} gauge")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {peak:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically write the metrics file (e.g. for node_exporter's textfile collector)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+def configure_from_env():
+    """Apply FINANCELAB_METRICS; called again once .env has been loaded."""
+    REGISTRY.enabled = os.getenv("FINANCELAB_METRICS", "0").lower() in ("1", "true", "yes")
+
+
+configure_from_env()
+
+
+def enable(enabled: bool = True):
+    REGISTRY.enabled = enabled
+
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def inc(name: str, value: float = 1, **labels):
+    if REGISTRY.enabled:
+        REGISTRY.inc(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels):
+    if REGISTRY.enabled:
+        REGISTRY.observe(name, seconds, **labels)
+
+
+def span(name: str, **labels):
+    if not REGISTRY.enabled:
+        return _NOOP
+    return REGISTRY._span(name, labels)
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class SignalState:
+    """The parts of an analysis that alerts are raised on."""
+    recommendation: str  # "Buy", "Hold", "Sell" or "N/A"
+    trend: str  # "golden", "death" or "none" (SMA 50 vs SMA 200)
+    rsi_zone: str  # "oversold", "neutral" or "overbought"
+    rsi: float
+    bars_key: str  # fingerprint of the bars the state was computed from
+    data_version: Optional[str] = None
+
+
+@dataclass
+class SignalAlert:
+    ticker: str
+    period: str
+    kind: str  # "recommendation", "trend" or "rsi"
+    previous: str
+    current: str
+    message: str
+    created_at: datetime = field(default_factory=datetime.now)
+    watchlists: List[str] = field(default_factory=list)
+
+
+class AlertStore:
+    """
+    Last known signal state per ticker/period, and the alerts raised when it
+    changed, in the cache database.
+
+    The state is one small row per ticker, so deciding whether anything
+    changed never needs a previous AnalysisResult.
+    """
+
+    def __init__(self, db_path: str = "finance_lab_cache.db", max_alerts: int = 10_000):
+        self.db_path = db_path
+        self.max_alerts = max_alerts
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signal_state (
+                ticker TEXT,
+                period TEXT,
+                recommendation TEXT,
+                trend TEXT,
+                rsi_zone TEXT,
+                rsi REAL,
+                bars_key TEXT,
+                data_version TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (ticker, period)
+            );
+            CREATE TABLE IF NOT EXISTS signal_alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP,
+                ticker TEXT,
+                period TEXT,
+                kind TEXT,
+                previous TEXT,
+                current TEXT,
+                message TEXT,
+                watchlists TEXT
+            );
+        """)
+        conn.commit()
+        conn.close()
+
+    def load_states(self, tickers: List[str], period: str) -> Dict[str, SignalState]:
+        """Stored states of the given tickers (missing ones are left out)."""
+        states = {}
+        conn = self._connect()
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            rows = conn.execute(
+                f"""
+                SELECT ticker, recommendation, trend, rsi_zone, rsi, bars_key, data_version
+                FROM signal_state WHERE period = ? AND ticker IN ({','.join('?' * len(chunk))})
+                """,
+                [period, *chunk]
+            ).fetchall()
+            for ticker, *values in rows:
+                states[ticker] = SignalState(*values)
+        conn.close()
+        return states
+
+    def save(self, period: str, states: Dict[str, SignalState], alerts: Iterable[SignalAlert] = ()):
+        """Write new states and their alerts in one transaction."""
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO signal_state
+                (ticker, period, recommendation, trend, rsi_zone, rsi, bars_key, data_version, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(t, period, s.recommendation, s.trend, s.rsi_zone, s.rsi, s.bars_key, s.data_version, now)
+             for t, s in states.items()]
+        )
+        conn.executemany(
+            """
+            INSERT INTO signal_alerts (created_at, ticker, period, kind, previous, current, message, watchlists)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(a.created_at.isoformat(), a.ticker, a.period, a.kind, a.previous, a.current, a.message,
+              json.dumps(a.watchlists)) for a in alerts]
+        )
+        conn.execute(
+            "DELETE FROM signal_alerts WHERE id <= (SELECT MAX(id) FROM signal_alerts) - ?",
+            (self.max_alerts,)
+        )
+        conn.commit()
+        conn.close()
+
+    def recent_alerts(self, limit: int = 50, since: Optional[datetime] = None,
+                      watchlist: Optional[str] = None) -> List[SignalAlert]:
+        """Newest first."""
+        query = "SELECT created_at, ticker, period, kind, previous, current, message, watchlists FROM signal_alerts"
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.isoformat())
+        if watchlist is not None:
+            # JSON array of names; match the quoted name
+            clauses.append("watchlists LIKE ?")
+            params.append(f'%{json.dumps(watchlist)}%')
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        conn = self._connect()
+        rows = conn.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        conn.close()
+        return [
+            SignalAlert(ticker=t, period=p, kind=k, previous=prev, current=cur, message=msg,
+                        created_at=datetime.fromisoformat(created), watchlists=json.loads(names))
+            for created, t, p, k, prev, cur, msg, names in rows
+        ]
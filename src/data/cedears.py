@@ -0,0 +1,115 @@
+import csv
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# Seed conversion ratios (CEDEARs per underlying share), as published by
+# BYMA in 2024. Ratios change with splits and program updates: load the
+# current official list with RatioTable.load_csv rather than editing these.
+DEFAULT_RATIOS = {
+    "AAPL": 20, "MSFT": 30, "GOOGL": 58, "AMZN": 144, "TSLA": 15,
+    "SPY": 20, "QQQ": 20, "GLD": 50, "KO": 5, "JNJ": 15,
+    "NVDA": 24, "AMD": 10, "WMT": 18, "DIS": 12, "V": 18,
+    "META": 24, "MELI": 120,
+}
+
+
+@dataclass(frozen=True)
+class CedearRatio:
+    underlying: str  # Yahoo symbol of the foreign share (USD)
+    local: str  # Yahoo symbol of the CEDEAR on BYMA (ARS), e.g. AAPL.BA
+    ratio: float  # CEDEARs per underlying share
+
+
+def local_symbol(underlying: str) -> str:
+    """Default Yahoo symbol of a CEDEAR (BRK-B -> BRKB.BA)."""
+    return underlying.replace("-", "").replace(".", "") + ".BA"
+
+
+class RatioTable:
+    """
+    CEDEAR conversion ratios, kept in the cache database.
+
+    Seeded with DEFAULT_RATIOS on first use. The table is read once and kept
+    in memory; `version` changes whenever ratios are written, so results
+    computed from them can be cached against it.
+    """
+
+    def __init__(self, db_path: str = "finance_lab_cache.db"):
+        self.db_path = db_path
+        self._ratios: Optional[Dict[str, CedearRatio]] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cedear_ratios (
+                underlying TEXT PRIMARY KEY,
+                local TEXT,
+                ratio REAL,
+                updated_at TIMESTAMP
+            )
+        """)
+        empty = conn.execute("SELECT COUNT(*) FROM cedear_ratios").fetchone()[0] == 0
+        conn.commit()
+        conn.close()
+        if empty:
+            self.upsert(CedearRatio(t, local_symbol(t), r) for t, r in DEFAULT_RATIOS.items())
+
+    def _load(self) -> Dict[str, CedearRatio]:
+        with self._lock:
+            if self._ratios is None:
+                conn = sqlite3.connect(self.db_path)
+                rows = conn.execute("SELECT underlying, local, ratio, updated_at FROM cedear_ratios").fetchall()
+                conn.close()
+                self._ratios = {u: CedearRatio(u, local, ratio) for u, local, ratio, _ in rows}
+                self._version = max((r[3] for r in rows), default="")
+            return self._ratios
+
+    @property
+    def version(self) -> str:
+        self._load()
+        return self._version
+
+    def get(self, underlying: str) -> Optional[CedearRatio]:
+        return self._load().get(underlying)
+
+    def all(self) -> Dict[str, CedearRatio]:
+        return dict(self._load())
+
+    def covered(self, tickers: Iterable[str]) -> List[CedearRatio]:
+        """Ratios of the tickers that have a CEDEAR, in the given order."""
+        ratios = self._load()
+        return [ratios[t] for t in dict.fromkeys(tickers) if t in ratios]
+
+    def upsert(self, ratios: Iterable[CedearRatio]) -> int:
+        rows = [(r.underlying, r.local, float(r.ratio), datetime.now().isoformat()) for r in ratios]
+        if rows:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(
+                "INSERT OR REPLACE INTO cedear_ratios (underlying, local, ratio, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+            conn.close()
+            with self._lock:
+                self._ratios = None
+        return len(rows)
+
+    def load_csv(self, path: str) -> int:
+        """
+        Import ratios from a CSV with `underlying` and `ratio` columns and an
+        optional `local` column. Returns the number of ratios written.
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        return self.upsert(
+            CedearRatio(r["underlying"].strip().upper(),
+                        (r.get("local") or "").strip().upper() or local_symbol(r["underlying"].strip().upper()),
+                        float(r["ratio"]))
+            for r in rows if r.get("underlying") and r.get("ratio")
+        )
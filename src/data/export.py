@@ -0,0 +1,131 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import List, Optional
+
+SUPPORTED_FORMATS = ("parquet", "csv")
+
+
+class ChunkedTableWriter:
+    """
+    Append DataFrame chunks to a single Parquet or CSV file.
+
+    Only one chunk is held in memory at a time, so output size is not bounded
+    by RAM. The schema is fixed by the first chunk.
+    """
+
+    def __init__(self, path: str, fmt: str = "parquet"):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}', expected one of {SUPPORTED_FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.rows_written = 0
+        self._parquet: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        if self.fmt == "parquet":
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._parquet is None:
+                self._schema = table.schema
+                self._parquet = pq.ParquetWriter(self.path, self._schema, compression="snappy")
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self.rows_written else "w",
+                      header=self.rows_written == 0, index=False)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def output_path(output_dir: str, name: str, fmt: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f"{name}.{fmt}")
+
+
+PANEL_FORMATS = ("arrow", "parquet")
+
+
+class RecordBatchWriter:
+    """
+    Append Arrow record batches with a fixed schema to an Arrow IPC file or
+    a Parquet file.
+
+    Small batches (e.g. one per ticker) are buffered and written together
+    once `batch_rows` rows are pending, so memory is bounded by `batch_rows`
+    whatever the number of batches. Pending batches are written as they are,
+    never copied into one buffer: Arrow files keep them as record batches,
+    Parquet gathers them into row groups. Arrow files are written
+    uncompressed and can be memory-mapped by readers (see open_arrow).
+
+    Args:
+        sink: File path or writable pyarrow/Python file object
+        schema: Schema every batch must match
+        fmt: "arrow" (IPC file format) or "parquet"
+        batch_rows: Rows per written batch / Parquet row group
+    """
+
+    def __init__(self, sink, schema: pa.Schema, fmt: str = "arrow", batch_rows: int = 65_536):
+        if fmt not in PANEL_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}', expected one of {PANEL_FORMATS}")
+        self.schema = schema
+        self.fmt = fmt
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+        if fmt == "arrow":
+            self._writer = pa.ipc.new_file(sink, schema)
+        else:
+            self._writer = pq.ParquetWriter(sink, schema, compression="snappy")
+
+    def write(self, batch: pa.RecordBatch):
+        if batch.num_rows == 0:
+            return
+        if not batch.schema.equals(self.schema):
+            raise ValueError(f"Batch schema does not match the writer schema:\n{batch.schema}")
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        # A chunked view over the pending batches, no copy of their buffers
+        table = pa.Table.from_batches(self._pending, self.schema)
+        if self.fmt == "arrow":
+            self._writer.write_table(table, max_chunksize=self.batch_rows)
+        else:
+            self._writer.write_table(table, row_group_size=self.batch_rows)
+        self.rows_written += table.num_rows
+        self._pending, self._pending_rows = [], 0
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_arrow(path: str) -> pa.Table:
+    """Memory-map an Arrow file written by RecordBatchWriter (no copy of the column data)."""
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
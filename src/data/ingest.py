@@ -0,0 +1,308 @@
+"""
+Ingest-time normalization of daily and intraday OHLCV frames.
+
+Runs once per download, before the frame is cached, so every consumer gets
+the same clean shape: float64 columns on a sorted, de-duplicated
+DatetimeIndex of the ticker's real sessions. Nothing is filled at ingest,
+so indicators and metrics only ever see bars that traded.
+
+Calendar alignment happens when frames are stacked (build_price_panel):
+every ticker is placed on the shared trading-day calendar and missing
+sessions are forward filled there, with a mask marking the filled cells.
+Intraday frames (normalize_intraday) get the same cleaning.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Close-to-close moves above this are flagged as suspicious (splits, bad ticks)
+DEFAULT_JUMP_THRESHOLD = 0.25
+# Runs of at least this many missing sessions are reported as gaps;
+# shorter ones are ordinary exchange holidays
+DEFAULT_GAP_SESSIONS = 3
+
+
+@lru_cache(maxsize=64)
+def trading_calendar(start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """
+    Shared trading-day calendar: every weekday between start and end.
+
+    Exchange holidays are not removed: panels forward fill tickers over
+    them so all series share one grid regardless of the exchange.
+    """
+    return pd.bdate_range(start=start, end=end, name="Date")
+
+
+@dataclass
+class IngestReport:
+    ticker: str
+    rows_in: int = 0
+    rows_out: int = 0
+    duplicates: int = 0
+    invalid: int = 0  # missing or non-positive close
+    off_calendar: int = 0  # weekend bars dropped
+    missing: int = 0  # calendar weekdays without a bar (holidays included)
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp]] = field(default_factory=list)
+    jumps: List[pd.Timestamp] = field(default_factory=list)
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self.gaps or self.jumps)
+
+
+def _missing_runs(missing: pd.DatetimeIndex, calendar: pd.DatetimeIndex, min_len: int):
+    """(first, last) of every run of at least min_len consecutive missing sessions."""
+    if missing.empty:
+        return []
+    pos = calendar.get_indexer(missing)
+    breaks = np.flatnonzero(np.diff(pos) != 1)
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks, [len(pos) - 1]])
+    return [(missing[s], missing[e]) for s, e in zip(starts, ends) if e - s + 1 >= min_len]
+
+
+def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """OHLCV first, then any other columns (e.g. Adj Close); numeric ones as float64."""
+    columns = [c for c in OHLCV_COLUMNS if c in df.columns] + [c for c in df.columns if c not in OHLCV_COLUMNS]
+    out = df[columns]
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(out[c])]
+    return out.astype({c: "float64" for c in numeric})
+
+
+def _consolidate(df: pd.DataFrame) -> pd.DataFrame:
+    # One float64 block when possible: every column is a contiguous array
+    if all(dtype == np.float64 for dtype in df.dtypes):
+        return pd.DataFrame(df.to_numpy(), index=df.index, columns=df.columns)
+    return df
+
+
+def normalize_ohlcv(
+    df: pd.DataFrame,
+    ticker: str = "",
+    jump_threshold: float = DEFAULT_JUMP_THRESHOLD,
+    gap_sessions: int = DEFAULT_GAP_SESSIONS,
+) -> Tuple[pd.DataFrame, IngestReport]:
+    """
+    Validate a raw daily OHLCV frame.
+
+    Sorts and de-duplicates bars (keeping the last), drops bars without a
+    valid close and weekend bars. Only real sessions are kept: missing
+    weekdays are counted, long runs of them reported as gaps, and jumps
+    flagged, but nothing is filled or removed for them. Columns other than
+    OHLCV (e.g. Adj Close) are kept.
+
+    Args:
+        df: Raw frame indexed by date (e.g. from yfinance)
+        ticker: Symbol, for the report
+        jump_threshold: Absolute daily return flagged as a jump
+        gap_sessions: Minimum run of missing sessions reported as a gap
+
+    Returns:
+        (normalized frame, IngestReport)
+    """
+    if "Close" not in df.columns:
+        raise ValueError(f"{ticker or 'frame'} has no Close column")
+    report = IngestReport(ticker=ticker, rows_in=len(df))
+
+    out = _clean_columns(df)
+    index = pd.DatetimeIndex(pd.to_datetime(out.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    out.index = index.normalize().rename("Date")
+
+    if not out.index.is_monotonic_increasing:
+        out = out.sort_index(kind="stable")
+    duplicated = out.index.duplicated(keep="last")
+    report.duplicates = int(duplicated.sum())
+    if report.duplicates:
+        out = out[~duplicated]
+
+    close = out["Close"]
+    valid = close.notna() & (close > 0)
+    report.invalid = int((~valid).sum())
+    if report.invalid:
+        out = out[valid]
+    if out.empty:
+        return out, report
+
+    weekday = out.index.dayofweek < 5
+    report.off_calendar = int((~weekday).sum())
+    if report.off_calendar:
+        out = out[weekday]
+
+    calendar = trading_calendar(out.index[0], out.index[-1])
+    missing = calendar.difference(out.index)
+    report.missing = len(missing)
+    report.gaps = _missing_runs(missing, calendar, gap_sessions)
+
+    # Isolated NaNs inside a real bar
+    for col in ("Open", "High", "Low"):
+        if col in out:
+            out[col] = out[col].fillna(out["Close"])
+
+    moves = out["Close"].pct_change().abs()
+    report.jumps = list(moves.index[moves > jump_threshold])
+
+    out = _consolidate(out)
+    report.rows_out = len(out)
+    return out, report
+
+
+def normalize_intraday(df: pd.DataFrame, ticker: str = "") -> Tuple[pd.DataFrame, IngestReport]:
+    """
+    Validate a raw intraday OHLCV frame.
+
+    Like normalize_ohlcv, but without the calendar: nights, weekends and
+    holidays are not bars. Timestamps are kept in exchange-local wall time
+    with the timezone dropped, so daily buckets are exchange sessions.
+
+    Returns:
+        (normalized frame, IngestReport)
+    """
+    if "Close" not in df.columns:
+        raise ValueError(f"{ticker or 'frame'} has no Close column")
+    report = IngestReport(ticker=ticker, rows_in=len(df))
+
+    out = _clean_columns(df)
+    index = pd.DatetimeIndex(pd.to_datetime(out.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    out.index = index.rename("Datetime")
+
+    if not out.index.is_monotonic_increasing:
+        out = out.sort_index(kind="stable")
+    duplicated = out.index.duplicated(keep="last")
+    report.duplicates = int(duplicated.sum())
+    if report.duplicates:
+        out = out[~duplicated]
+
+    close = out["Close"]
+    valid = close.notna() & (close > 0)
+    report.invalid = int((~valid).sum())
+    if report.invalid:
+        out = out[valid]
+    for col in ("Open", "High", "Low"):
+        if col in out:
+            out[col] = out[col].fillna(out["Close"])
+    if "Volume" in out:
+        out["Volume"] = out["Volume"].fillna(0.0)
+
+    out = _consolidate(out)
+    report.rows_out = len(out)
+    return out, report
+
+
+def _is_normalized(df: pd.DataFrame) -> bool:
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None or index.empty:
+        return False
+    return index.is_monotonic_increasing and index.is_unique and index.equals(index.normalize())
+
+
+@dataclass
+class PricePanel:
+    """
+    One price field of several tickers on the shared trading-day calendar.
+
+    `values` is a C-contiguous float64 array of shape (dates, tickers).
+    Sessions a ticker did not trade inside its own history (e.g. exchange
+    holidays) carry its previous value and are marked in `filled`; cells
+    outside its history are NaN.
+    """
+    dates: pd.DatetimeIndex
+    tickers: List[str]
+    values: np.ndarray
+    filled: Optional[np.ndarray] = None  # bool, same shape as values
+
+    def returns(self) -> np.ndarray:
+        """Simple returns, one row shorter than `values`."""
+        return self.values[1:] / self.values[:-1] - 1
+
+    def normalized(self) -> np.ndarray:
+        """Cumulative return of every ticker since the first common date."""
+        return self.values / self.values[0] - 1
+
+    def traded(self) -> np.ndarray:
+        """`values` with filled cells set to NaN: only prices that traded."""
+        if self.filled is None or not self.filled.any():
+            return self.values
+        return np.where(self.filled, np.nan, self.values)
+
+    def common_sessions(self) -> "PricePanel":
+        """Only the dates on which every ticker traded."""
+        if self.filled is None:
+            return self
+        keep = ~self.filled.any(axis=1)
+        return PricePanel(self.dates[keep], self.tickers, np.ascontiguousarray(self.values[keep]),
+                          np.zeros((int(keep.sum()), len(self.tickers)), dtype=bool))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers)
+
+
+def build_price_panel(frames: Dict[str, pd.DataFrame], tickers: Optional[List[str]] = None,
+                      field: str = "Close", how: str = "inner") -> PricePanel:
+    """
+    Stack frames on the trading-day calendar over the dates they all cover.
+
+    Each ticker's sessions are placed by position on the calendar and its
+    missing sessions forward filled (see PricePanel.filled). With
+    how="outer" the panel spans every date any frame covers instead, and
+    dates outside a ticker's history are NaN. Frames not from the ingest
+    stage are normalized first.
+    """
+    tickers = [t for t in (tickers or list(frames)) if frames.get(t) is not None and not frames[t].empty]
+    aligned = {}
+    for t in tickers:
+        df = frames[t]
+        aligned[t] = df if _is_normalized(df) else normalize_ohlcv(df, t)[0]
+    tickers = [t for t in tickers if not aligned[t].empty]
+    if not tickers:
+        return PricePanel(pd.DatetimeIndex([], name="Date"), [], np.empty((0, 0)), np.zeros((0, 0), dtype=bool))
+
+    if how == "outer":
+        start = min(aligned[t].index[0] for t in tickers)
+        end = max(aligned[t].index[-1] for t in tickers)
+    else:
+        start = max(aligned[t].index[0] for t in tickers)
+        end = min(aligned[t].index[-1] for t in tickers)
+    dates = trading_calendar(start, end) if start <= end else pd.DatetimeIndex([], name="Date")
+
+    n_dates = len(dates)
+    values = np.full((n_dates, len(tickers)), np.nan)
+    filled = np.zeros((n_dates, len(tickers)), dtype=bool)
+    if not n_dates:
+        return PricePanel(dates, tickers, values, filled)
+    rows = np.arange(n_dates)
+    for j, t in enumerate(tickers):
+        df = aligned[t]
+        pos = dates.get_indexer(df.index)
+        on_calendar = pos >= 0
+        pos = pos[on_calendar]
+        if not len(pos):
+            continue
+        values[pos, j] = df[field].to_numpy()[on_calendar]
+
+        # Forward fill inside the ticker's own history (or from the first
+        # date, when its history started earlier than the panel)
+        traded = np.zeros(n_dates, dtype=bool)
+        traded[pos] = True
+        first = 0 if df.index[0] < dates[0] else pos[0]
+        last = n_dates - 1 if df.index[-1] > dates[-1] else pos[-1]
+        if first < pos[0]:
+            # History starts before the panel: carry its last earlier value
+            before = df[field].to_numpy()[df.index.searchsorted(dates[0]) - 1]
+            values[0, j] = before
+            traded[0] = True
+            filled[0, j] = True
+        source = np.maximum.accumulate(np.where(traded, rows, 0))
+        span = slice(first, last + 1)
+        gaps = ~traded[span]
+        values[span, j][gaps] = values[source[span][gaps], j]
+        filled[span, j] |= gaps
+    return PricePanel(dates, tickers, values, filled)
@@ -1,17 +1,67 @@
-import yfinance as yf
 import pandas as pd
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import os
-from dotenv import load_dotenv
 from .storage import DataCache
+from .memo import ResultCache
+from .ingest import PricePanel, build_price_panel, normalize_intraday, normalize_ohlcv
+from ..analysis.resample import INTRADAY_TIMEFRAMES, resample_bars
+from ..core.lazy import lazy_import
+from ..core import telemetry
 
-load_dotenv()
+# yfinance (and its HTTP stack) is only imported when a download is needed
+yf = lazy_import("yfinance")
+
+_env_loaded = False
+
+# Decoded frames kept in memory, keyed by cache version, so hot tickers
+# skip the sqlite read and parquet decode
+DEFAULT_MEMORY_FRAMES = 512
+# Intraday frames run to thousands of bars each (1m ones keep growing), so
+# they get their own, much smaller memory cache
+DEFAULT_MEMORY_INTRADAY_FRAMES = 32
+
+# Intraday bars are downloaded at one of these intervals; coarser intraday
+# timeframes are resampled from them, so 5m/15m/30m share one download
+INTRADAY_SOURCE = {"1m": "1m", "5m": "5m", "15m": "5m", "30m": "5m", "1h": "1h"}
+# Yahoo's limits: how far back each interval goes, and the longest window
+# a single request may span
+INTRADAY_LOOKBACK_DAYS = {"1m": 29, "5m": 59, "1h": 729}
+INTRADAY_REQUEST_DAYS = {"1m": 7, "5m": 59, "1h": 729}
+
+# Calendar days covered by each yfinance period ("ytd" and "max" handled apart)
+PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 30, "3mo": 91, "6mo": 182, "1y": 365, "2y": 730, "5y": 1826, "10y": 3652}
+
+def period_start(period: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """First date a yfinance period covers, None for "max"."""
+    now = now or datetime.now()
+    if period == "ytd":
+        return datetime(now.year, 1, 1)
+    if period in PERIOD_DAYS:
+        return (now - timedelta(days=PERIOD_DAYS[period])).replace(hour=0, minute=0, second=0, microsecond=0)
+    return None
+
+def _load_env():
+    """Load .env once, on first use rather than at import time."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        telemetry.configure_from_env()
+        _env_loaded = True
 
 class DataLoader:
-    def __init__(self):
+    def __init__(self, memory_frames: int = DEFAULT_MEMORY_FRAMES, db_path: str = "finance_lab_cache.db",
+                 memory_intraday_frames: int = DEFAULT_MEMORY_INTRADAY_FRAMES):
+        _load_env()
         # Allow overriding cache settings via env vars
         ttl = int(os.getenv("CACHE_TTL_HOURS", "6"))
-        self.cache = DataCache(ttl_hours=ttl)
+        self.cache = DataCache(db_path=db_path, ttl_hours=ttl)
+        self.frames = ResultCache(ttl_hours=ttl, max_entries=memory_frames)
+        # Intraday bars go stale much sooner; only the bars since the last
+        # stored session are downloaded again
+        self.intraday_ttl = timedelta(minutes=int(os.getenv("CACHE_INTRADAY_TTL_MINUTES", "15")))
+        self.intraday_frames = ResultCache(ttl_hours=ttl, max_entries=memory_intraday_frames)
 
     def get_ticker_history(self, ticker: str, period: str = "1y") -> Optional[pd.DataFrame]:
         """
@@ -22,37 +72,215 @@ class DataLoader:
             period: valid yfinance period (1m, 3m, 6m, 1y, 5y, max)
         
         Returns:
-            pd.DataFrame with OHLCV data or None if failed
+            pd.DataFrame with OHLCV data (shared, treat as read-only) or None if failed
         """
+        # Feeds the warmup scheduler's notion of hot keys
+        self.cache.record_access(ticker, period)
+
         # Try cache first
-        cached_df = self.cache.get_data(ticker, period)
+        cached_df = self._load_cached(ticker, period)
         if cached_df is not None:
             return cached_df
 
-        # Fetch from API
+        return self._download(ticker, period)
+
+    def refresh(self, ticker: str, period: str = "1y") -> bool:
+        """Download ticker/period again regardless of the cache (used by warmup)."""
+        return self._download(ticker, period) is not None
+
+    def refresh_many(self, tickers: List[str], period: str = "1y") -> Dict[str, bool]:
+        """
+        Download several tickers again with a single multi-symbol yf.download
+        call (used by the watchlist refresher). Returns ticker -> whether
+        fresh bars were stored.
+        """
+        if not tickers:
+            return {}
+        telemetry.inc("fetch_total")
+        try:
+            with telemetry.span("fetch_seconds"):
+                raw = yf.download(tickers, period=period, group_by="ticker", progress=False)
+        except Exception as e:
+            print(f"Error fetching {len(tickers)} tickers: {e}")
+            telemetry.inc("fetch_errors_total", reason="exception")
+            return dict.fromkeys(tickers, False)
+
+        stored = {}
+        for ticker in tickers:
+            df = None
+            if raw is not None and isinstance(raw.columns, pd.MultiIndex):
+                if ticker in raw.columns.get_level_values(0):
+                    # Bars of the other symbols' sessions are all NaN here
+                    df = raw[ticker].dropna(how="all")
+            elif len(tickers) == 1:
+                df = raw
+            stored[ticker] = self._store(ticker, period, df) is not None
+        return stored
+
+    def preload(self, ticker: str, period: str = "1y") -> bool:
+        """Load a fresh cached entry into memory without counting an access."""
+        return self._load_cached(ticker, period) is not None
+
+    def _load_cached(self, ticker: str, period: str) -> Optional[pd.DataFrame]:
+        updated_at = self.cache.get_updated_at(ticker, period)
+        if updated_at is not None:
+            df = self.frames.get((ticker, period, updated_at))
+            if df is not None:
+                return df
+
+        # The entry may have been refreshed since; file it under its own timestamp
+        entry = self.cache.get_entry(ticker, period)
+        if entry is None:
+            return None
+        updated_at, df = entry
+        self.frames.put((ticker, period, updated_at), df)
+        return df
+
+    def _download(self, ticker: str, period: str) -> Optional[pd.DataFrame]:
+        telemetry.inc("fetch_total")
         try:
             # yfinance download
-            df = yf.download(ticker, period=period, progress=False, multi_level_index=False)
-            
+            with telemetry.span("fetch_seconds"):
+                df = yf.download(ticker, period=period, progress=False, multi_level_index=False)
+        except Exception as e:
+            print(f"Error fetching {ticker}: {e}")
+            telemetry.inc("fetch_errors_total", reason="exception")
+            return None
+        return self._store(ticker, period, df)
+
+    def _store(self, ticker: str, period: str, df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Validate, normalize and cache downloaded daily bars."""
+        try:
             if df is None or df.empty:
+                telemetry.inc("fetch_errors_total", reason="empty")
                 return None
             
-            # Reset index to make Date a column if it's the index, useful for some operations
-            # But standard is usually Date index. Let's keep Date as index but ensure it's datetime.
-            # yfinance returns Date index.
-            
             # Simple validation
             if 'Close' not in df.columns:
+                telemetry.inc("fetch_errors_total", reason="invalid")
                 return None
+            
+            # Normalize once here so cached frames are already clean and aligned
+            df, report = normalize_ohlcv(df, ticker)
+            if df.empty:
+                telemetry.inc("fetch_errors_total", reason="invalid")
+                return None
+            if report.flagged:
+                print(f"Ingest {ticker}: {len(report.gaps)} gap(s), {len(report.jumps)} suspicious jump(s)")
+                telemetry.inc("ingest_flags_total", len(report.gaps), flag="gap")
+                telemetry.inc("ingest_flags_total", len(report.jumps), flag="jump")
                 
             # Save to cache
-            self.cache.save_data(ticker, period, df)
+            updated_at = self.cache.save_data(ticker, period, df)
+            if updated_at is not None:
+                self.frames.put((ticker, period, updated_at), df)
             return df
             
         except Exception as e:
-            print(f"Error fetching {ticker}: {e}")
+            print(f"Error storing {ticker}: {e}")
+            telemetry.inc("fetch_errors_total", reason="exception")
             return None
 
+    def get_intraday_history(self, ticker: str, interval: str = "5m", period: str = "1mo") -> Optional[pd.DataFrame]:
+        """
+        Intraday bars at a downloadable interval (1m, 5m or 1h).
+
+        Everything Yahoo still has is downloaded once and kept in chunked
+        storage; once stale, only the sessions since the last stored bar are
+        requested again. Periods longer than Yahoo's lookback return the
+        bars accumulated so far.
+
+        Returns:
+            pd.DataFrame with OHLCV bars in exchange-local time (shared, treat
+            as read-only) or None if there is nothing stored and the download failed
+        """
+        if interval not in INTRADAY_LOOKBACK_DAYS:
+            raise ValueError(f"Unknown intraday interval '{interval}', expected one of {list(INTRADAY_LOOKBACK_DAYS)}")
+        updated_at = self.cache.get_intraday_updated_at(ticker, interval)
+        if updated_at is None or datetime.now() - updated_at >= self.intraday_ttl:
+            # Bars older than Yahoo's lookback can't be refreshed anyway
+            lookback = datetime.now() - timedelta(days=INTRADAY_LOOKBACK_DAYS[interval])
+            stored = self.cache.get_intraday(ticker, interval, since=lookback) if updated_at else None
+            # Start at the last stored session so its partial bars are completed
+            start = stored.index[-1].normalize().to_pydatetime() if stored is not None and len(stored) else None
+            updated_at = self._download_intraday(ticker, interval, start) or updated_at
+        if updated_at is None:
+            return None
+        return self._load_intraday(ticker, interval, period, updated_at)
+
+    def get_bars(self, ticker: str, timeframe: str = "1d", period: str = "1y") -> Optional[pd.DataFrame]:
+        """
+        OHLCV bars of ticker at any timeframe in analysis.resample.TIMEFRAMES.
+
+        Daily and coarser bars are rolled up from the daily history, intraday
+        ones from the stored intraday interval they derive from, so switching
+        timeframe never downloads the same data again.
+        """
+        if timeframe in INTRADAY_TIMEFRAMES:
+            source = INTRADAY_SOURCE[timeframe]
+            df = self.get_intraday_history(ticker, source, period)
+        else:
+            source = "1d"
+            df = self.get_ticker_history(ticker, period)
+        if df is None or df.empty or timeframe == source:
+            return df
+        return resample_bars(df, timeframe)
+
+    def _load_intraday(self, ticker: str, interval: str, period: str, updated_at: datetime) -> Optional[pd.DataFrame]:
+        """Stored bars of the period; only the chunks it covers are decoded."""
+        since = period_start(period)
+        key = (ticker, interval, since, updated_at)
+        df = self.intraday_frames.get(key)
+        if df is None:
+            df = self.cache.get_intraday(ticker, interval, since=since)
+            if df is not None:
+                self.intraday_frames.put(key, df)
+        return df
+
+    def _download_intraday(self, ticker: str, interval: str, start: Optional[datetime]) -> Optional[datetime]:
+        """Download bars since start in request-sized windows and store them. Returns updated_at."""
+        now = datetime.now()
+        earliest = now - timedelta(days=INTRADAY_LOOKBACK_DAYS[interval])
+        start = max(start, earliest) if start else earliest
+        step = timedelta(days=INTRADAY_REQUEST_DAYS[interval])
+
+        frames = []
+        try:
+            while start <= now:
+                telemetry.inc("fetch_total")
+                with telemetry.span("fetch_seconds"):
+                    df = yf.download(ticker, start=start.date(), end=(start + step).date(), interval=interval,
+                                     progress=False, multi_level_index=False)
+                if df is not None and not df.empty and 'Close' in df.columns:
+                    frames.append(df)
+                start += step
+        except Exception as e:
+            print(f"Error fetching {ticker} ({interval}): {e}")
+            telemetry.inc("fetch_errors_total", reason="exception")
+            return None
+        if not frames:
+            telemetry.inc("fetch_errors_total", reason="empty")
+            return None
+
+        df, _ = normalize_intraday(pd.concat(frames), ticker)
+        if df.empty:
+            telemetry.inc("fetch_errors_total", reason="invalid")
+            return None
+        return self.cache.save_intraday(ticker, interval, df)
+
+    def data_version(self, ticker: str, period: str = "1y") -> Optional[str]:
+        """
+        Opaque token that changes whenever the cached data for ticker/period
+        is refreshed. None if there is no fresh cached copy yet.
+        """
+        updated_at = self.cache.get_updated_at(ticker, period)
+        return updated_at.isoformat() if updated_at else None
+
+    def data_versions(self, tickers: List[str], period: str = "1y") -> Dict[str, Optional[str]]:
+        """data_version of many tickers with a single cache query."""
+        updated = self.cache.get_updated_at_many(tickers, period)
+        return {t: u.isoformat() if u else None for t, u in updated.items()}
+
     def get_batch_history(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
         """
         Fetch history for multiple tickers.
@@ -63,3 +291,10 @@ class DataLoader:
             if data is not None:
                 results[t] = data
         return results
+
+    def get_price_panel(self, tickers: List[str], period: str = "1y", field: str = "Close") -> PricePanel:
+        """
+        Fetch tickers and stack one price field over their common dates.
+        Tickers that fail to download are left out.
+        """
+        return build_price_panel(self.get_batch_history(tickers, period), field=field)
@@ -0,0 +1,51 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    """
+    Thread-safe in-memory TTL cache.
+
+    Keeps computed outputs (analysis results, API responses) so identical
+    requests are served without touching the data layer again.
+    """
+
+    def __init__(self, ttl_hours: float = 6, max_entries: int = 64):
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[datetime, timedelta, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, ttl, value = entry
+                if datetime.now() - stored_at < ttl:
+                    self.hits += 1
+                    return value
+                # Expired
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, ttl_hours: Optional[float] = None):
+        """Store value; ttl_hours overrides the cache TTL for this entry."""
+        ttl = self.ttl if ttl_hours is None else timedelta(hours=ttl_hours)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Evict the oldest entry
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (datetime.now(), ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -1,9 +1,28 @@
 import sqlite3
+import threading
+import time
 import pandas as pd
 import io
 import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from ..core import telemetry
+
+# Access counts are buffered in memory and written in batches, so recording
+# them doesn't add a sqlite commit to every request
+ACCESS_FLUSH_EVERY = 100
+ACCESS_FLUSH_SECONDS = 60
+
+
+@dataclass
+class AccessStat:
+    ticker: str
+    period: str
+    hits: int
+    last_access: datetime
+    updated_at: Optional[datetime]  # of the cached data, even if expired; None if never cached
+
 
 class DataCache:
     def __init__(self, db_path: str = "finance_lab_cache.db", ttl_hours: int = 6):
@@ -16,6 +35,10 @@ class DataCache:
         """
         self.db_path = db_path
         self.ttl_hours = ttl_hours
+        self._pending_access: Dict[Tuple[str, str], List] = {}  # key -> [hits, last_access]
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._access_lock = threading.Lock()
         self._init_db()
 
     def _init_db(self):
@@ -31,6 +54,28 @@ class DataCache:
                 PRIMARY KEY (ticker, period)
             )
         """)
+        # Intraday bars, one parquet blob per ticker/interval/month, so a
+        # refresh rewrites only the month that got new bars
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS intraday_chunks (
+                ticker TEXT,
+                interval TEXT,
+                chunk_start TIMESTAMP,
+                updated_at TIMESTAMP,
+                rows INTEGER,
+                data BLOB,
+                PRIMARY KEY (ticker, interval, chunk_start)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS access_stats (
+                ticker TEXT,
+                period TEXT,
+                hits INTEGER,
+                last_access TIMESTAMP,
+                PRIMARY KEY (ticker, period)
+            )
+        """)
         conn.commit()
         conn.close()
 
@@ -38,6 +83,14 @@ class DataCache:
         """
         Retrieve data from cache if it exists and hasn't expired.
         """
+        entry = self.get_entry(ticker, period)
+        return entry[1] if entry is not None else None
+
+    def get_entry(self, ticker: str, period: str) -> Optional[Tuple[datetime, pd.DataFrame]]:
+        """
+        (updated_at, frame) of a fresh cached entry, read in one query so the
+        timestamp always belongs to the frame.
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -56,37 +109,242 @@ class DataCache:
             if datetime.now() - updated_at < timedelta(hours=self.ttl_hours):
                 try:
                     # Read parquet from bytes
-                    return pd.read_parquet(io.BytesIO(blob))
+                    with telemetry.span("cache_decode_seconds"):
+                        df = pd.read_parquet(io.BytesIO(blob))
+                    telemetry.inc("cache_requests_total", result="hit")
+                    telemetry.inc("cache_bytes_read_total", len(blob))
+                    return updated_at, df
                 except Exception as e:
                     print(f"Error reading cache for {ticker}: {e}")
+                    telemetry.inc("cache_requests_total", result="error")
                     return None
             else:
                 # Expired
+                telemetry.inc("cache_requests_total", result="expired")
                 return None
+        telemetry.inc("cache_requests_total", result="miss")
+        return None
+
+    def get_updated_at(self, ticker: str, period: str) -> Optional[datetime]:
+        """
+        Timestamp of the cached entry if it exists and hasn't expired.
+        Cheap freshness check: reads no data blob.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT updated_at FROM stock_data WHERE ticker = ? AND period = ?",
+            (ticker, period)
+        )
+        row = cursor.fetchone()
+        conn.close()
+
+        if row:
+            updated_at = datetime.fromisoformat(row[0])
+            if datetime.now() - updated_at < timedelta(hours=self.ttl_hours):
+                return updated_at
         return None
 
-    def save_data(self, ticker: str, period: str, df: pd.DataFrame):
+    def get_updated_at_many(self, tickers: List[str], period: str) -> Dict[str, Optional[datetime]]:
+        """get_updated_at for many tickers in one query (None if missing or expired)."""
+        result: Dict[str, Optional[datetime]] = dict.fromkeys(tickers)
+        cutoff = datetime.now() - timedelta(hours=self.ttl_hours)
+        conn = sqlite3.connect(self.db_path)
+        # Stay below sqlite's bound-parameter limit
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            rows = conn.execute(
+                f"SELECT ticker, updated_at FROM stock_data WHERE period = ? AND ticker IN ({','.join('?' * len(chunk))})",
+                [period, *chunk]
+            ).fetchall()
+            for ticker, updated_at in rows:
+                updated_at = datetime.fromisoformat(updated_at)
+                if updated_at > cutoff:
+                    result[ticker] = updated_at
+        conn.close()
+        return result
+
+    def save_data(self, ticker: str, period: str, df: pd.DataFrame) -> Optional[datetime]:
         """
-        Save dataframe to cache.
+        Save dataframe to cache. Returns the entry's updated_at, None on failure.
         """
         try:
             # Convert DF to parquet bytes
             buffer = io.BytesIO()
-            df.to_parquet(buffer, compression='snappy')
+            with telemetry.span("cache_encode_seconds"):
+                df.to_parquet(buffer, compression='snappy')
             blob = buffer.getvalue()
             
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            updated_at = datetime.now().isoformat()
+            updated_at = datetime.now()
             
             cursor.execute(
                 """
                 INSERT OR REPLACE INTO stock_data (ticker, period, updated_at, data)
                 VALUES (?, ?, ?, ?)
                 """,
-                (ticker, period, updated_at, blob)
+                (ticker, period, updated_at.isoformat(), blob)
             )
             conn.commit()
             conn.close()
+            telemetry.inc("cache_bytes_written_total", len(blob))
+            return updated_at
         except Exception as e:
             print(f"Error saving to cache for {ticker}: {e}")
+            return None
+
+    # --- Intraday chunks ---
+
+    @staticmethod
+    def _chunk_start(ts) -> pd.Timestamp:
+        return pd.Timestamp(ts).normalize().replace(day=1)
+
+    def _read_chunks(self, conn, ticker: str, interval: str, starts=None, since=None) -> List[pd.DataFrame]:
+        query = "SELECT data FROM intraday_chunks WHERE ticker = ? AND interval = ?"
+        params = [ticker, interval]
+        if starts is not None:
+            query += f" AND chunk_start IN ({','.join('?' * len(starts))})"
+            params += [s.isoformat() for s in starts]
+        if since is not None:
+            query += " AND chunk_start >= ?"
+            params.append(self._chunk_start(since).isoformat())
+        frames = []
+        for (blob,) in conn.execute(query + " ORDER BY chunk_start", params):
+            with telemetry.span("cache_decode_seconds"):
+                frames.append(pd.read_parquet(io.BytesIO(blob)))
+            telemetry.inc("cache_bytes_read_total", len(blob))
+        return frames
+
+    def get_intraday(self, ticker: str, interval: str, since: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """
+        Stored intraday bars of ticker/interval, optionally only from `since`.
+        Chunks never expire; see get_intraday_updated_at for freshness.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            frames = self._read_chunks(conn, ticker, interval, since=since)
+            conn.close()
+        except Exception as e:
+            print(f"Error reading intraday cache for {ticker}: {e}")
+            return None
+        if not frames:
+            return None
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        return df[df.index >= since] if since is not None else df
+
+    def get_intraday_updated_at(self, ticker: str, interval: str) -> Optional[datetime]:
+        """When bars were last added for ticker/interval, None if never."""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(
+            "SELECT MAX(updated_at) FROM intraday_chunks WHERE ticker = ? AND interval = ?",
+            (ticker, interval)
+        ).fetchone()
+        conn.close()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def save_intraday(self, ticker: str, interval: str, df: pd.DataFrame) -> Optional[datetime]:
+        """
+        Merge new intraday bars into the stored chunks (new bars win).
+        Only the months df touches are rewritten. Returns updated_at, None on failure.
+        """
+        if df.empty:
+            return None
+        try:
+            months = df.index.to_period("M").to_timestamp()
+            starts = list(months.unique())
+            conn = sqlite3.connect(self.db_path)
+            stored = {self._chunk_start(f.index[0]): f for f in self._read_chunks(conn, ticker, interval, starts=starts)
+                      if not f.empty}
+            updated_at = datetime.now()
+            rows = []
+            for start in starts:
+                chunk = df[months == start]
+                if start in stored:
+                    chunk = pd.concat([stored[start], chunk])
+                    chunk = chunk[~chunk.index.duplicated(keep="last")].sort_index(kind="stable")
+                buffer = io.BytesIO()
+                with telemetry.span("cache_encode_seconds"):
+                    chunk.to_parquet(buffer, compression='snappy')
+                rows.append((ticker, interval, start.isoformat(), updated_at.isoformat(), len(chunk), buffer.getvalue()))
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO intraday_chunks (ticker, interval, chunk_start, updated_at, rows, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.commit()
+            conn.close()
+            telemetry.inc("cache_bytes_written_total", sum(len(r[-1]) for r in rows))
+            return updated_at
+        except Exception as e:
+            print(f"Error saving intraday cache for {ticker}: {e}")
+            return None
+
+    def record_access(self, ticker: str, period: str):
+        """Count a request for ticker/period (buffered, see flush_access)."""
+        with self._access_lock:
+            entry = self._pending_access.setdefault((ticker, period), [0, None])
+            entry[0] += 1
+            entry[1] = datetime.now()
+            self._pending_count += 1
+            due = (self._pending_count >= ACCESS_FLUSH_EVERY
+                   or time.monotonic() - self._last_flush >= ACCESS_FLUSH_SECONDS)
+        if due:
+            self.flush_access()
+
+    def flush_access(self):
+        """Write buffered access counts to the database."""
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._pending_count = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(
+                """
+                INSERT INTO access_stats (ticker, period, hits, last_access) VALUES (?, ?, ?, ?)
+                ON CONFLICT (ticker, period) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    last_access = MAX(last_access, excluded.last_access)
+                """,
+                [(t, p, hits, last.isoformat()) for (t, p), (hits, last) in pending.items()]
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error saving access stats: {e}")
+
+    def hot_keys(self, limit: Optional[int] = None, since_days: float = 14) -> List[AccessStat]:
+        """
+        Most requested ticker/period pairs, hottest first.
+
+        Args:
+            limit: Maximum number of keys
+            since_days: Ignore keys not requested within this many days
+        """
+        self.flush_access()
+        since = (datetime.now() - timedelta(days=since_days)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT a.ticker, a.period, a.hits, a.last_access, s.updated_at
+            FROM access_stats a
+            LEFT JOIN stock_data s ON s.ticker = a.ticker AND s.period = a.period
+            WHERE a.last_access >= ?
+            ORDER BY a.hits DESC, a.last_access DESC
+            LIMIT ?
+            """,
+            (since, -1 if limit is None else limit)
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [
+            AccessStat(t, p, hits, datetime.fromisoformat(last),
+                       datetime.fromisoformat(updated) if updated else None)
+            for t, p, hits, last, updated in rows
+        ]
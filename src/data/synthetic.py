@@ -0,0 +1,123 @@
+import zlib
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from .ingest import PricePanel, build_price_panel
+from ..analysis.resample import BARS_PER_YEAR, INTRADAY_TIMEFRAMES, TIMEFRAMES, resample_bars
+
+
+@lru_cache(maxsize=32)
+def _business_days(end: str, periods: int) -> pd.DatetimeIndex:
+    # bdate_range is slow to build; the index is immutable so it can be shared
+    return pd.bdate_range(end=end, periods=periods, name="Date")
+
+
+@lru_cache(maxsize=32)
+def _session_bars(end: str, periods: int, interval: str) -> pd.DatetimeIndex:
+    """The last `periods` intraday bar times of 9:30-16:00 sessions up to end."""
+    per_session = BARS_PER_YEAR[interval] // 252
+    step = pd.Timedelta(TIMEFRAMES[interval])
+    days = _business_days(end, -(-periods // per_session))
+    offsets = pd.to_timedelta(np.arange(per_session) * step + pd.Timedelta(hours=9, minutes=30))
+    index = (days.to_numpy()[:, None] + offsets.to_numpy()[None, :]).ravel()
+    return pd.DatetimeIndex(index[-periods:], name="Datetime")
+
+
+def generate_ohlcv(
+    ticker: str,
+    periods: int = 252,
+    end: Optional[str] = None,
+    seed: Optional[int] = None,
+    interval: str = "1d",
+) -> pd.DataFrame:
+    """
+    Generate a deterministic, realistic-looking daily (or intraday) OHLCV frame.
+
+    Used by benchmarks and offline runs so they don't depend on Yahoo Finance.
+    The same ticker always yields the same series unless a seed is given.
+
+    Args:
+        ticker: Symbol, used to derive the default seed
+        periods: Number of bars
+        end: Last date (defaults to a fixed date so output is reproducible)
+        seed: Optional explicit seed
+        interval: "1d" or an intraday timeframe (bars of regular sessions)
+
+    Returns:
+        pd.DataFrame indexed by Date with Open, High, Low, Close, Volume
+    """
+    if seed is None:
+        seed = zlib.crc32(ticker.encode("utf-8"))
+    rng = np.random.default_rng(seed)
+
+    if interval == "1d":
+        index = _business_days(end or "2025-12-31", periods)
+        scale = 1.0
+    else:
+        index = _session_bars(end or "2025-12-31", periods, interval)
+        scale = 252 / BARS_PER_YEAR[interval]  # daily drift and variance spread over the session
+    drift = rng.uniform(-0.0002, 0.0008) * scale
+    vol = rng.uniform(0.008, 0.03) * np.sqrt(scale)
+    log_rets = rng.normal(drift, vol, periods)
+    close = rng.uniform(20, 500) * np.exp(np.cumsum(log_rets))
+
+    open_ = close * np.exp(rng.normal(0, vol / 3, periods))
+    spread = np.abs(rng.normal(0, vol / 2, periods))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.integers(100_000, 10_000_000, periods).astype(float)
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+# Approximate trading days covered by each yfinance period
+PERIOD_TRADING_DAYS = {
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "ytd": 200,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+    "max": 5040,
+}
+
+
+class OfflineDataLoader:
+    """
+    Drop-in replacement for DataLoader that serves synthetic data.
+
+    Lets the CLI, API and benchmarks run without network access or a cache db.
+    """
+
+    def get_ticker_history(self, ticker: str, period: str = "1y") -> Optional[pd.DataFrame]:
+        return generate_ohlcv(ticker, PERIOD_TRADING_DAYS.get(period, 252))
+
+    def get_intraday_history(self, ticker: str, interval: str = "5m", period: str = "1mo") -> Optional[pd.DataFrame]:
+        # Capped at 60 sessions, roughly what Yahoo keeps for 5m bars
+        sessions = min(PERIOD_TRADING_DAYS.get(period, 21), 60)
+        return generate_ohlcv(ticker, sessions * (BARS_PER_YEAR[interval] // 252), interval=interval)
+
+    def get_bars(self, ticker: str, timeframe: str = "1d", period: str = "1y") -> Optional[pd.DataFrame]:
+        if timeframe in INTRADAY_TIMEFRAMES:
+            return self.get_intraday_history(ticker, timeframe, period)
+        df = self.get_ticker_history(ticker, period)
+        return df if timeframe == "1d" else resample_bars(df, timeframe)
+
+    def data_version(self, ticker: str, period: str = "1y") -> Optional[str]:
+        # Synthetic data never changes
+        return "offline"
+
+    def data_versions(self, tickers, period: str = "1y") -> Dict[str, Optional[str]]:
+        return dict.fromkeys(tickers, "offline")
+
+    def get_batch_history(self, tickers, period: str = "1y"):
+        return {t: self.get_ticker_history(t, period) for t in tickers}
+
+    def get_price_panel(self, tickers, period: str = "1y", field: str = "Close") -> PricePanel:
+        return build_price_panel(self.get_batch_history(tickers, period), field=field)
@@ -0,0 +1,228 @@
+"""
+Keeps the most requested tickers warm.
+
+DataCache counts every ticker/period request. WarmupScheduler uses those
+counts to:
+- preload fresh cached entries into the loader's memory at start-up
+- refresh hot entries shortly before their TTL runs out during the day
+- refresh every hot entry in the hour before the morning open, so the
+  first user of the day doesn't trigger a cold batch download
+
+Upstream downloads are capped by a RequestBudget (requests per rolling
+hour); keys that don't fit wait for the next run, hottest first.
+
+    python -m src.data.warmup --budget 300   # one pass, e.g. from cron
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from ..core import telemetry
+
+DEFAULT_BUDGET_PER_HOUR = 120
+DEFAULT_TOP_KEYS = 300
+# Refresh during the day once this fraction of the TTL is left
+DEFAULT_REFRESH_AHEAD = 0.2
+DEFAULT_INTERVAL_SECONDS = 300
+# Local hour the first users arrive; the hour before it is the prewarm window
+DEFAULT_MORNING_HOUR = 8
+
+
+class RequestBudget:
+    """At most `max_requests` upstream requests in any rolling `window_seconds`."""
+
+    def __init__(self, max_requests: int, window_seconds: float = 3600):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._sent and now - self._sent[0] >= self.window_seconds:
+            self._sent.popleft()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if len(self._sent) >= self.max_requests:
+                return False
+            self._sent.append(now)
+            return True
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return self.max_requests - len(self._sent)
+
+
+@dataclass
+class WarmupReport:
+    refreshed: List[Tuple[str, str]] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    deferred: List[Tuple[str, str]] = field(default_factory=list)  # due, but over budget
+
+
+class WarmupScheduler:
+    """
+    Refreshes the hottest ticker/period keys of a DataLoader ahead of expiry.
+
+    Args:
+        loader: DataLoader (needs cache, refresh and preload)
+        budget: Upstream request budget shared by every run
+        top_keys: Number of hottest keys to keep warm
+        seed_keys: Keys always kept warm, e.g. the default watchlist, so a
+            fresh install has something to warm before any stats exist
+        refresh_ahead: Fraction of the TTL before expiry at which to refresh
+        morning_hour: Local hour by which hot keys must be fresh
+        interval_seconds: Pause between runs of the background thread
+    """
+
+    def __init__(
+        self,
+        loader,
+        budget: Optional[RequestBudget] = None,
+        top_keys: int = DEFAULT_TOP_KEYS,
+        seed_keys: Iterable[Tuple[str, str]] = (),
+        refresh_ahead: float = DEFAULT_REFRESH_AHEAD,
+        morning_hour: int = DEFAULT_MORNING_HOUR,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    ):
+        self.loader = loader
+        self.budget = budget or RequestBudget(DEFAULT_BUDGET_PER_HOUR)
+        self.top_keys = top_keys
+        self.seed_keys = list(seed_keys)
+        self.refresh_ahead = refresh_ahead
+        self.morning_hour = morning_hour
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ttl(self) -> timedelta:
+        return timedelta(hours=self.loader.cache.ttl_hours)
+
+    def _candidates(self) -> List[Tuple[str, str, Optional[datetime]]]:
+        """Hot keys (hottest first) followed by any seed keys not among them."""
+        stats = self.loader.cache.hot_keys(limit=self.top_keys)
+        keys = [(s.ticker, s.period, s.updated_at) for s in stats]
+        seen = {(t, p) for t, p, _ in keys}
+        for ticker, period in self.seed_keys:
+            if (ticker, period) not in seen:
+                seen.add((ticker, period))
+                keys.append((ticker, period, self.loader.cache.get_updated_at(ticker, period)))
+        return keys[:max(self.top_keys, len(self.seed_keys))]
+
+    def _prewarm_start(self, now: datetime) -> Optional[datetime]:
+        """Start of the upcoming prewarm window if `now` is inside it."""
+        morning = datetime.combine(now.date(), datetime.min.time()) + timedelta(hours=self.morning_hour)
+        if morning <= now:
+            morning += timedelta(days=1)  # e.g. morning_hour=0: the window is late tonight
+        start = morning - timedelta(hours=1)
+        return start if start <= now else None
+
+    def is_due(self, updated_at: Optional[datetime], now: datetime) -> bool:
+        if updated_at is None:
+            return True
+        prewarm_start = self._prewarm_start(now)
+        if prewarm_start is not None:
+            # Anything not refreshed within the window would expire during the morning
+            return updated_at < prewarm_start
+        return now - updated_at >= self.ttl * (1 - self.refresh_ahead)
+
+    def plan(self, now: Optional[datetime] = None) -> List[Tuple[str, str]]:
+        """Keys due for a refresh, hottest first."""
+        now = now or datetime.now()
+        return [(t, p) for t, p, updated_at in self._candidates() if self.is_due(updated_at, now)]
+
+    def preload(self) -> int:
+        """Load fresh cached hot keys into memory; costs no upstream requests."""
+        return sum(1 for t, p, updated_at in self._candidates()
+                   if updated_at is not None and self.loader.preload(t, p))
+
+    def run_once(self, now: Optional[datetime] = None) -> WarmupReport:
+        report = WarmupReport()
+        for key in self.plan(now):
+            if not self.budget.try_acquire():
+                report.deferred.append(key)
+                continue
+            if self.loader.refresh(*key):
+                report.refreshed.append(key)
+            else:
+                report.failed.append(key)
+        telemetry.inc("warmup_refresh_total", len(report.refreshed), result="ok")
+        telemetry.inc("warmup_refresh_total", len(report.failed), result="failed")
+        telemetry.inc("warmup_refresh_total", len(report.deferred), result="deferred")
+        return report
+
+    def _loop(self):
+        try:
+            self.preload()
+        except Exception as e:
+            print(f"Warmup preload failed: {e}")
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Warmup run failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        """Preload, then refresh in a background daemon thread until stop()."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def scheduler_from_env(loader, seed_keys: Iterable[Tuple[str, str]] = ()) -> Optional[WarmupScheduler]:
+    """
+    Scheduler configured from FINANCELAB_WARMUP* variables, or None when
+    FINANCELAB_WARMUP is off.
+    """
+    if os.getenv("FINANCELAB_WARMUP", "0").lower() not in ("1", "true", "yes"):
+        return None
+    return WarmupScheduler(
+        loader,
+        budget=RequestBudget(int(os.getenv("FINANCELAB_WARMUP_BUDGET", DEFAULT_BUDGET_PER_HOUR))),
+        top_keys=int(os.getenv("FINANCELAB_WARMUP_TOP", DEFAULT_TOP_KEYS)),
+        seed_keys=seed_keys,
+        morning_hour=int(os.getenv("FINANCELAB_WARMUP_MORNING_HOUR", DEFAULT_MORNING_HOUR)),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh the most requested cache entries once")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_PER_HOUR,
+                        help="Maximum upstream requests for this run")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_KEYS, help="Hottest keys to consider")
+    parser.add_argument("--all", action="store_true",
+                        help="Refresh every hot key regardless of age (e.g. a pre-market cron job)")
+    args = parser.parse_args(argv)
+
+    from ..app.utils import get_default_tickers
+    from .loader import DataLoader
+    scheduler = WarmupScheduler(
+        DataLoader(), RequestBudget(args.budget), top_keys=args.top,
+        seed_keys=[(t, "1y") for t in get_default_tickers()],
+        refresh_ahead=1.0 if args.all else DEFAULT_REFRESH_AHEAD,
+    )
+    report = scheduler.run_once()
+    print(f"Refreshed {len(report.refreshed)}, failed {len(report.failed)}, "
+          f"deferred {len(report.deferred)} (over budget)")
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
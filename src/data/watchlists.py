@@ -0,0 +1,220 @@
+import hashlib
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..domain.models import AnalysisResult, Watchlist
+
+# Snapshots kept per watchlist/period/risk profile
+DEFAULT_MAX_HISTORY = 20
+
+
+@dataclass
+class WatchlistSnapshot:
+    name: str
+    period: str
+    risk_profile: str
+    created_at: datetime
+    results: List[AnalysisResult]  # ranked, best first
+    versions: Dict[str, Optional[str]]  # ticker -> data version the result was computed from
+    failed: List[str] = field(default_factory=list)
+    fingerprints: Dict[str, Optional[str]] = field(default_factory=dict)  # ticker -> bars_fingerprint of those bars
+
+
+def _encode_result(result: AnalysisResult) -> bytes:
+    return zlib.compress(json.dumps(result.to_dict(), separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_result(blob: bytes) -> AnalysisResult:
+    return AnalysisResult.from_dict(json.loads(zlib.decompress(blob)))
+
+
+class WatchlistStore:
+    """
+    Named watchlists and their analysis snapshots, in the cache database.
+
+    Snapshot rows only reference results by content hash; each distinct
+    AnalysisResult is stored once (zlib-compressed JSON), so a history of
+    snapshots where most tickers didn't change costs little more than one.
+    """
+
+    def __init__(self, db_path: str = "finance_lab_cache.db", max_history: int = DEFAULT_MAX_HISTORY):
+        self.db_path = db_path
+        self.max_history = max_history
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS watchlists (
+                name TEXT PRIMARY KEY,
+                tickers TEXT,
+                updated_at TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS watchlist_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                period TEXT,
+                risk_profile TEXT,
+                created_at TIMESTAMP,
+                entries TEXT,
+                failed TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_watchlist_snapshots
+                ON watchlist_snapshots (name, period, risk_profile, id);
+            CREATE TABLE IF NOT EXISTS analysis_results (
+                hash TEXT PRIMARY KEY,
+                data BLOB
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_results (
+                snapshot_id INTEGER,
+                hash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshot_results_id ON snapshot_results (snapshot_id);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_results_hash ON snapshot_results (hash);
+        """)
+        # Databases from before snapshot_results: index the existing snapshots once
+        if conn.execute("SELECT 1 FROM snapshot_results LIMIT 1").fetchone() is None:
+            rows = conn.execute("SELECT id, entries FROM watchlist_snapshots").fetchall()
+            conn.executemany(
+                "INSERT INTO snapshot_results (snapshot_id, hash) VALUES (?, ?)",
+                [(i, h) for i, entries_json in rows for h in {e[2] for e in json.loads(entries_json)}]
+            )
+        conn.commit()
+        conn.close()
+
+    # --- Watchlists ---
+
+    def save(self, watchlist: Watchlist):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO watchlists (name, tickers, updated_at) VALUES (?, ?, ?)",
+            (watchlist.name, json.dumps(watchlist.tickers), datetime.now().isoformat())
+        )
+        conn.commit()
+        conn.close()
+
+    def get(self, name: str) -> Optional[Watchlist]:
+        conn = self._connect()
+        row = conn.execute("SELECT tickers FROM watchlists WHERE name = ?", (name,)).fetchone()
+        conn.close()
+        return Watchlist(name=name, tickers=json.loads(row[0])) if row else None
+
+    def list_names(self) -> List[str]:
+        conn = self._connect()
+        rows = conn.execute("SELECT name FROM watchlists ORDER BY name").fetchall()
+        conn.close()
+        return [r[0] for r in rows]
+
+    def delete(self, name: str):
+        conn = self._connect()
+        conn.execute("DELETE FROM watchlists WHERE name = ?", (name,))
+        ids = [i for (i,) in conn.execute("SELECT id FROM watchlist_snapshots WHERE name = ?", (name,))]
+        self._drop_snapshots(conn, ids)
+        conn.commit()
+        conn.close()
+
+    # --- Snapshots ---
+
+    def save_snapshot(self, snapshot: WatchlistSnapshot):
+        """Store a snapshot and trim that watchlist's history to max_history."""
+        blobs = {r.ticker: _encode_result(r) for r in snapshot.results}
+        hashes = {t: hashlib.sha1(b).hexdigest() for t, b in blobs.items()}
+        # Ranked order is kept by the entries list
+        entries = [[r.ticker, snapshot.versions.get(r.ticker), hashes[r.ticker], snapshot.fingerprints.get(r.ticker)]
+                   for r in snapshot.results]
+
+        conn = self._connect()
+        conn.executemany(
+            "INSERT OR IGNORE INTO analysis_results (hash, data) VALUES (?, ?)",
+            [(hashes[t], blob) for t, blob in blobs.items()]
+        )
+        key = (snapshot.name, snapshot.period, snapshot.risk_profile)
+        snapshot_id = conn.execute(
+            """
+            INSERT INTO watchlist_snapshots (name, period, risk_profile, created_at, entries, failed)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (*key, snapshot.created_at.isoformat(), json.dumps(entries), json.dumps(snapshot.failed))
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO snapshot_results (snapshot_id, hash) VALUES (?, ?)",
+            [(snapshot_id, h) for h in set(hashes.values())]
+        )
+        trimmed = [i for (i,) in conn.execute(
+            """
+            SELECT id FROM watchlist_snapshots
+            WHERE name = ? AND period = ? AND risk_profile = ?
+            ORDER BY id DESC LIMIT -1 OFFSET ?
+            """,
+            (*key, self.max_history)
+        )]
+        self._drop_snapshots(conn, trimmed)
+        conn.commit()
+        conn.close()
+
+    def latest_snapshot(self, name: str, period: str, risk_profile: str) -> Optional[WatchlistSnapshot]:
+        snapshots = self.history(name, period, risk_profile, limit=1)
+        return snapshots[0] if snapshots else None
+
+    def history(self, name: str, period: str, risk_profile: str, limit: Optional[int] = None) -> List[WatchlistSnapshot]:
+        """Snapshots, newest first."""
+        conn = self._connect()
+        rows = conn.execute(
+            """
+            SELECT created_at, entries, failed FROM watchlist_snapshots
+            WHERE name = ? AND period = ? AND risk_profile = ?
+            ORDER BY id DESC LIMIT ?
+            """,
+            (name, period, risk_profile, -1 if limit is None else limit)
+        ).fetchall()
+
+        snapshots = []
+        for created_at, entries_json, failed_json in rows:
+            # [ticker, version, hash, fingerprint]; older snapshots have no fingerprint
+            entries = [(e + [None])[:4] for e in json.loads(entries_json)]
+            wanted = [h for _, _, h, _ in entries]
+            placeholders = ",".join("?" * len(wanted))
+            blobs = dict(conn.execute(
+                f"SELECT hash, data FROM analysis_results WHERE hash IN ({placeholders})", wanted
+            ).fetchall()) if wanted else {}
+            snapshots.append(WatchlistSnapshot(
+                name=name,
+                period=period,
+                risk_profile=risk_profile,
+                created_at=datetime.fromisoformat(created_at),
+                results=[_decode_result(blobs[h]) for _, _, h, _ in entries],
+                versions={t: v for t, v, _, _ in entries},
+                failed=json.loads(failed_json),
+                fingerprints={t: f for t, _, _, f in entries},
+            ))
+        conn.close()
+        return snapshots
+
+    def _drop_snapshots(self, conn: sqlite3.Connection, ids: List[int]):
+        """
+        Delete snapshots, then the result blobs only they referenced. Only
+        the dropped snapshots' hashes are checked, so the cost doesn't grow
+        with the stored history.
+        """
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            hashes = [h for (h,) in conn.execute(
+                f"SELECT DISTINCT hash FROM snapshot_results WHERE snapshot_id IN ({placeholders})", chunk
+            )]
+            conn.execute(f"DELETE FROM watchlist_snapshots WHERE id IN ({placeholders})", chunk)
+            conn.execute(f"DELETE FROM snapshot_results WHERE snapshot_id IN ({placeholders})", chunk)
+            conn.executemany(
+                """
+                DELETE FROM analysis_results
+                WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM snapshot_results WHERE hash = ?)
+                """,
+                [(h, h) for h in hashes]
+            )
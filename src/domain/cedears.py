@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..analysis.cedear import implied_ccl, last_valid, market_ccl, premium_stats, series_metrics
+from ..core import telemetry
+from ..data.cedears import CedearRatio, RatioTable
+from ..data.ingest import build_price_panel
+from ..data.memo import ResultCache
+from .screener import DEFAULT_FETCH_WORKERS, fetch_history
+
+# Days of premium history a pair's current premium is compared against
+DEFAULT_PREMIUM_LOOKBACK = 60
+
+
+@dataclass
+class CedearScreen:
+    """
+    Cross-market view of a CEDEAR universe.
+
+    `table` has one row per pair (indexed by underlying), sorted from the
+    deepest discount to the highest premium against the market CCL.
+    """
+    dates: pd.DatetimeIndex
+    pairs: List[CedearRatio]
+    ccl: np.ndarray  # implied CCL, shape (dates, pairs)
+    market_ccl: np.ndarray  # reference CCL per date
+    table: pd.DataFrame
+    missing: List[str] = field(default_factory=list)  # no data for the CEDEAR or its underlying
+
+    def flagged(self, threshold: float = 0.02) -> pd.DataFrame:
+        """Pairs trading at least `threshold` away from the market CCL."""
+        return self.table[self.table["premium"].abs() >= threshold]
+
+
+class CedearScreener:
+    """
+    Implied CCL, premium/discount and ARS metrics for CEDEAR pairs.
+
+    Screens are cached against the data versions of every series and the
+    ratio table version, so rerunning an unchanged universe costs only one
+    freshness query.
+
+    Args:
+        loader: DataLoader (needs get_ticker_history and data_versions)
+        ratios: RatioTable with the conversion ratios
+        lookback: Days of history for the premium z-score
+        fetch_workers: Concurrent downloads
+    """
+
+    def __init__(self, loader, ratios: RatioTable, lookback: int = DEFAULT_PREMIUM_LOOKBACK,
+                 fetch_workers: int = DEFAULT_FETCH_WORKERS, cache_entries: int = 16):
+        self.loader = loader
+        self.ratios = ratios
+        self.lookback = lookback
+        self.fetch_workers = fetch_workers
+        # Bounds how long a failed symbol stays missing from a cached screen
+        self.results = ResultCache(ttl_hours=1, max_entries=cache_entries)
+
+    def _cache_key(self, pairs: List[CedearRatio], symbols: List[str], period: str):
+        # A symbol without fresh data has version None: the key changes as
+        # soon as it is downloaded or any cached series expires or refreshes
+        versions = self.loader.data_versions(symbols, period)
+        return (period, tuple(pairs), self.ratios.version, tuple(versions[s] for s in symbols))
+
+    def screen(self, tickers: Optional[List[str]] = None, period: str = "1y") -> Optional[CedearScreen]:
+        """
+        Screen the CEDEARs of `tickers` (underlying symbols; every ticker in
+        the ratio table by default). Tickers without a ratio are ignored.
+
+        Returns:
+            CedearScreen, or None if no pair has data
+        """
+        requested = self.ratios.covered(tickers) if tickers is not None else list(self.ratios.all().values())
+        symbols = list(dict.fromkeys(s for p in requested for s in (p.local, p.underlying)))
+        key = self._cache_key(requested, symbols, period)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="cedear-fetch") as pool:
+            frames = dict(zip(symbols, pool.map(lambda s: fetch_history(self.loader, s, period), symbols)))
+
+        missing = [p.underlying for p in requested if frames.get(p.local) is None or frames.get(p.underlying) is None]
+        pairs = [p for p in requested if p.underlying not in missing]
+        if not pairs:
+            return None
+
+        with telemetry.span("cedear_screen_seconds"):
+            result = self._compute(pairs, frames, missing)
+        # Keyed by the versions after the fetch, i.e. what the next call will
+        # see; only symbols that had no fresh data can have changed
+        if None in key[-1]:
+            key = self._cache_key(requested, symbols, period)
+        self.results.put(key, result)
+        return result
+
+    def _compute(self, pairs: List[CedearRatio], frames, missing: List[str]) -> CedearScreen:
+        n = len(pairs)
+        # Locals then underlyings, on one calendar; pairs with a shorter
+        # history are NaN before it starts instead of truncating everyone
+        panel = build_price_panel(frames, [p.local for p in pairs] + [p.underlying for p in pairs], how="outer")
+        local, underlying = panel.values[:, :n], panel.values[:, n:]
+        # Argentine and US holidays differ: the CCL and the metrics only use
+        # sessions that traded, never a price carried over a holiday
+        traded = panel.traded()
+        local_traded, underlying_traded = traded[:, :n], traded[:, n:]
+        ratios = np.array([p.ratio for p in pairs])
+
+        ccl = implied_ccl(local_traded, underlying_traded, ratios)
+        reference = market_ccl(ccl)
+        premium = premium_stats(ccl, reference, self.lookback)
+        ars = series_metrics(local_traded)
+        usd = series_metrics(underlying_traded)
+
+        table = pd.DataFrame({
+            "local": [p.local for p in pairs],
+            "ratio": ratios,
+            "price_ars": local[-1],
+            "price_usd": underlying[-1],
+            "implied_ccl": last_valid(ccl),
+            "premium": premium.premium,
+            "premium_mean": premium.mean,
+            "premium_zscore": premium.zscore,
+            "return_ars": ars.total_return,
+            "return_usd": usd.total_return,
+            "volatility_ars": ars.volatility,
+            "max_drawdown_ars": ars.max_drawdown,
+        }, index=pd.Index([p.underlying for p in pairs], name="underlying"))
+        table = table.sort_values("premium", kind="stable")
+
+        return CedearScreen(dates=panel.dates, pairs=pairs, ccl=ccl, market_ccl=reference,
+                            table=table, missing=missing)
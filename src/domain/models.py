@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional, List, Dict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, List, Dict
 import pandas as pd
 
 @dataclass
@@ -23,6 +23,14 @@ class AnalysisResult:
     reasoning: List[str]
     risk_profile: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-serializable form (metrics nested as a dict)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisResult":
+        return cls(**{**data, "metrics": AssetMetrics(**data["metrics"])})
+
 @dataclass
 class Watchlist:
     name: str
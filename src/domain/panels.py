@@ -0,0 +1,133 @@
+"""
+Typed Arrow export of full analysis panels.
+
+Two tables, written one ticker at a time with data.export.RecordBatchWriter:
+
+- series: one row per ticker and bar with the close and every indicator
+  series (RSI, SMA 20/50/200, Bollinger bands, return, drawdown)
+- metrics: one row per ticker with the raw AssetMetrics, score and
+  recommendation
+
+Columns are built straight from the numpy arrays behind the indicator
+series, so no universe-wide DataFrame is ever assembled. Indicator warm-up
+bars are NaN, as in the series themselves.
+"""
+import dataclasses
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from ..analysis.indicators import calculate_bollinger_bands, calculate_rsi, calculate_sma
+from ..analysis.metrics import calculate_daily_returns
+from ..data.export import RecordBatchWriter
+from .models import AnalysisResult, AssetMetrics
+
+SERIES_SCHEMA = pa.schema([
+    ("ticker", pa.string()),
+    ("period", pa.string()),
+    ("date", pa.timestamp("us")),
+    ("close", pa.float64()),
+    ("return", pa.float64()),
+    ("drawdown", pa.float64()),
+    ("rsi", pa.float64()),
+    ("sma_20", pa.float64()),
+    ("sma_50", pa.float64()),
+    ("sma_200", pa.float64()),
+    ("bb_upper", pa.float64()),
+    ("bb_middle", pa.float64()),
+    ("bb_lower", pa.float64()),
+])
+
+METRICS_SCHEMA = pa.schema(
+    [("ticker", pa.string()), ("period", pa.string()), ("as_of", pa.timestamp("us")), ("bars", pa.int64())]
+    + [(f.name, pa.float64()) for f in dataclasses.fields(AssetMetrics)]
+    + [("score", pa.float64()), ("recommendation", pa.string()), ("risk_profile", pa.string())]
+)
+
+
+def _dates(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert(None)  # UTC wall time
+    return index.values.astype("datetime64[us]")
+
+
+def _floats(series: pd.Series) -> pa.Array:
+    # float64 numpy -> Arrow without a copy (NaN kept as NaN, not null)
+    return pa.array(series.to_numpy(dtype=np.float64, copy=False), type=pa.float64())
+
+
+def series_batch(ticker: str, period: str, df: pd.DataFrame) -> pa.RecordBatch:
+    """Indicator series of one ticker as a SERIES_SCHEMA batch."""
+    close = df["Close"].astype(np.float64)
+    upper, middle, lower = calculate_bollinger_bands(close)
+    n = len(close)
+    columns = [
+        pa.array([ticker] * n, type=pa.string()),
+        pa.array([period] * n, type=pa.string()),
+        pa.array(_dates(df.index), type=pa.timestamp("us")),
+        _floats(close),
+        _floats(calculate_daily_returns(close)),
+        _floats(close / close.cummax() - 1),
+        _floats(calculate_rsi(close, 14)),
+        _floats(calculate_sma(close, 20)),
+        _floats(calculate_sma(close, 50)),
+        _floats(calculate_sma(close, 200)),
+        _floats(upper),
+        _floats(middle),
+        _floats(lower),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=SERIES_SCHEMA)
+
+
+def metrics_batch(period: str, rows: Iterable[Tuple[AnalysisResult, Optional[pd.DataFrame]]]) -> pa.RecordBatch:
+    """
+    Raw metrics of analyzed tickers as a METRICS_SCHEMA batch.
+
+    Args:
+        period: History period the results were computed on
+        rows: (result, price frame) pairs; the frame gives as_of and bars
+            and may be None
+    """
+    records = []
+    for result, df in rows:
+        has_bars = df is not None and len(df) > 0
+        records.append({
+            "ticker": result.ticker,
+            "period": period,
+            "as_of": pd.Timestamp(_dates(df.index[-1:])[0]) if has_bars else None,
+            "bars": len(df) if df is not None else 0,
+            **{k: float(v) for k, v in dataclasses.asdict(result.metrics).items()},
+            "score": float(result.score),
+            "recommendation": result.recommendation,
+            "risk_profile": result.risk_profile,
+        })
+    return pa.RecordBatch.from_pylist(records, schema=METRICS_SCHEMA)
+
+
+def write_panels(
+    series_sink,
+    metrics_sink,
+    period: str,
+    results: Iterable[AnalysisResult],
+    frames: Dict[str, pd.DataFrame],
+    fmt: str = "arrow",
+) -> int:
+    """
+    Write the series and metrics tables of analyzed tickers.
+
+    `results` can be a generator: each ticker's series is written before
+    the next one is built. Tickers without a price frame only get a metrics
+    row. Returns the number of series rows written.
+    """
+    with RecordBatchWriter(series_sink, SERIES_SCHEMA, fmt) as series, \
+            RecordBatchWriter(metrics_sink, METRICS_SCHEMA, fmt) as metrics:
+        for result in results:
+            df = frames.get(result.ticker)
+            if df is not None and len(df):
+                series.write(series_batch(result.ticker, period, df))
+            metrics.write(metrics_batch(period, [(result, df)]))
+        series.flush()
+        return series.rows_written
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..analysis.portfolio import MeanVarianceOptimizer, Portfolio
+from .screener import ScreenResult
+
+DEFAULT_TOP_N = 20
+DEFAULT_MAX_WEIGHT = 0.25
+
+
+@dataclass
+class PortfolioSet:
+    tickers: List[str]
+    min_variance: Portfolio
+    max_sharpe: Portfolio
+    frontier: List[Portfolio]
+
+
+def build_portfolios(
+    screen: ScreenResult,
+    top_n: int = DEFAULT_TOP_N,
+    max_weight: float = DEFAULT_MAX_WEIGHT,
+    risk_free_rate: float = 0.0,
+    n_points: int = 50,
+) -> Optional[PortfolioSet]:
+    """
+    Build the minimum-variance, max-Sharpe and frontier portfolios over the
+    top-ranked tickers of a screen.
+
+    Args:
+        screen: Output of run_screen (results already sorted by score)
+        top_n: Number of best-scored tickers to include
+        max_weight: Cap on any single weight; raised to 1/n when fewer
+            tickers are available than the cap allows
+        risk_free_rate: Annual rate used for the Sharpe ratio
+        n_points: Frontier resolution
+
+    Returns:
+        PortfolioSet, or None if there are not enough tickers or overlapping
+        history to estimate a covariance matrix
+    """
+    tickers = [r.ticker for r in screen.results if r.ticker in screen.price_data][:top_n]
+    if len(tickers) < 2:
+        return None
+
+    try:
+        optimizer = MeanVarianceOptimizer.from_prices(
+            screen.price_data, tickers,
+            max_weight=max(max_weight, 1.0 / len(tickers)),
+            risk_free_rate=risk_free_rate,
+        )
+    except ValueError as e:
+        print(f"Error building portfolios: {e}")
+        return None
+
+    frontier = optimizer.efficient_frontier(n_points)
+    return PortfolioSet(
+        tickers=tickers,
+        min_variance=optimizer.min_variance(),
+        max_sharpe=optimizer.max_sharpe(grid_points=n_points),  # same grid as the frontier
+        frontier=frontier,
+    )
@@ -0,0 +1,298 @@
+"""
+Background refresher for saved watchlists, with signal alerts.
+
+Every run:
+1. one cache query gives the age of every watched ticker; those older than
+   `max_age` are downloaded again, stalest first, in multi-symbol batches
+   of `batch_size`, each batch charged once to a RequestBudget
+2. tickers whose data version matches their stored signal state are done,
+   without reading their bars
+3. the others are fingerprinted; a download that brought no new bars only
+   updates the stored version, the rest are analyzed
+4. each new state is compared with the stored one, and an alert is raised
+   when the recommendation flips, SMA 50/200 cross over, or RSI crosses
+   the oversold/overbought levels
+
+    python -m src.domain.refresher --interval 300 --max-age 15
+
+With the defaults (batches of 100, 600 downloads per hour) up to 60,000
+tickers an hour can be refreshed: a 2,000-symbol watch set kept within the
+15-minute max age takes 8,000 tickers, i.e. 80 downloads, an hour.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from ..core import telemetry
+from ..data.alerts import AlertStore, SignalAlert, SignalState
+from ..data.warmup import RequestBudget
+from ..data.watchlists import WatchlistStore
+from .models import AnalysisResult
+from .screener import bars_fingerprint, fetch_history
+from .signals import RSI_OVERBOUGHT, RSI_OVERSOLD, SignalEngine
+
+DEFAULT_INTERVAL_SECONDS = 300
+DEFAULT_MAX_AGE_MINUTES = 15
+DEFAULT_BUDGET_PER_HOUR = 600  # download calls, each of up to DEFAULT_BATCH_SIZE tickers
+DEFAULT_BATCH_SIZE = 100
+
+
+def signal_state(result: AnalysisResult, bars_key: str, data_version: Optional[str] = None) -> SignalState:
+    m = result.metrics
+    if m.sma_50 and m.sma_200:
+        trend = "golden" if m.sma_50 > m.sma_200 else "death" if m.sma_50 < m.sma_200 else "none"
+    else:
+        trend = "none"  # not enough history for SMA 200
+    if m.rsi < RSI_OVERSOLD:
+        rsi_zone = "oversold"
+    elif m.rsi > RSI_OVERBOUGHT:
+        rsi_zone = "overbought"
+    else:
+        rsi_zone = "neutral"
+    return SignalState(result.recommendation, trend, rsi_zone, float(m.rsi), bars_key, data_version)
+
+
+def detect_changes(ticker: str, period: str, previous: SignalState, current: SignalState) -> List[SignalAlert]:
+    """Alerts for what differs between two states of the same ticker."""
+    alerts = []
+    if current.recommendation != previous.recommendation:
+        alerts.append(SignalAlert(ticker, period, "recommendation", previous.recommendation, current.recommendation,
+                                  f"{ticker}: {previous.recommendation} -> {current.recommendation}"))
+    if current.trend != previous.trend and current.trend != "none":
+        cross = "Golden Cross (SMA 50 above SMA 200)" if current.trend == "golden" else "Death Cross (SMA 50 below SMA 200)"
+        alerts.append(SignalAlert(ticker, period, "trend", previous.trend, current.trend, f"{ticker}: {cross}"))
+    if current.rsi_zone != previous.rsi_zone:
+        if current.rsi_zone == "neutral":
+            level = RSI_OVERSOLD if previous.rsi_zone == "oversold" else RSI_OVERBOUGHT
+            text = f"RSI back through {level} ({current.rsi:.1f})"
+        else:
+            level = RSI_OVERSOLD if current.rsi_zone == "oversold" else RSI_OVERBOUGHT
+            text = f"RSI {current.rsi_zone} ({current.rsi:.1f}, crossed {level})"
+        alerts.append(SignalAlert(ticker, period, "rsi", previous.rsi_zone, current.rsi_zone, f"{ticker}: {text}"))
+    return alerts
+
+
+@dataclass
+class RefreshReport:
+    checked: int = 0
+    downloaded: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    deferred: List[str] = field(default_factory=list)  # due, but over budget
+    analyzed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)  # new version, same bars
+    alerts: List[SignalAlert] = field(default_factory=list)
+
+
+class WatchlistRefresher:
+    """
+    Keeps saved watchlists up to date and raises alerts on signal changes.
+
+    Args:
+        loader: DataLoader (needs cache, refresh_many, data_versions and get_ticker_history)
+        engine: SignalEngine used to re-score changed tickers
+        watchlists: WatchlistStore with the watchlists to follow
+        alerts: AlertStore holding the signal state and the alerts
+        names: Watchlists to follow (default: every saved one)
+        period: History period analyzed
+        risk_profile: Profile the tickers are analyzed with; use the one
+            the watchlists are screened with
+        max_age_minutes: Cached data older than this is downloaded again
+        budget: Upstream request budget shared by every run, charged
+            once per download batch
+        batch_size: Tickers downloaded together in one request
+        interval_seconds: Pause between runs of the background thread
+        alert_callback: Optional callable(SignalAlert) per new alert
+    """
+
+    def __init__(
+        self,
+        loader,
+        engine: SignalEngine,
+        watchlists: WatchlistStore,
+        alerts: AlertStore,
+        names: Optional[List[str]] = None,
+        period: str = "1y",
+        risk_profile: str = "Moderate",
+        max_age_minutes: float = DEFAULT_MAX_AGE_MINUTES,
+        budget: Optional[RequestBudget] = None,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        alert_callback: Optional[Callable[[SignalAlert], None]] = None,
+    ):
+        self.loader = loader
+        self.engine = engine
+        self.watchlists = watchlists
+        self.alerts = alerts
+        self.names = names
+        if risk_profile not in SignalEngine.RISK_PROFILES:
+            raise ValueError(f"Unknown risk profile '{risk_profile}'")
+        self.period = period
+        self.risk_profile = risk_profile
+        self.max_age = timedelta(minutes=max_age_minutes)
+        self.budget = budget or RequestBudget(DEFAULT_BUDGET_PER_HOUR)
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.alert_callback = alert_callback
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watched(self) -> Dict[str, List[str]]:
+        """Ticker -> names of the followed watchlists that contain it."""
+        tickers: Dict[str, List[str]] = {}
+        for name in self.names if self.names is not None else self.watchlists.list_names():
+            watchlist = self.watchlists.get(name)
+            for ticker in watchlist.tickers if watchlist else []:
+                tickers.setdefault(ticker, []).append(name)
+        return tickers
+
+    def _download_due(self, tickers: List[str], report: RefreshReport):
+        now = datetime.now()
+        updated = self.loader.cache.get_updated_at_many(tickers, self.period)
+        due = [t for t in tickers if updated[t] is None or now - updated[t] >= self.max_age]
+        # Stalest first (never downloaded before anything else), so tickers
+        # deferred for lack of budget are the first served by the next run
+        due.sort(key=lambda t: updated[t] or datetime.min)
+        # One request per batch; batches run one after another since
+        # concurrent yf.download calls share yfinance's module state
+        for i in range(0, len(due), self.batch_size):
+            batch = due[i:i + self.batch_size]
+            if not self.budget.try_acquire():
+                report.deferred.extend(due[i:])
+                break
+            for ticker, ok in self.loader.refresh_many(batch, self.period).items():
+                (report.downloaded if ok else report.failed).append(ticker)
+
+    def run_once(self) -> RefreshReport:
+        watched = self.watched()
+        tickers = list(watched)
+        report = RefreshReport(checked=len(tickers))
+        if not tickers:
+            return report
+
+        self._download_due(tickers, report)
+        versions = self.loader.data_versions(tickers, self.period)
+        states = self.alerts.load_states(tickers, self.period)
+
+        new_states: Dict[str, SignalState] = {}
+        for ticker in tickers:
+            version = versions.get(ticker)
+            previous = states.get(ticker)
+            if version is None or (previous is not None and previous.data_version == version):
+                continue
+            df = fetch_history(self.loader, ticker, self.period)
+            if df is None:
+                continue
+            bars_key = bars_fingerprint(df)
+            if previous is not None and previous.bars_key == bars_key:
+                new_states[ticker] = replace(previous, data_version=version)
+                report.unchanged.append(ticker)
+                continue
+
+            try:
+                result = self.engine.analyze_ticker(ticker, df, self.risk_profile)
+            except Exception as e:
+                print(f"Error analyzing {ticker}: {e}")
+                continue
+            state = signal_state(result, bars_key, version)
+            new_states[ticker] = state
+            report.analyzed.append(ticker)
+            if previous is not None:
+                for alert in detect_changes(ticker, self.period, previous, state):
+                    alert.watchlists = watched[ticker]
+                    report.alerts.append(alert)
+
+        if new_states:
+            self.alerts.save(self.period, new_states, report.alerts)
+        telemetry.inc("refresher_analyzed_total", len(report.analyzed))
+        telemetry.inc("refresher_alerts_total", len(report.alerts))
+        if self.alert_callback:
+            for alert in report.alerts:
+                self.alert_callback(alert)
+        return report
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Watchlist refresh failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        """Refresh in a background daemon thread until stop()."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="watchlist-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def refresher_from_env(loader, engine: SignalEngine, watchlists: WatchlistStore,
+                       alerts: AlertStore) -> Optional[WatchlistRefresher]:
+    """
+    Refresher configured from FINANCELAB_REFRESHER* variables, or None when
+    FINANCELAB_REFRESHER is off.
+    """
+    if os.getenv("FINANCELAB_REFRESHER", "0").lower() not in ("1", "true", "yes"):
+        return None
+    names = [n.strip() for n in os.getenv("FINANCELAB_REFRESHER_WATCHLISTS", "").split(",") if n.strip()]
+    return WatchlistRefresher(
+        loader, engine, watchlists, alerts,
+        names=names or None,
+        risk_profile=os.getenv("FINANCELAB_REFRESHER_RISK_PROFILE", "Moderate"),
+        max_age_minutes=float(os.getenv("FINANCELAB_REFRESHER_MAX_AGE", DEFAULT_MAX_AGE_MINUTES)),
+        budget=RequestBudget(int(os.getenv("FINANCELAB_REFRESHER_BUDGET", DEFAULT_BUDGET_PER_HOUR))),
+        batch_size=int(os.getenv("FINANCELAB_REFRESHER_BATCH", DEFAULT_BATCH_SIZE)),
+        interval_seconds=float(os.getenv("FINANCELAB_REFRESHER_INTERVAL", DEFAULT_INTERVAL_SECONDS)),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Refresh saved watchlists and print signal alerts")
+    parser.add_argument("--watchlist", nargs="+", default=None, help="Watchlists to follow (default: all saved)")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--risk-profile", default="Moderate", choices=list(SignalEngine.RISK_PROFILES))
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_SECONDS, help="Seconds between runs")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE_MINUTES,
+                        help="Minutes before cached data is downloaded again")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_PER_HOUR, help="Upstream requests per hour")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Tickers per download request")
+    parser.add_argument("--once", action="store_true", help="Run a single refresh and exit")
+    args = parser.parse_args(argv)
+
+    from ..data.loader import DataLoader
+    loader = DataLoader()
+    refresher = WatchlistRefresher(
+        loader, SignalEngine(),
+        WatchlistStore(db_path=loader.cache.db_path), AlertStore(db_path=loader.cache.db_path),
+        names=args.watchlist, period=args.period, risk_profile=args.risk_profile, max_age_minutes=args.max_age,
+        budget=RequestBudget(args.budget), batch_size=args.batch_size, interval_seconds=args.interval,
+        alert_callback=lambda alert: print(f"[{alert.created_at:%H:%M:%S}] {alert.message}"),
+    )
+
+    def summary(report: RefreshReport) -> str:
+        return (f"{report.checked} tickers: {len(report.downloaded)} downloaded, {len(report.analyzed)} analyzed, "
+                f"{len(report.alerts)} alert(s), {len(report.deferred)} deferred, {len(report.failed)} failed")
+
+    if args.once:
+        print(summary(refresher.run_once()))
+        return 0
+    try:
+        while True:
+            print(summary(refresher.run_once()))
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+import pandas as pd
+from .models import AnalysisResult
+from .signals import SignalEngine
+
+# Fetching is network bound, analysis is CPU bound; size the pools accordingly
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_ANALYSIS_WORKERS = 4
+
+
+@dataclass
+class ScreenResult:
+    results: List[AnalysisResult]  # Sorted by score, best first
+    price_data: Dict[str, pd.DataFrame]
+    failed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ScreenEvent:
+    """Outcome for a single ticker, emitted as soon as it is known."""
+    ticker: str
+    result: Optional[AnalysisResult] = None
+    df: Optional[pd.DataFrame] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None
+
+
+def fetch_history(loader, ticker: str, period: str, timeframe: str = "1d") -> Optional[pd.DataFrame]:
+    """Fetch a ticker's history, treating errors and empty frames as a miss."""
+    try:
+        if timeframe == "1d":
+            df = loader.get_ticker_history(ticker, period)
+        else:
+            df = loader.get_bars(ticker, timeframe, period)
+    except Exception as e:
+        print(f"Error fetching {ticker}: {e}")
+        return None
+    if df is None or df.empty:
+        return None
+    return df
+
+
+def bars_fingerprint(df: pd.DataFrame) -> str:
+    """Changes when a bar is added or the last (possibly partial) bar moves."""
+    return f"{len(df)}:{df.index[-1].isoformat()}:{float(df['Close'].iloc[-1])!r}"
+
+
+def _analyze(engine: SignalEngine, ticker: str, df: pd.DataFrame, risk_profile: str,
+             timeframe: str = "1d") -> Optional[AnalysisResult]:
+    try:
+        return engine.analyze_ticker(ticker, df, risk_profile, timeframe=timeframe)
+    except Exception as e:
+        print(f"Error analyzing {ticker}: {e}")
+        return None
+
+
+def iter_screen(
+    loader,
+    engine: SignalEngine,
+    tickers: List[str],
+    period: str,
+    risk_profile: str,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    analysis_workers: int = DEFAULT_ANALYSIS_WORKERS,
+    timeframe: str = "1d",
+    thread_initializer: Optional[Callable[[], None]] = None,
+) -> Iterator[ScreenEvent]:
+    """
+    Pipelined screen: concurrent fetches feed concurrent analysis.
+
+    Events are yielded in completion order, so the first result is available
+    after a single fetch and a slow or failing ticker never holds back the rest.
+    Closing the generator early cancels the work that has not started yet.
+    `thread_initializer` runs once in every worker thread (e.g. a
+    ProfileReport's, to profile the pools).
+    """
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="screen-fetch",
+                                    initializer=thread_initializer)
+    analysis_pool = ThreadPoolExecutor(max_workers=analysis_workers, thread_name_prefix="screen-analyze",
+                                       initializer=thread_initializer)
+    try:
+        # future -> (stage, ticker, df)
+        pending: Dict = {}
+        for ticker in dict.fromkeys(tickers):
+            pending[fetch_pool.submit(fetch_history, loader, ticker, period, timeframe)] = ("fetch", ticker, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, ticker, df = pending.pop(future)
+                if stage == "fetch":
+                    df = future.result()
+                    if df is None:
+                        yield ScreenEvent(ticker)
+                    else:
+                        job = analysis_pool.submit(_analyze, engine, ticker, df, risk_profile, timeframe)
+                        pending[job] = ("analyze", ticker, df)
+                else:
+                    result = future.result()
+                    yield ScreenEvent(ticker, result, df if result is not None else None)
+    finally:
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+        analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def rank_results(results: List[AnalysisResult], tickers: List[str]) -> List[AnalysisResult]:
+    """Sort by score desc; ties keep the watchlist order so output is deterministic."""
+    position = {t: i for i, t in enumerate(tickers)}
+    return sorted(results, key=lambda r: (-r.score, position.get(r.ticker, len(position))))
+
+
+def run_screen(
+    loader,
+    engine: SignalEngine,
+    tickers: List[str],
+    period: str,
+    risk_profile: str,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    event_callback: Optional[Callable[[ScreenEvent], None]] = None,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    analysis_workers: int = DEFAULT_ANALYSIS_WORKERS,
+    timeframe: str = "1d",
+    thread_initializer: Optional[Callable[[], None]] = None,
+) -> ScreenResult:
+    """
+    Fetch and analyze a list of tickers, ranking them by score.
+
+    Args:
+        loader: DataLoader (or anything exposing get_ticker_history)
+        engine: SignalEngine used to score each ticker
+        tickers: Symbols to screen
+        period: valid yfinance period
+        risk_profile: one of SignalEngine.RISK_PROFILES
+        progress_callback: optional callable(done, total) invoked after each ticker
+        event_callback: optional callable(ScreenEvent) invoked as each ticker completes
+        fetch_workers: concurrent fetches
+        analysis_workers: concurrent analyses
+        timeframe: bar size to analyze (see analysis.resample.TIMEFRAMES);
+            anything but "1d" needs a loader with get_bars
+        thread_initializer: optional callable run once in every worker thread
+
+    Returns:
+        ScreenResult with ranked results, the price data used and failed tickers
+    """
+    results: List[AnalysisResult] = []
+    price_data: Dict[str, pd.DataFrame] = {}
+    failed: List[str] = []
+    total = len(dict.fromkeys(tickers))
+
+    events = iter_screen(loader, engine, tickers, period, risk_profile, fetch_workers, analysis_workers, timeframe,
+                         thread_initializer)
+    for i, event in enumerate(events):
+        if event.ok:
+            results.append(event.result)
+            price_data[event.ticker] = event.df
+        else:
+            failed.append(event.ticker)
+
+        if event_callback:
+            event_callback(event)
+        if progress_callback:
+            progress_callback(i + 1, total)
+
+    # Report failures in watchlist order
+    order = {t: i for i, t in enumerate(tickers)}
+    failed.sort(key=order.get)
+    return ScreenResult(results=rank_results(results, tickers), price_data=price_data, failed=failed)
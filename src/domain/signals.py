@@ -1,13 +1,20 @@
 from typing import List, Dict
+from dataclasses import replace
 import pandas as pd
 import numpy as np
 from .models import AnalysisResult, AssetMetrics
+from ..core import telemetry
 from ..analysis.indicators import calculate_rsi, calculate_sma
+from ..analysis.resample import BARS_PER_YEAR
 from ..analysis.metrics import (
     calculate_daily_returns, calculate_cumulative_return, 
     calculate_volatility, calculate_max_drawdown
 )
 
+# RSI levels that trigger the momentum signals
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
 class SignalEngine:
     RISK_PROFILES = {
         "Conservative": {"risk_penalty": 2.0, "momentum_weight": 0.5, "trend_weight": 1.0},
@@ -15,44 +22,55 @@ class SignalEngine:
         "Aggressive": {"risk_penalty": 0.5, "momentum_weight": 1.5, "trend_weight": 1.2},
     }
 
-    def analyze_ticker(self, ticker: str, df: pd.DataFrame, risk_profile: str) -> AnalysisResult:
+    def analyze_ticker(self, ticker: str, df: pd.DataFrame, risk_profile: str, timeframe: str = "1d") -> AnalysisResult:
+        """
+        Indicators, signals and score of one ticker's bars.
+
+        Works on any timeframe: windows are counted in bars (SMA 50 on hourly
+        bars is 50 hours), and volatility is annualized for the bar size.
+        """
         if df.empty or len(df) < 50:
             # Not enough data
             return self._empty_result(ticker, risk_profile)
 
         # 1. Calculate Indicators
-        prices = df['Close']
-        rsi = calculate_rsi(prices, 14)
-        sma20 = calculate_sma(prices, 20)
-        sma50 = calculate_sma(prices, 50)
-        sma200 = calculate_sma(prices, 200)
+        with telemetry.span("engine_stage_seconds", stage="indicators"):
+            prices = df['Close']
+            rsi = calculate_rsi(prices, 14)
+            sma20 = calculate_sma(prices, 20)
+            sma50 = calculate_sma(prices, 50)
+            sma200 = calculate_sma(prices, 200)
         
         # 2. Calculate Metrics
-        daily_rets = calculate_daily_returns(prices)
-        vol = calculate_volatility(daily_rets)
-        mdd = calculate_max_drawdown(prices)
-        total_ret = calculate_cumulative_return(prices)
-        
-        current_price = prices.iloc[-1]
-        current_rsi = rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
-        
-        metrics = AssetMetrics(
-            current_price=current_price,
-            daily_return=daily_rets.iloc[-1] if len(daily_rets) > 0 else 0.0,
-            total_return=total_ret,
-            volatility=vol,
-            max_drawdown=mdd,
-            rsi=current_rsi,
-            sma_20=sma20.iloc[-1] if not pd.isna(sma20.iloc[-1]) else 0.0,
-            sma_50=sma50.iloc[-1] if not pd.isna(sma50.iloc[-1]) else 0.0,
-            sma_200=sma200.iloc[-1] if not pd.isna(sma200.iloc[-1]) else 0.0,
-        )
+        with telemetry.span("engine_stage_seconds", stage="metrics"):
+            daily_rets = calculate_daily_returns(prices)
+            vol = calculate_volatility(daily_rets, periods_per_year=BARS_PER_YEAR[timeframe])
+            mdd = calculate_max_drawdown(prices)
+            total_ret = calculate_cumulative_return(prices)
+            
+            current_price = prices.iloc[-1]
+            current_rsi = rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
+            
+            metrics = AssetMetrics(
+                current_price=current_price,
+                daily_return=daily_rets.iloc[-1] if len(daily_rets) > 0 else 0.0,
+                total_return=total_ret,
+                volatility=vol,
+                max_drawdown=mdd,
+                rsi=current_rsi,
+                sma_20=sma20.iloc[-1] if not pd.isna(sma20.iloc[-1]) else 0.0,
+                sma_50=sma50.iloc[-1] if not pd.isna(sma50.iloc[-1]) else 0.0,
+                sma_200=sma200.iloc[-1] if not pd.isna(sma200.iloc[-1]) else 0.0,
+            )
 
         # 3. Generate Signals
-        rec, reasoning = self._generate_recommendation(prices, rsi, sma50, sma200)
+        with telemetry.span("engine_stage_seconds", stage="signals"):
+            rec, reasoning = self._generate_recommendation(prices, rsi, sma50, sma200)
         
         # 4. Calculate Score
-        score = self._calculate_score(metrics, risk_profile)
+        with telemetry.span("engine_stage_seconds", stage="score"):
+            score = self._calculate_score(metrics, risk_profile)
+        telemetry.inc("engine_analyses_total")
 
         return AnalysisResult(
             ticker=ticker,
@@ -63,6 +81,19 @@ class SignalEngine:
             risk_profile=risk_profile
         )
 
+    def rescore(self, result: AnalysisResult, risk_profile: str) -> AnalysisResult:
+        """
+        Re-score an existing result for another risk profile.
+        Indicators and signals don't depend on the profile, only the score does.
+        """
+        if result.recommendation == "N/A":
+            return replace(result, risk_profile=risk_profile)
+        return replace(
+            result,
+            score=self._calculate_score(result.metrics, risk_profile),
+            risk_profile=risk_profile
+        )
+
     def _generate_recommendation(self, prices, rsi, sma50, sma200):
         signals = []
         score = 0
@@ -88,10 +119,10 @@ class SignalEngine:
             score -= 1
             
         # Momentum Signals
-        if curr_rsi < 30:
+        if curr_rsi < RSI_OVERSOLD:
             signals.append(f"RSI Oversold ({curr_rsi:.1f}) -> Potential Buy")
             score += 2
-        elif curr_rsi > 70:
+        elif curr_rsi > RSI_OVERBOUGHT:
             signals.append(f"RSI Overbought ({curr_rsi:.1f}) -> Potential Sell")
             score -= 2
         else:
@@ -134,8 +165,8 @@ class SignalEngine:
         # Actually for a "rating", usually Up Trend = High Score.
         # But RSI Oversold (30) is buy signal. So let's align Score with "Good to Buy".
         momentum_score = 50
-        if metrics.rsi < 30: momentum_score = 90
-        elif metrics.rsi > 70: momentum_score = 20
+        if metrics.rsi < RSI_OVERSOLD: momentum_score = 90
+        elif metrics.rsi > RSI_OVERBOUGHT: momentum_score = 20
         else: momentum_score = 50 + (50 - metrics.rsi) # e.g. 50 -> 50, 40 -> 60, 60 -> 40
         
         # Composite
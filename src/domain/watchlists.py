@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from ..data.watchlists import WatchlistSnapshot, WatchlistStore
+from .models import AnalysisResult, Watchlist
+from .screener import (
+    DEFAULT_FETCH_WORKERS, ScreenEvent, ScreenResult, bars_fingerprint, fetch_history, rank_results, run_screen,
+)
+from .signals import SignalEngine
+
+
+@dataclass
+class WatchlistRefresh:
+    screen: ScreenResult
+    snapshot: Optional[WatchlistSnapshot]  # the stored snapshot after the refresh
+    reused: List[str]
+    recomputed: List[str]
+
+
+def _reusable_results(snapshot: WatchlistSnapshot, frames: Dict[str, Optional[pd.DataFrame]],
+                      versions: Dict[str, Optional[str]]) -> Dict[str, AnalysisResult]:
+    """
+    Snapshot results whose ticker's bars are unchanged: same bars fingerprint,
+    whatever the data version (a re-download of identical bars, an expired
+    cache entry). Snapshots without fingerprints compare data versions.
+    """
+    by_ticker = {r.ticker: r for r in snapshot.results}
+    reusable = {}
+    for ticker, df in frames.items():
+        fingerprint = snapshot.fingerprints.get(ticker)
+        if fingerprint is not None and df is not None:
+            unchanged = bars_fingerprint(df) == fingerprint
+        else:
+            unchanged = versions.get(ticker) is not None and snapshot.versions.get(ticker) == versions[ticker]
+        if unchanged:
+            reusable[ticker] = by_ticker[ticker]
+    return reusable
+
+
+def refresh_watchlist(
+    store: WatchlistStore,
+    loader,
+    engine: SignalEngine,
+    watchlist: Watchlist,
+    period: str,
+    risk_profile: str,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    event_callback: Optional[Callable[[ScreenEvent], None]] = None,
+    thread_initializer: Optional[Callable[[], None]] = None,
+) -> WatchlistRefresh:
+    """
+    Bring a watchlist's snapshot up to date.
+
+    Results whose underlying bars are unchanged (same bars fingerprint as
+    when the snapshot was taken) are reused; only the other tickers are
+    analyzed. A new snapshot is stored only when something was
+    recomputed. Reused tickers are reported through the callbacks first, so
+    callers can render them immediately.
+
+    Args:
+        store: WatchlistStore holding the snapshots
+        loader: DataLoader (needs get_ticker_history and data_versions)
+        engine: SignalEngine used for stale tickers
+        watchlist: Watchlist to refresh
+        period: valid yfinance period
+        risk_profile: one of SignalEngine.RISK_PROFILES
+        progress_callback: optional callable(done, total)
+        event_callback: optional callable(ScreenEvent) per ticker
+        thread_initializer: optional callable run once in every worker thread
+
+    Returns:
+        WatchlistRefresh with the combined ranking and what was reused
+    """
+    tickers = list(dict.fromkeys(watchlist.tickers))
+    total = len(tickers)
+    previous = store.latest_snapshot(watchlist.name, period, risk_profile)
+    known = [t for t in tickers if previous is not None and t in previous.versions]
+
+    # Tickers of the last snapshot need their bars to be fingerprinted, and
+    # for the charts if reused; fetched together
+    with ThreadPoolExecutor(max_workers=DEFAULT_FETCH_WORKERS, thread_name_prefix="watchlist-fetch",
+                            initializer=thread_initializer) as pool:
+        frames = dict(zip(known, pool.map(lambda t: fetch_history(loader, t, period), known)))
+    reusable = _reusable_results(previous, frames, loader.data_versions(known, period)) if known else {}
+
+    price_data = {}
+    done = 0
+    for ticker, result in reusable.items():
+        df = frames[ticker]
+        if df is not None:
+            price_data[ticker] = df
+        done += 1
+        if event_callback:
+            event_callback(ScreenEvent(ticker=ticker, result=result, df=df))
+        if progress_callback:
+            progress_callback(done, total)
+
+    stale = [t for t in tickers if t not in reusable]
+    fresh = ScreenResult(results=[], price_data={})
+    if stale:
+        fresh = run_screen(
+            loader, engine, stale, period, risk_profile,
+            progress_callback=(lambda n, _total: progress_callback(done + n, total)) if progress_callback else None,
+            event_callback=event_callback,
+            thread_initializer=thread_initializer,
+        )
+        price_data.update(fresh.price_data)
+
+    screen = ScreenResult(
+        results=rank_results(list(reusable.values()) + fresh.results, tickers),
+        price_data=price_data,
+        failed=fresh.failed,
+    )
+
+    snapshot = previous
+    if stale:
+        snapshot = WatchlistSnapshot(
+            name=watchlist.name,
+            period=period,
+            risk_profile=risk_profile,
+            created_at=datetime.now(),
+            results=screen.results,
+            versions=loader.data_versions([r.ticker for r in screen.results], period),
+            failed=screen.failed,
+            fingerprints={t: bars_fingerprint(df) for t, df in price_data.items()},
+        )
+        store.save_snapshot(snapshot)
+
+    return WatchlistRefresh(screen=screen, snapshot=snapshot, reused=list(reusable), recomputed=stale)
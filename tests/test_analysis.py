@@ -1,9 +1,14 @@
 import pytest
+import time
 import pandas as pd
 import numpy as np
+from unittest.mock import MagicMock
 from src.analysis.indicators import calculate_rsi, calculate_sma
 from src.analysis.metrics import calculate_daily_returns, calculate_max_drawdown
+from src.analysis.sampling import lttb_indices, minmax_indices
+from src.analysis.resample import TIMEFRAMES, resample_bars, resample_ohlc
 from src.domain.signals import SignalEngine
+from src.domain.screener import run_screen, iter_screen
 
 def test_rsi_calculation():
     # Simple pattern to test RSI
@@ -44,3 +49,203 @@ def test_signal_engine_scoring():
     assert result.ticker == "TEST"
     assert result.score > 50 # Application of positive trend
     assert result.recommendation in ["Buy", "Hold"] # Should likely be Buy or Hold
+
+def test_run_screen_ranks_and_reports_failures():
+    dates = pd.date_range("2023-01-01", periods=200)
+    frames = {
+        "UP": pd.DataFrame({"Close": [100 + i for i in range(200)]}, index=dates),
+        "DOWN": pd.DataFrame({"Close": [300 - i for i in range(200)]}, index=dates),
+    }
+    loader = MagicMock()
+    loader.get_ticker_history.side_effect = lambda ticker, period: frames.get(ticker)
+
+    screen = run_screen(loader, SignalEngine(), ["DOWN", "MISSING", "UP"], "1y", "Moderate")
+
+    assert [r.ticker for r in screen.results] == ["UP", "DOWN"]
+    assert screen.failed == ["MISSING"]
+    assert set(screen.price_data) == {"UP", "DOWN"}
+
+def test_iter_screen_streams_in_completion_order():
+    dates = pd.date_range("2023-01-01", periods=200)
+    df = pd.DataFrame({"Close": [100 + i for i in range(200)]}, index=dates)
+
+    def fetch(ticker, period):
+        if ticker == "SLOW":
+            time.sleep(0.3)
+        return df
+
+    loader = MagicMock()
+    loader.get_ticker_history.side_effect = fetch
+
+    events = list(iter_screen(loader, SignalEngine(), ["SLOW", "A", "B"], "1y", "Moderate"))
+
+    # The slow ticker must not hold back the others
+    assert [e.ticker for e in events][-1] == "SLOW"
+    assert all(e.ok for e in events)
+
+def test_downsampling_keeps_endpoints_and_extremes():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50.0)
+    y[500] = 5.0  # Spike must survive
+
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+
+    mm = minmax_indices(y, 100)
+    assert 500 in mm
+    assert np.all(np.diff(mm) > 0)
+
+def test_resample_ohlc_weekly():
+    dates = pd.bdate_range("2024-01-01", periods=10)  # Two full weeks
+    df = pd.DataFrame({
+        "Open": np.arange(10.0), "High": np.arange(10.0) + 1,
+        "Low": np.arange(10.0) - 1, "Close": np.arange(10.0) + 0.5,
+        "Volume": np.ones(10),
+    }, index=dates)
+
+    weekly = resample_ohlc(df, "W-FRI")
+    assert len(weekly) == 2
+    assert weekly["Open"].tolist() == [0.0, 5.0]
+    assert weekly["High"].tolist() == [5.0, 10.0]
+    assert weekly["Low"].tolist() == [-1.0, 4.0]
+    assert weekly["Close"].tolist() == [4.5, 9.5]
+    assert weekly["Volume"].tolist() == [5.0, 5.0]
+
+def test_resample_bars_matches_pandas():
+    # Two weeks of 5m sessions, including a weekend
+    days = pd.date_range("2024-01-01", periods=14)
+    index = pd.DatetimeIndex(np.concatenate([
+        d + pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(np.arange(78) * 5, unit="min") for d in days
+    ]))
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    df = pd.DataFrame({
+        "Open": close, "High": close * 1.001, "Low": close * 0.999, "Close": close,
+        "Volume": rng.integers(1, 1000, len(index)).astype(float),
+    }, index=index)
+
+    for timeframe in ("15m", "1h", "1d", "1wk", "1mo"):
+        expected = resample_ohlc(df, TIMEFRAMES[timeframe])
+        pd.testing.assert_frame_equal(resample_bars(df, timeframe), expected, check_freq=False)
+
+    hourly = resample_bars(df, "1h")
+    assert hourly.index[0] == pd.Timestamp("2024-01-01 09:00")
+    assert len(hourly) == 14 * 7  # empty night hours produce no bars
+
+    # Annualized volatility doesn't depend on the bar size
+    engine = SignalEngine()
+    daily = engine.analyze_ticker("T", resample_bars(df, "1d"), "Moderate")
+    intraday = engine.analyze_ticker("T", resample_bars(df, "15m"), "Moderate", timeframe="15m")
+    assert intraday.metrics.volatility == pytest.approx(0.001 * (78 * 252) ** 0.5, rel=0.1)
+    assert daily.recommendation == "N/A"  # 14 daily bars are too few
+
+def test_portfolio_frontier_respects_constraints():
+    from src.analysis.portfolio import MeanVarianceOptimizer, _slsqp
+
+    rng = np.random.default_rng(7)
+    returns = pd.DataFrame(rng.normal(0.0004, 0.015, (500, 12)), columns=[f"A{i}" for i in range(12)])
+    opt = MeanVarianceOptimizer(returns, max_weight=0.2)
+    frontier = opt.efficient_frontier(10)
+
+    for p in frontier:
+        assert p.weights.sum() == pytest.approx(1.0)
+        assert p.weights.min() >= 0 and p.weights.max() <= 0.2 + 1e-9
+    rets = [p.expected_return for p in frontier]
+    vols = [p.volatility for p in frontier]
+    assert np.all(np.diff(rets) > 0) and np.all(np.diff(vols) >= -1e-12)
+
+    # Same minimum variance as a general-purpose solver
+    cov = opt.covariance.to_numpy()
+    ref = _slsqp(cov, np.ones((1, 12)), np.ones(1), 0.2, np.full(12, 1 / 12))
+    assert opt.min_variance().volatility == pytest.approx(np.sqrt(ref @ cov @ ref), rel=1e-6)
+    assert opt.max_sharpe(grid_points=10).sharpe >= max(p.sharpe for p in frontier) - 1e-9
+    assert sorted(opt._frontiers) == [10]  # the frontier's grid was reused
+    assert opt.max_sharpe(grid_points=4).sharpe >= max(p.sharpe for p in frontier) - 1e-6
+    assert sorted(opt._frontiers) == [4, 10]  # a different grid is honored
+
+def test_simulation_is_reproducible_and_chunked():
+    from src.analysis.simulation import simulate_returns
+
+    rng = np.random.default_rng(3)
+    returns = pd.DataFrame(rng.normal(0.0005, 0.01, (300, 3)), columns=["A", "B", "C"])
+    kwargs = dict(n_paths=5000, horizon=20, chunk_size=700, seed=11, keep_paths=10)
+
+    one = simulate_returns(returns, **kwargs, workers=1)
+    many = simulate_returns(returns, **kwargs, workers=4)
+    assert np.array_equal(one.terminal_returns, many.terminal_returns)
+    assert np.array_equal(one.max_drawdowns, many.max_drawdowns)
+
+    assert one.terminal_returns.shape == (5000,)
+    assert one.sample_paths.shape == (10, 21) and np.all(one.sample_paths[:, 0] == 1.0)
+    assert np.all(one.max_drawdowns <= 0)
+    assert one.cvar[0.99] >= one.var[0.99] >= one.var[0.95]
+    # Path values are consistent with the reduced terminal returns
+    assert np.allclose(one.sample_paths[:, -1] - 1, one.terminal_returns[:10])
+
+    with pytest.raises(ValueError):
+        simulate_returns(returns, method="garch")
+
+def test_simulation_draws_correlated_asset_paths():
+    from src.analysis.simulation import simulate_returns
+
+    rng = np.random.default_rng(5)
+    cov = np.array([[1.0, 0.8], [0.8, 1.0]]) * 0.01 ** 2
+    returns = pd.DataFrame(np.expm1(rng.multivariate_normal([0.0005, 0.0002], cov, 2000)), columns=["A", "B"])
+
+    result = simulate_returns(returns, weights=[0.75, 0.25], n_paths=20000, horizon=1, method="normal", seed=1)
+    assert result.assets == ["A", "B"] and result.asset_terminal_returns.shape == (20000, 2)
+    corr = np.corrcoef(np.log1p(result.asset_terminal_returns), rowvar=False)[0, 1]
+    assert corr == pytest.approx(0.8, abs=0.02)
+    # Over a single day the portfolio is the weighted sum of its assets
+    assert np.allclose(result.terminal_returns, result.asset_terminal_returns @ np.array([0.75, 0.25]))
+    assert list(result.asset_risk(0.95).index) == ["A", "B"]
+
+def test_cedear_screen_implied_ccl_and_cache(tmp_path):
+    from src.data.cedears import CedearRatio, RatioTable
+    from src.domain.cedears import CedearScreener
+
+    dates = pd.bdate_range("2024-01-01", periods=120, name="Date")
+    ccl = np.linspace(1000.0, 1200.0, len(dates))
+    frames = {}
+    for i, (ticker, ratio, premium) in enumerate([("AAA", 10, 0.0), ("BBB", 20, 0.0), ("CCC", 5, 0.05)]):
+        usd = 100.0 + i + np.arange(len(dates))
+        frames[ticker] = pd.DataFrame({"Close": usd}, index=dates)
+        frames[ticker + ".BA"] = pd.DataFrame({"Close": usd * ccl * (1 + premium) / ratio}, index=dates)
+    # A CEDEAR listed later than the others doesn't shorten their history
+    frames["CCC.BA"] = frames["CCC.BA"].iloc[40:]
+    # An Argentine holiday: no CCL that day, and no flat bar in the ARS metrics
+    frames["AAA.BA"] = frames["AAA.BA"].drop(dates[60])
+
+    loader = MagicMock()
+    loader.get_ticker_history.side_effect = lambda ticker, period: frames.get(ticker)
+    loader.data_versions.side_effect = lambda symbols, period: dict.fromkeys(symbols, "v1")
+    ratios = RatioTable(db_path=str(tmp_path / "ratios.db"))
+    ratios.upsert([CedearRatio("AAA", "AAA.BA", 10), CedearRatio("BBB", "BBB.BA", 20),
+                   CedearRatio("CCC", "CCC.BA", 5), CedearRatio("ZZZ", "ZZZ.BA", 1)])
+    screener = CedearScreener(loader, ratios)
+
+    screen = screener.screen(["AAA", "BBB", "CCC", "ZZZ", "NOPE"])
+    assert screen.missing == ["ZZZ"]
+    assert loader.data_versions.call_count == 1  # one freshness query, reused as the key
+    assert len(screen.dates) == len(dates)
+    assert screen.market_ccl[-1] == pytest.approx(1200.0)
+    table = screen.table
+    assert table.index[-1] == "CCC" and table.loc["CCC", "premium"] == pytest.approx(0.05)
+    assert table.loc["AAA", "implied_ccl"] == pytest.approx(1200.0)
+    assert list(screen.flagged(0.02).index) == ["CCC"]
+    assert table.loc["AAA", "return_ars"] == pytest.approx((219 * 1200) / (100 * 1000) - 1)
+    assert table.loc["AAA", "max_drawdown_ars"] == 0.0
+    assert np.isnan(screen.ccl[60, 0]) and not np.isnan(screen.ccl[60, 1])
+    ars_returns = frames["AAA.BA"]["Close"].pct_change().dropna()
+    assert table.loc["AAA", "volatility_ars"] == pytest.approx(ars_returns.std() * np.sqrt(252))
+    assert table.loc["CCC", "return_ars"] == pytest.approx((221 * 1200) / (142 * ccl[40]) - 1)
+
+    # Unchanged data: served from the cache; new ratios: recomputed
+    calls = loader.get_ticker_history.call_count
+    assert screener.screen(["AAA", "BBB", "CCC", "ZZZ", "NOPE"]) is screen
+    ratios.upsert([CedearRatio("AAA", "AAA.BA", 5)])
+    again = screener.screen(["AAA", "BBB", "CCC"])
+    assert loader.get_ticker_history.call_count > calls
+    assert again.table.loc["AAA", "premium"] == pytest.approx(-0.5, rel=1e-3)
@@ -0,0 +1,71 @@
+import http.client
+import json
+import threading
+import pytest
+from src.api.server import MISSING_VERSION, ScreenerService, make_server
+from src.data.synthetic import OfflineDataLoader
+
+@pytest.fixture
+def api():
+    server = make_server(OfflineDataLoader(), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    yield conn, server
+    conn.close()
+    server.shutdown()
+    server.server_close()
+
+def get(conn, path, headers=None):
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    return resp, json.loads(body) if body else None
+
+def test_ticker_etag_and_conditional_request(api):
+    conn, server = api
+    resp, payload = get(conn, "/tickers/aapl?period=1y&risk_profile=Moderate")
+    assert resp.status == 200
+    assert payload["ticker"] == "AAPL"
+    assert 0 <= payload["score"] <= 100
+
+    etag = resp.getheader("ETag")
+    resp, payload = get(conn, "/tickers/AAPL?period=1y&risk_profile=Moderate", {"If-None-Match": etag})
+    assert resp.status == 304
+    assert payload is None
+    assert server.RequestHandlerClass.service.cache.stats()["hits"] == 1
+
+def test_rankings_and_indicators(api):
+    conn, _ = api
+    resp, payload = get(conn, "/rankings?tickers=MSFT,AAPL,SPY&period=1y")
+    assert resp.status == 200
+    assert [r["rank"] for r in payload["rankings"]] == [1, 2, 3]
+    scores = [r["score"] for r in payload["rankings"]]
+    assert scores == sorted(scores, reverse=True)
+
+    resp, payload = get(conn, "/tickers/SPY/indicators?period=6mo")
+    assert resp.status == 200
+    assert len(payload["dates"]) == len(payload["rsi"]) == len(payload["sma_20"])
+    assert payload["sma_200"][-1] is None  # Not enough bars for SMA 200
+
+def test_errors(api):
+    conn, _ = api
+    assert get(conn, "/nope")[0].status == 404
+    assert get(conn, "/tickers/AAPL?risk_profile=Reckless")[0].status == 400
+
+class PartlyDelistedLoader(OfflineDataLoader):
+    def get_ticker_history(self, ticker, period="1y"):
+        return None if ticker == "DEAD" else super().get_ticker_history(ticker, period)
+
+    def data_versions(self, tickers, period="1y"):
+        return {t: None if t == "DEAD" else "offline" for t in tickers}
+
+def test_rankings_with_a_failed_ticker_are_cached_briefly():
+    service = ScreenerService(PartlyDelistedLoader(), missing_ttl_hours=0.25)
+    body, etag = service.rankings(["AAPL", "DEAD"], "1y", "Moderate")
+    assert json.loads(body)["failed"] == ["DEAD"]
+
+    assert service.rankings(["DEAD", "AAPL"], "1y", "Moderate") == (body, etag)
+    assert service.cache.stats()["hits"] == 1
+    (key, versions), = service.cache._entries
+    assert versions == ("offline", MISSING_VERSION)
+    assert service.cache._entries[(key, versions)][1].total_seconds() == 15 * 60
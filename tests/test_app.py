@@ -0,0 +1,38 @@
+import pytest
+from src.app.caching import ResultCache, make_request_key
+
+def test_result_cache_hits_and_misses():
+    cache = ResultCache(ttl_hours=1)
+    key = make_request_key(["MSFT", "AAPL"], "1y", "Moderate")
+
+    assert cache.get(key) is None
+    cache.put(key, "screen")
+
+    # Same request with a different ticker order is a hit
+    assert cache.get(make_request_key(["AAPL", "MSFT"], "1y", "Moderate")) == "screen"
+    assert cache.get(make_request_key(["AAPL"], "1y", "Moderate")) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+def test_request_key_follows_data_versions():
+    cache = ResultCache(ttl_hours=1)
+    versions = {"AAPL": "2024-01-02T10:00:00", "MSFT": "2024-01-02T10:00:00"}
+    cache.put(make_request_key(["AAPL", "MSFT"], "1y", "Moderate", versions), "screen")
+
+    assert cache.get(make_request_key(["MSFT", "AAPL"], "1y", "Moderate", dict(versions))) == "screen"
+    # A refreshed ticker is a different request, whatever the TTL says
+    refreshed = {**versions, "MSFT": "2024-01-02T16:00:00"}
+    assert cache.get(make_request_key(["AAPL", "MSFT"], "1y", "Moderate", refreshed)) is None
+
+def test_result_cache_expiry_and_eviction():
+    expired = ResultCache(ttl_hours=-1)
+    expired.put("k", 1)
+    assert expired.get("k") is None
+    expired.put("short", 1, ttl_hours=1)
+    assert expired.get("short") == 1
+
+    small = ResultCache(ttl_hours=1, max_entries=2)
+    small.put("a", 1)
+    small.put("b", 2)
+    small.put("c", 3)
+    assert small.get("a") is None
+    assert small.get("c") == 3
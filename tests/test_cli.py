@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+from src.cli.screener import read_universe, run, StageTimer
+from src.data.export import open_arrow
+from src.data.synthetic import OfflineDataLoader
+from src.domain.panels import METRICS_SCHEMA, SERIES_SCHEMA, write_panels
+from src.domain.signals import SignalEngine
+
+def test_read_universe(tmp_path):
+    universe = tmp_path / "universe.txt"
+    universe.write_text("aapl, msft\n# comment\nSPY  # trailing\nAAPL\n")
+    assert read_universe(str(universe)) == ["AAPL", "MSFT", "SPY"]
+
+def test_batch_run_writes_chunked_outputs(tmp_path):
+    tickers = [f"T{i:02d}" for i in range(7)]
+    timer = StageTimer()
+
+    summary = run(
+        OfflineDataLoader(), tickers, ["1y"], ["Moderate", "Aggressive"],
+        str(tmp_path), fmt="parquet", chunk_size=3, timer=timer,
+    )
+
+    assert summary["failed"] == 0
+    rankings = pd.read_parquet(tmp_path / "rankings.parquet")
+    snapshots = pd.read_parquet(tmp_path / "snapshots.parquet")
+    assert len(rankings) == 14
+    assert len(snapshots) == 7
+
+    # Ranks are global across chunks, per risk profile
+    moderate = rankings[rankings["risk_profile"] == "Moderate"]
+    assert moderate["rank"].tolist() == list(range(1, 8))
+    assert moderate["score"].is_monotonic_decreasing
+    assert {"fetch", "analyze", "write", "rank"} <= set(timer.seconds)
+
+def test_panels_are_typed_and_memory_mappable(tmp_path):
+    loader = OfflineDataLoader()
+    run(loader, ["T00", "T01", "T02"], ["1y"], ["Moderate"], str(tmp_path), chunk_size=2, panel_fmt="arrow")
+    series = open_arrow(str(tmp_path / "series.arrow"))
+    assert series.schema.equals(SERIES_SCHEMA)
+    assert series.column("ticker").unique().to_pylist() == ["T00", "T01", "T02"]
+
+    df = loader.get_ticker_history("T00", "1y")
+    t00 = series.filter(pc.equal(series.column("ticker"), "T00")).to_pandas()
+    assert len(t00) == len(df)
+    assert t00["sma_20"].iloc[-1] == pytest.approx(df["Close"].iloc[-20:].mean())
+    assert t00["drawdown"].max() == 0 and t00["sma_200"].isna().sum() == 199
+
+    result = SignalEngine().analyze_ticker("T00", df, "Moderate")
+    write_panels(str(tmp_path / "s.parquet"), str(tmp_path / "m.parquet"), "1y", [result], {"T00": df}, fmt="parquet")
+    metrics = pq.read_table(tmp_path / "m.parquet")
+    assert metrics.schema.equals(METRICS_SCHEMA)
+    row = metrics.to_pylist()[0]
+    assert row["bars"] == len(df) and row["rsi"] == result.metrics.rsi and row["recommendation"] == result.recommendation
+
+def test_headless_imports_skip_ui_and_network_stack():
+    code = (
+        "import sys; import src.cli.screener, src.api.server, src.data.loader; "
+        "print(','.join(m for m in ('streamlit', 'plotly', 'yfinance', 'dotenv', 'scipy') if m in sys.modules))"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
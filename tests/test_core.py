@@ -0,0 +1,84 @@
+import pytest
+from src.core.telemetry import Registry
+from src.core.lazy import lazy_import
+
+def test_registry_disabled_records_nothing():
+    registry = Registry(enabled=False)
+    registry.inc("fetch_total")
+    with registry.span("fetch_seconds"):
+        pass
+    assert registry.snapshot() == {"counters": [], "timers": []}
+
+def test_registry_counts_spans_and_exports_prometheus():
+    registry = Registry(enabled=True)
+    registry.inc("cache_requests_total", result="hit")
+    registry.inc("cache_requests_total", result="hit")
+    registry.inc("cache_bytes_read_total", 512)
+    with registry.span("engine_stage_seconds", stage="indicators"):
+        pass
+
+    text = registry.to_prometheus()
+    assert '# TYPE financelab_cache_requests_total counter' in text
+    assert 'financelab_cache_requests_total{result="hit"} 2' in text
+    assert 'financelab_cache_bytes_read_total 512' in text
+    assert 'financelab_engine_stage_seconds_count{stage="indicators"} 1' in text
+
+    # Worker registries merge into the parent
+    other = Registry(enabled=True)
+    other.inc("cache_bytes_read_total", 100)
+    registry.merge_state(other.export_state())
+    counters = {c["name"]: c["value"] for c in registry.snapshot()["counters"] if not c["labels"]}
+    assert counters["cache_bytes_read_total"] == 612
+
+def test_lazy_import_defers_until_attribute_access():
+    module = lazy_import("json")
+    assert "not loaded" in repr(module)
+    assert module.dumps([1]) == "[1]"
+    assert "not loaded" not in repr(module)
+
+def test_profile_run_writes_dumps_and_categories(tmp_path):
+    import pandas as pd
+    from src.core.profiling import profile_run
+
+    with profile_run("unit", output_dir=str(tmp_path), enabled=True) as report:
+        pd.Series(range(5000), dtype=float).rolling(20).mean()
+
+    for path in report.files.values():
+        assert (tmp_path / path.split("/")[-1]).exists()
+    assert report.categories["rolling windows"] > 0
+    assert "rolling windows" in report.summary
+
+    with profile_run(enabled=False) as disabled:
+        assert disabled is None
+
+def test_profile_run_covers_screen_worker_threads(tmp_path):
+    import sys
+    import threading
+    from src.core.profiling import profile_run
+    from src.data.synthetic import OfflineDataLoader
+    from src.domain.screener import iter_screen
+    from src.domain.signals import SignalEngine
+
+    outcome = {}
+
+    def screen():
+        with profile_run("screen", output_dir=str(tmp_path), enabled=True) as report:
+            outcome["events"] = list(iter_screen(OfflineDataLoader(), SignalEngine(), ["AAA", "BBB", "CCC"],
+                                                 "1y", "Moderate", thread_initializer=report.thread_initializer))
+            # Threads not started by the profiled call are left alone
+            bystander = threading.Thread(target=lambda: outcome.__setitem__("hook", sys.getprofile()))
+            bystander.start()
+            bystander.join()
+        outcome["report"] = report
+
+    # A worker thread that failed to start its profiler used to hang the screen
+    worker = threading.Thread(target=screen, daemon=True)
+    worker.start()
+    worker.join(timeout=60)
+    assert not worker.is_alive(), "screen hung under the profiler"
+    assert all(e.ok for e in outcome["events"]) and len(outcome["events"]) == 3
+    assert outcome["hook"] is None
+    report = outcome["report"]
+    assert report.categories["rolling windows"] > 0  # indicators run in the analysis threads
+    shares = [float(line.split()[-1].rstrip("%")) for line in report.summary.splitlines() if line.endswith("%")]
+    assert shares and sum(shares) <= 100.5
@@ -1,8 +1,10 @@
 import pytest
 import pandas as pd
+import numpy as np
 import os
+import sqlite3
 import shutil
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 from src.data.storage import DataCache
 from src.data.loader import DataLoader
@@ -46,12 +48,12 @@ def test_cache_ttl_expiry():
 @patch("src.data.loader.yf.download")
 def test_loader_fetch_and_cache(mock_download):
     # Setup mock
-    mock_df = pd.DataFrame({"Close": [150.0]}, index=pd.Index([datetime.now()], name="Date"))
+    # A weekday: ingest drops bars outside the trading calendar
+    mock_df = pd.DataFrame({"Close": [150.0]}, index=pd.Index([datetime(2024, 1, 2)], name="Date"))
     mock_download.return_value = mock_df
     
-    loader = DataLoader()
     # Use a test db for loader
-    loader.cache = DataCache(db_path="loader_test.db")
+    loader = DataLoader(db_path="loader_test.db")
     
     # 1. Fetch (should call yfinance)
     df = loader.get_ticker_history("AAPL", "1mo")
@@ -64,8 +66,329 @@ def test_loader_fetch_and_cache(mock_download):
     df_cached = loader.get_ticker_history("AAPL", "1mo")
     assert df_cached is not None
     mock_download.assert_not_called()
+    updated_at, entry = loader.cache.get_entry("AAPL", "1mo")
+    assert updated_at == loader.cache.get_updated_at("AAPL", "1mo") and entry.equals(df_cached)
     
     # Cleanup
     if os.path.exists("loader_test.db"):
         os.remove("loader_test.db")
 
+
+def test_loader_refreshes_tickers_in_one_download(tmp_path):
+    dates = pd.Index([datetime(2024, 1, 2), datetime(2024, 1, 3)], name="Date")
+    bars = {("AAA", "Close"): [10.0, 11.0], ("AAA", "Volume"): [1.0, 2.0],
+            ("BBB", "Close"): [np.nan, 5.0], ("BBB", "Volume"): [np.nan, 3.0]}
+    raw = pd.DataFrame(bars, index=dates)
+
+    loader = DataLoader(db_path=str(tmp_path / "batch.db"))
+    with patch("src.data.loader.yf.download", return_value=raw) as download:
+        assert loader.refresh_many(["AAA", "BBB", "GONE"], "1mo") == {"AAA": True, "BBB": True, "GONE": False}
+    download.assert_called_once()
+    assert list(loader.cache.get_data("AAA", "1mo")["Close"]) == [10.0, 11.0]
+    # The other symbol's session isn't a bar of BBB
+    assert list(loader.cache.get_data("BBB", "1mo")["Close"]) == [5.0]
+
+
+def test_cache_updated_at(temp_cache):
+    assert temp_cache.get_updated_at("TEST", "1mo") is None
+    temp_cache.save_data("TEST", "1mo", pd.DataFrame({"Close": [1.0]}))
+    assert temp_cache.get_updated_at("TEST", "1mo") is not None
+
+
+def test_normalize_ohlcv_keeps_real_sessions():
+    from src.data.ingest import normalize_ohlcv
+
+    dates = pd.to_datetime(["2024-01-05", "2024-01-02", "2024-01-03", "2024-01-03",
+                            "2024-01-06", "2024-01-12", "2024-01-15"])
+    raw = pd.DataFrame({"Close": [12.0, 10.0, 11.0, 11.5, 99.0, 20.0, None],
+                        "Adj Close": [11.0, 9.0, 10.0, 10.5, 98.0, 19.0, None],
+                        "Volume": [1, 1, 1, 1, 1, 1, 1]}, index=dates)
+    df, report = normalize_ohlcv(raw, "TEST", gap_sessions=3)
+
+    assert report.duplicates == 1 and report.invalid == 1 and report.off_calendar == 1
+    # Jan 4 and Jan 8-11 are missing: counted and the run reported as a gap, not filled
+    assert list(df.index.strftime("%m-%d")) == ["01-02", "01-03", "01-05", "01-12"]
+    assert report.missing == 5 and len(report.gaps) == 1
+    assert df.loc["2024-01-03", "Close"] == 11.5
+    assert list(df.columns) == ["Close", "Volume", "Adj Close"] and (df.dtypes == "float64").all()
+    assert report.jumps == [pd.Timestamp("2024-01-12")]
+
+
+def test_price_panel_fills_holidays_and_marks_them():
+    from src.data.ingest import build_price_panel
+
+    us = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0]}, index=pd.to_datetime(["2024-01-02", "2024-01-03",
+                                                                              "2024-01-04", "2024-01-05"]))
+    ar = pd.DataFrame({"Close": [10.0, 30.0, 40.0]}, index=pd.to_datetime(["2024-01-02", "2024-01-04",
+                                                                           "2024-01-05"]))
+    panel = build_price_panel({"US": us, "AR": ar})
+
+    assert panel.values[:, 1].tolist() == [10.0, 10.0, 30.0, 40.0]
+    assert panel.filled[:, 1].tolist() == [False, True, False, False] and not panel.filled[:, 0].any()
+    assert np.isnan(panel.traded()[1, 1])
+    common = panel.common_sessions()
+    assert len(common.dates) == 3 and common.returns()[0].tolist() == [2.0, 2.0]
+
+
+def test_price_panel_stacks_common_dates():
+    from src.data.ingest import build_price_panel
+    from src.data.synthetic import generate_ohlcv
+
+    long = generate_ohlcv("A", 300)
+    short = generate_ohlcv("B", 100)
+    panel = build_price_panel({"A": long, "B": short})
+
+    assert panel.tickers == ["A", "B"]
+    assert panel.values.shape == (100, 2) and panel.values.flags["C_CONTIGUOUS"]
+    assert panel.dates.equals(short.index)
+    assert (panel.values[:, 0] == long["Close"].to_numpy()[-100:]).all()
+    assert (panel.normalized()[0] == 0).all()
+
+
+def test_access_stats_rank_hot_keys(temp_cache):
+    for _ in range(3):
+        temp_cache.record_access("AAPL", "1y")
+    temp_cache.record_access("MSFT", "1y")
+    temp_cache.save_data("MSFT", "1y", pd.DataFrame({"Close": [1.0]}))
+
+    hot = temp_cache.hot_keys()
+    assert [(s.ticker, s.hits) for s in hot] == [("AAPL", 3), ("MSFT", 1)]
+    assert hot[0].updated_at is None and hot[1].updated_at is not None
+
+    # Counts accumulate across flushes
+    temp_cache.record_access("MSFT", "1y")
+    temp_cache.record_access("MSFT", "1y")
+    temp_cache.record_access("MSFT", "1y")
+    assert temp_cache.hot_keys(limit=1)[0].ticker == "MSFT"
+
+
+def test_warmup_refreshes_due_keys_within_budget(temp_cache):
+    from datetime import timedelta
+    from src.data.warmup import RequestBudget, WarmupScheduler
+
+    loader = MagicMock()
+    loader.cache = temp_cache
+    loader.refresh.return_value = True
+
+    for ticker, hits in [("HOT", 5), ("WARM", 3), ("COLD", 1)]:
+        for _ in range(hits):
+            temp_cache.record_access(ticker, "1y")
+    temp_cache.save_data("WARM", "1y", pd.DataFrame({"Close": [1.0]}))
+
+    now = datetime.now()
+    # Keep "now" well away from the prewarm window
+    morning = (now.hour + 12) % 24
+    scheduler = WarmupScheduler(loader, RequestBudget(1), seed_keys=[("SPY", "1y")], morning_hour=morning)
+    # WARM was just saved; the rest were never cached
+    assert scheduler.plan(now) == [("HOT", "1y"), ("COLD", "1y"), ("SPY", "1y")]
+    # Shortly before expiry WARM is due as well
+    assert ("WARM", "1y") in scheduler.plan(now + timedelta(hours=temp_cache.ttl_hours * 0.9))
+    # In the prewarm window anything older than the window is refreshed
+    prewarm = now.replace(minute=30) + timedelta(hours=11)
+    assert ("WARM", "1y") in scheduler.plan(prewarm)
+    # A midnight open prewarms late the evening before
+    midnight = WarmupScheduler(loader, RequestBudget(1), morning_hour=0)
+    assert midnight._prewarm_start(datetime(2024, 1, 2, 23, 30)) == datetime(2024, 1, 2, 23, 0)
+    assert midnight._prewarm_start(datetime(2024, 1, 2, 0, 30)) is None
+
+    report = scheduler.run_once(now)
+    assert report.refreshed == [("HOT", "1y")]
+    assert report.deferred == [("COLD", "1y"), ("SPY", "1y")]
+    loader.refresh.assert_called_once_with("HOT", "1y")
+
+def test_watchlist_refresh_reuses_unchanged_tickers(tmp_path):
+    from src.data.synthetic import OfflineDataLoader
+    from dataclasses import replace
+    from src.data.watchlists import WatchlistSnapshot, WatchlistStore
+    from src.domain.models import Watchlist
+    from src.domain.signals import SignalEngine
+    from src.domain.watchlists import refresh_watchlist
+
+    store = WatchlistStore(db_path=str(tmp_path / "watchlists.db"), max_history=2)
+    watchlist = Watchlist(name="core", tickers=["AAPL", "MSFT", "KO"])
+    store.save(watchlist)
+    assert store.list_names() == ["core"]
+    assert store.get("core").tickers == ["AAPL", "MSFT", "KO"]
+
+    loader = OfflineDataLoader()
+    engine = SignalEngine()
+    first = refresh_watchlist(store, loader, engine, watchlist, "6mo", "Moderate")
+    assert sorted(first.recomputed) == ["AAPL", "KO", "MSFT"]
+    assert first.reused == []
+
+    stored = store.latest_snapshot("core", "6mo", "Moderate")
+    assert [r.ticker for r in stored.results] == [r.ticker for r in first.screen.results]
+    assert stored.results[0] == first.screen.results[0]
+
+    # Same data version: nothing recomputed, no new snapshot
+    second = refresh_watchlist(store, loader, engine, watchlist, "6mo", "Moderate")
+    assert second.recomputed == []
+    assert sorted(second.reused) == ["AAPL", "KO", "MSFT"]
+    assert len(store.history("core", "6mo", "Moderate")) == 1
+
+    # New data versions with identical bars (expired entry, same re-download) are still reused
+    loader.data_versions = lambda tickers, p="1y": dict.fromkeys(tickers, "v2")
+    assert refresh_watchlist(store, loader, engine, watchlist, "6mo", "Moderate").recomputed == []
+
+    # A ticker whose bars changed is recomputed alone; history is trimmed to max_history
+    history = loader.get_ticker_history
+    for bump in (1.0, 2.0, 3.0):
+        loader.get_ticker_history = lambda t, p="1y", b=bump: (
+            history(t, p).assign(Close=lambda df: df["Close"] + b) if t == "KO" else history(t, p))
+        third = refresh_watchlist(store, loader, engine, watchlist, "6mo", "Moderate")
+        assert third.recomputed == ["KO"]
+    assert len(store.history("core", "6mo", "Moderate")) == 2
+
+    # Result blobs only a trimmed or deleted snapshot referenced are dropped
+    def blobs():
+        conn = sqlite3.connect(store.db_path)
+        count = conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0]
+        conn.close()
+        return count
+
+    core_blobs = blobs()
+    base = stored.results[0]
+    for score in (1.0, 2.0, 3.0):
+        store.save_snapshot(WatchlistSnapshot("other", "6mo", "Moderate", datetime.now(),
+                                              [replace(base, score=score)], {}))
+    assert blobs() == core_blobs + 2
+    assert [s.results[0].score for s in store.history("other", "6mo", "Moderate")] == [3.0, 2.0]
+
+    store.delete("core")
+    assert store.get("core") is None
+    assert store.latest_snapshot("core", "6mo", "Moderate") is None
+    assert blobs() == 2
+
+def test_intraday_chunks_download_only_new_bars(tmp_path):
+    from datetime import timedelta
+
+    now = datetime.now()
+    # 5m bars over the last ~8 weeks, tz-aware like yfinance returns them
+    sessions = pd.bdate_range(end=now, periods=40)
+    bars = pd.DatetimeIndex(sum([list(pd.date_range(d + timedelta(hours=9, minutes=30), periods=78, freq="5min"))
+                                 for d in sessions], []), tz="America/New_York")
+    full = pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 10.0}, index=bars)
+    requests = []
+
+    def download(ticker, start, end, interval, **kwargs):
+        requests.append((start, end))
+        dates = full.index.tz_localize(None).normalize()
+        return full[(dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end))]
+
+    loader = DataLoader(db_path=str(tmp_path / "intraday.db"))
+    with patch("src.data.loader.yf.download", side_effect=download):
+        df = loader.get_intraday_history("AAPL", "5m", "1mo")
+        assert len(requests) == 2  # 59 days of lookback fit in two windows
+        assert df.index.tz is None and df.index[-1] == full.index[-1].tz_localize(None)
+        assert df.index[0] >= now - timedelta(days=31)
+
+        # Bars are split by month and survive a restart
+        conn = sqlite3.connect(loader.cache.db_path)
+        chunks = conn.execute("SELECT COUNT(*) FROM intraday_chunks").fetchone()[0]
+        conn.close()
+        assert chunks >= 2
+        assert len(loader.cache.get_intraday("AAPL", "5m")) == len(full)
+        since = datetime.combine(sessions[-3].date(), datetime.min.time())
+        recent = loader.cache.get_intraday("AAPL", "5m", since=since)
+        assert len(recent) == 3 * 78 and recent.index[0] >= pd.Timestamp(since)
+
+        # Fresh: no request; stale: only from the last stored session on
+        requests.clear()
+        assert len(loader.get_bars("AAPL", "30m", "1mo")) > 0  # rolled up from the 5m bars
+        assert requests == []
+        # Only the period's chunks are read, and each period is its own frame
+        with patch.object(loader.cache, "get_intraday", wraps=loader.cache.get_intraday) as read:
+            assert len(loader.get_intraday_history("AAPL", "5m", "5d")) < len(df)
+            assert read.call_args.kwargs["since"] is not None
+        assert loader.frames.stats()["entries"] == 0 and loader.intraday_frames.stats()["entries"] == 2
+        loader.intraday_ttl = timedelta(0)
+        loader.get_intraday_history("AAPL", "5m", "1mo")
+        assert len(requests) == 1 and requests[0][0] == full.index[-1].date()
+
+def test_refresher_alerts_only_on_signal_changes(tmp_path):
+    from src.data.alerts import AlertStore
+    from src.data.watchlists import WatchlistStore
+    from src.domain.models import AnalysisResult, AssetMetrics, Watchlist
+    from src.domain.refresher import WatchlistRefresher
+
+    db = str(tmp_path / "refresher.db")
+    watchlists = WatchlistStore(db_path=db)
+    watchlists.save(Watchlist(name="core", tickers=["AAA", "BBB"]))
+    watchlists.save(Watchlist(name="tech", tickers=["AAA"]))
+
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    frames = {t: pd.DataFrame({"Close": range(1, 61)}, index=dates) for t in ("AAA", "BBB")}
+    loader = MagicMock()
+    loader.cache = DataCache(db_path=db)
+    loader.get_ticker_history.side_effect = lambda t, p: frames[t]
+
+    def refresh_many(tickers, period):
+        # Stands in for a download: stores the current frames as new versions
+        return {t: loader.cache.save_data(t, period, frames[t]) is not None for t in tickers}
+    loader.refresh_many.side_effect = refresh_many
+    loader.data_versions.side_effect = lambda tickers, period: {
+        t: u.isoformat() if u else None for t, u in loader.cache.get_updated_at_many(tickers, period).items()
+    }
+
+    signals = {"AAA": ("Hold", 50.0, 10.0, 5.0), "BBB": ("Hold", 50.0, 10.0, 5.0)}
+    engine = MagicMock()
+    engine.analyze_ticker.side_effect = lambda t, df, profile: AnalysisResult(
+        t, AssetMetrics(1, 0, 0, 0, 0, signals[t][1], 0, signals[t][2], signals[t][3]), 50, signals[t][0], [], profile)
+
+    alerts = AlertStore(db_path=db)
+    refresher = WatchlistRefresher(loader, engine, watchlists, alerts, risk_profile="Aggressive", max_age_minutes=0)
+    first = refresher.run_once()
+    assert {c.args[2] for c in engine.analyze_ticker.call_args_list} == {"Aggressive"}
+    assert sorted(first.downloaded) == ["AAA", "BBB"] and sorted(first.analyzed) == ["AAA", "BBB"]
+    assert first.alerts == []  # nothing to compare against yet
+    loader.refresh_many.assert_called_once()  # both tickers in one request
+
+    # Same bars downloaded again: no analysis
+    second = refresher.run_once()
+    assert sorted(second.unchanged) == ["AAA", "BBB"] and second.analyzed == []
+
+    # New bar for AAA only, with a flip, a death cross and RSI overbought
+    frames["AAA"] = pd.DataFrame({"Close": range(1, 62)}, index=pd.bdate_range("2024-01-01", periods=61))
+    signals["AAA"] = ("Sell", 75.0, 4.0, 5.0)
+    third = refresher.run_once()
+    assert third.analyzed == ["AAA"]
+    assert sorted(a.kind for a in third.alerts) == ["recommendation", "rsi", "trend"]
+    assert third.alerts[0].watchlists == ["core", "tech"]
+
+    # Not due and not refreshed elsewhere: skipped without reading any bars
+    refresher.max_age = timedelta(hours=1)
+    calls = loader.get_ticker_history.call_count
+    fourth = refresher.run_once()
+    assert fourth.downloaded == [] and loader.get_ticker_history.call_count == calls
+
+    stored = alerts.recent_alerts(watchlist="tech")
+    assert len(stored) == 3 and {a.ticker for a in stored} == {"AAA"}
+    assert alerts.recent_alerts(watchlist="none") == []
+
+def test_refresher_serves_deferred_tickers_first(tmp_path):
+    from src.data.alerts import AlertStore
+    from src.data.warmup import RequestBudget
+    from src.data.watchlists import WatchlistStore
+    from src.domain.models import Watchlist
+    from src.domain.refresher import WatchlistRefresher
+
+    db = str(tmp_path / "refresher.db")
+    watchlists = WatchlistStore(db_path=db)
+    watchlists.save(Watchlist(name="all", tickers=["A", "B", "C"]))
+    loader = MagicMock()
+    loader.cache = DataCache(db_path=db)
+    loader.refresh_many.side_effect = lambda tickers, p: {
+        t: loader.cache.save_data(t, p, pd.DataFrame({"Close": [1.0]})) is not None for t in tickers}
+    loader.data_versions.return_value = {}
+
+    # Batches of one: the budget of two requests covers two tickers per run
+    refresher = WatchlistRefresher(loader, MagicMock(), watchlists, AlertStore(db_path=db), max_age_minutes=0,
+                                   batch_size=1)
+    downloaded = []
+    for _ in range(3):
+        refresher.budget = RequestBudget(2)  # a fresh hour each run
+        report = refresher.run_once()
+        downloaded.append(report.downloaded)
+    # C is deferred once, then goes first; afterwards the stalest goes first
+    assert downloaded[0] == ["A", "B"] and downloaded[1][0] == "C"
+    assert downloaded[2][0] == ({"A", "B"} - set(downloaded[1])).pop()